@@ -4,18 +4,41 @@
 Argon2 for Python
 """
 
-from . import exceptions, low_level, profiles
-from ._legacy import hash_password, hash_password_raw, verify_password
-from ._password_hasher import (
-    DEFAULT_HASH_LENGTH,
-    DEFAULT_MEMORY_COST,
-    DEFAULT_PARALLELISM,
-    DEFAULT_RANDOM_SALT_LENGTH,
-    DEFAULT_TIME_COST,
-    PasswordHasher,
-)
-from ._utils import Parameters, extract_parameters
-from .low_level import Type
+from __future__ import annotations
+
+
+# Importing typing would make up most of the time ``import argon2`` takes.
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from . import exceptions, low_level, profiles
+    from ._async import AsyncPasswordHasher
+    from ._budget import BudgetedPasswordHasher, BudgetStats
+    from ._fork import warmup
+    from ._legacy import hash_password, hash_password_raw, verify_password
+    from ._meter import CallStats, UsageMeter, UsageStats
+    from ._password_hasher import (
+        DEFAULT_HASH_LENGTH,
+        DEFAULT_MEMORY_COST,
+        DEFAULT_PARALLELISM,
+        DEFAULT_RANDOM_SALT_LENGTH,
+        DEFAULT_TIME_COST,
+        PasswordHasher,
+        VerificationResult,
+    )
+    from ._prepared_hash import PreparedHash
+    from ._process_pool import ProcessPoolPasswordHasher
+    from ._salt_pool import SaltPool
+    from ._utils import (
+        Parameters,
+        VerificationLimits,
+        extract_parameters,
+        extract_parameters_cache_clear,
+        extract_parameters_cache_info,
+    )
+    from .low_level import Type
 
 
 __title__ = "argon2-cffi"
@@ -31,20 +54,79 @@ __all__ = [
     "DEFAULT_PARALLELISM",
     "DEFAULT_RANDOM_SALT_LENGTH",
     "DEFAULT_TIME_COST",
+    "AsyncPasswordHasher",
+    "BudgetStats",
+    "BudgetedPasswordHasher",
+    "CallStats",
     "Parameters",
     "PasswordHasher",
+    "PreparedHash",
+    "ProcessPoolPasswordHasher",
+    "SaltPool",
     "Type",
+    "UsageMeter",
+    "UsageStats",
+    "VerificationLimits",
+    "VerificationResult",
     "exceptions",
     "extract_parameters",
+    "extract_parameters_cache_clear",
+    "extract_parameters_cache_info",
     "hash_password",
     "hash_password_raw",
     "low_level",
     "profiles",
     "verify_password",
+    "warmup",
 ]
 
 
-def __getattr__(name: str) -> str:
+# Everything is imported on first access, so ``import argon2`` neither loads
+# the CFFI bindings nor computes the default parameters.
+_LAZY_ATTRIBUTES = {
+    "DEFAULT_HASH_LENGTH": "_password_hasher",
+    "DEFAULT_MEMORY_COST": "_password_hasher",
+    "DEFAULT_PARALLELISM": "_password_hasher",
+    "DEFAULT_RANDOM_SALT_LENGTH": "_password_hasher",
+    "DEFAULT_TIME_COST": "_password_hasher",
+    "AsyncPasswordHasher": "_async",
+    "BudgetStats": "_budget",
+    "BudgetedPasswordHasher": "_budget",
+    "CallStats": "_meter",
+    "Parameters": "_utils",
+    "PasswordHasher": "_password_hasher",
+    "ProcessPoolPasswordHasher": "_process_pool",
+    "PreparedHash": "_prepared_hash",
+    "SaltPool": "_salt_pool",
+    "Type": "low_level",
+    "UsageMeter": "_meter",
+    "UsageStats": "_meter",
+    "VerificationLimits": "_utils",
+    "VerificationResult": "_password_hasher",
+    "exceptions": "exceptions",
+    "extract_parameters": "_utils",
+    "extract_parameters_cache_clear": "_utils",
+    "extract_parameters_cache_info": "_utils",
+    "hash_password": "_legacy",
+    "hash_password_raw": "_legacy",
+    "low_level": "low_level",
+    "profiles": "profiles",
+    "verify_password": "_legacy",
+    "warmup": "_fork",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is not None:
+        import importlib
+
+        module = importlib.import_module(f"{__name__}.{module_name}")
+        value = module if module_name == name else getattr(module, name)
+        globals()[name] = value
+
+        return value
+
     dunder_to_metadata = {
         "__version__": "version",
         "__description__": "summary",
@@ -77,3 +159,7 @@ def __getattr__(name: str) -> str:
         return meta["Author-email"].split("<", 1)[1].rstrip(">")
 
     return meta[dunder_to_metadata[name]]
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -3,8 +3,13 @@
 from __future__ import annotations
 
 import argparse
+import dataclasses
+import json
+import os
+import platform
 import sys
-import timeit
+
+from pathlib import Path
 
 from . import (
     DEFAULT_HASH_LENGTH,
@@ -14,16 +19,32 @@ from . import (
     PasswordHasher,
     profiles,
 )
+from ._bench import (
+    PASSWORD,
+    OverheadResult,
+    Regression,
+    compare_overhead,
+    gil_enabled,
+    measure_latency,
+    measure_overhead,
+    measure_scaling,
+    measure_throughput,
+    worker_counts,
+)
+from ._utils import Parameters
+from .low_level import hash_secret_raw
 
 
-def main(argv: list[str]) -> None:
-    parser = argparse.ArgumentParser(
-        description="Benchmark Argon2.",
-        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
-    )
-    parser.add_argument(
-        "-n", type=int, default=100, help="Number of iterations to measure."
-    )
+_PROFILE_NAMES = sorted(
+    name
+    for name, value in vars(profiles).items()
+    if isinstance(value, Parameters)
+)
+
+
+def _add_parameter_arguments(
+    parser: argparse.ArgumentParser, *, multiple_profiles: bool = False
+) -> None:
     parser.add_argument(
         "-t", type=int, help="`time_cost`", default=DEFAULT_TIME_COST
     )
@@ -38,53 +59,418 @@ def main(argv: list[str]) -> None:
     )
     parser.add_argument(
         "--profile",
-        type=str,
-        help="A profile from `argon2.profiles. Takes precedence.",
+        type=str.upper,
+        choices=_PROFILE_NAMES,
+        action="append" if multiple_profiles else "store",
+        help="A profile from `argon2.profiles`. Takes precedence."
+        + (
+            " Pass multiple times to compare profiles."
+            if multiple_profiles
+            else ""
+        ),
         default=None,
     )
 
-    args = parser.parse_args(argv[1:])
 
-    password = b"secret"
+def _parameters_from_args(args: argparse.Namespace) -> Parameters:
     if args.profile:
-        ph = PasswordHasher.from_parameters(
-            getattr(profiles, args.profile.upper())
-        )
-    else:
-        ph = PasswordHasher(
-            time_cost=args.t,
-            memory_cost=args.m,
-            parallelism=args.p,
-            hash_len=args.l,
-        )
-    hash = ph.hash(password)
+        params: Parameters = getattr(profiles, args.profile)
+        return params
+
+    return PasswordHasher(
+        time_cost=args.t,
+        memory_cost=args.m,
+        parallelism=args.p,
+        hash_len=args.l,
+    )._parameters
 
-    print(f"Running Argon2id {args.n} times with:")
 
+def _print_parameters(params: Parameters) -> None:
     for name, value, units in [
-        ("hash_len", ph.hash_len, "bytes"),
-        ("memory_cost", ph.memory_cost, "KiB"),
-        ("parallelism", ph.parallelism, "threads"),
-        ("time_cost", ph.time_cost, "iterations"),
+        ("hash_len", params.hash_len, "bytes"),
+        ("memory_cost", params.memory_cost, "KiB"),
+        ("parallelism", params.parallelism, "threads"),
+        ("time_cost", params.time_cost, "iterations"),
     ]:
         print(f"{name}: {value} {units}")
 
-    print("\nMeasuring...")
-    duration = timeit.timeit(
-        f"ph.verify({hash!r}, {password!r})",
-        setup=f"""\
-from argon2 import PasswordHasher
-
-ph = PasswordHasher(
-    time_cost={args.t!r},
-    memory_cost={args.m!r},
-    parallelism={args.p!r},
-    hash_len={args.l!r},
-)
-gc.enable()""",
-        number=args.n,
+
+def bench(argv: list[str]) -> None:
+    """
+    Measure throughput, latency percentiles, peak memory, and CPU utilization
+    of hashing and verifying under concurrency.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m argon2 bench",
+        description="Benchmark Argon2 under concurrency.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "-n",
+        type=int,
+        default=100,
+        help="Number of operations to measure, across all workers.",
+    )
+    parser.add_argument(
+        "--threads", type=int, default=1, help="Threads per process."
+    )
+    parser.add_argument(
+        "--processes", type=int, default=1, help="Worker processes."
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print results as JSON instead of text.",
+    )
+    _add_parameter_arguments(parser)
+
+    args = parser.parse_args(argv)
+    params = _parameters_from_args(args)
+
+    results = [
+        measure_throughput(
+            params,
+            op,
+            threads=args.threads,
+            processes=args.processes,
+            n=args.n,
+        )
+        for op in ("hash", "verify")
+    ]
+
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "parameters": {
+                        **dataclasses.asdict(params),
+                        "type": params.type.name,
+                    },
+                    "threads": args.threads,
+                    "processes": args.processes,
+                    "results": [dataclasses.asdict(r) for r in results],
+                },
+                indent=2,
+            )
+        )
+        return
+
+    print(
+        f"Running Argon2{params.type.name.lower()} {args.n} times in "
+        f"{args.processes} process(es) with {args.threads} thread(s) each "
+        "with:"
+    )
+    _print_parameters(params)
+    print("\nMeasuring...\n")
+
+    for r in results:
+        rss = (
+            "n/a"
+            if r.peak_rss is None
+            else f"{r.peak_rss / 1024 / 1024:.1f}MiB"
+        )
+        print(
+            f"{r.operation}: {r.ops_per_sec:.1f} ops/s, "
+            f"p50 {r.p50:.1f}ms, p95 {r.p95:.1f}ms, p99 {r.p99:.1f}ms, "
+            f"peak RSS {rss}, CPU {r.cpu_utilization:.0%}"
+        )
+
+
+def scaling(argv: list[str]) -> None:
+    """
+    Compare how throughput scales with threads in one process to how it
+    scales with processes.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m argon2 scaling",
+        description="Compare scaling across threads to scaling across "
+        "processes.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "-n",
+        type=int,
+        default=20,
+        help="Number of operations to measure per worker.",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Highest number of threads and processes to measure.",
+    )
+    parser.add_argument(
+        "--operation",
+        choices=["hash", "verify"],
+        default="verify",
+        help="The operation to measure.",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print results as JSON instead of text.",
+    )
+    _add_parameter_arguments(parser)
+
+    args = parser.parse_args(argv)
+    params = _parameters_from_args(args)
+    gil = gil_enabled()
+
+    results = measure_scaling(
+        params,
+        args.operation,
+        workers=worker_counts(args.max_workers),
+        n=args.n,
+    )
+
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "implementation": platform.python_implementation(),
+                    "gil_enabled": gil,
+                    "operation": args.operation,
+                    "parameters": {
+                        **dataclasses.asdict(params),
+                        "type": params.type.name,
+                    },
+                    "results": [dataclasses.asdict(r) for r in results],
+                },
+                indent=2,
+            )
+        )
+        return
+
+    print(
+        f"Running {args.operation} with Argon2{params.type.name.lower()} "
+        f"{args.n} times per worker on {platform.python_implementation()} "
+        f"{platform.python_version()} with the GIL "
+        f"{'enabled' if gil else 'disabled'} with:"
     )
-    print(f"\n{duration / args.n * 1000:.1f}ms per password verification")
+    _print_parameters(params)
+    print("\nMeasuring...\n")
+
+    print(f"{'workers':<8} {'threads':>12} {'processes':>12} {'ratio':>6}")
+    base_t = results[0].threads_ops_per_sec
+    base_p = results[0].processes_ops_per_sec
+    for r in results:
+        print(
+            f"{r.workers:<8} "
+            f"{r.threads_ops_per_sec / base_t:>11.2f}x "
+            f"{r.processes_ops_per_sec / base_p:>11.2f}x "
+            f"{r.threads_ops_per_sec / r.processes_ops_per_sec:>6.2f}"
+        )
+
+
+def overhead(argv: list[str]) -> None:
+    """
+    Measure the time the Python wrapper adds to each call and optionally
+    compare it to a baseline.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m argon2 overhead",
+        description="Measure the Python overhead of argon2-cffi using the "
+        "CHEAPEST profile.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of runs per operation. The fastest one counts.",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print results as JSON instead of text.",
+    )
+    parser.add_argument(
+        "--save",
+        type=Path,
+        metavar="PATH",
+        help="Save the results as JSON to PATH for later comparisons.",
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        metavar="PATH",
+        help="Compare to a baseline that has been saved using --save and "
+        "exit with 1 if any overhead grew beyond --threshold.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Tolerated growth of the overhead in percent.",
+    )
+
+    args = parser.parse_args(argv)
+    params = profiles.CHEAPEST
+
+    results = measure_overhead(params, repeat=args.repeat)
+    report: dict[str, object] = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "parameters": {
+            **dataclasses.asdict(params),
+            "type": params.type.name,
+        },
+        "results": [dataclasses.asdict(r) for r in results],
+    }
+
+    if args.save:
+        args.save.write_text(json.dumps(report, indent=2) + "\n")
+
+    baseline = None
+    if args.compare:
+        baseline = {
+            r["name"]: r["overhead"]
+            for r in json.loads(args.compare.read_text())["results"]
+        }
+    regressions = (
+        []
+        if baseline is None
+        else compare_overhead(results, baseline, args.threshold / 100)
+    )
+
+    if args.json:
+        if baseline is not None:
+            report["regressions"] = [
+                dataclasses.asdict(r) for r in regressions
+            ]
+        print(json.dumps(report, indent=2))
+    else:
+        _print_overhead(results, baseline, regressions, args.threshold)
+
+    if regressions:
+        sys.exit(1)
+
+
+def _print_overhead(
+    results: list[OverheadResult],
+    baseline: dict[str, float] | None,
+    regressions: list[Regression],
+    threshold: float,
+) -> None:
+    print(
+        "Python overhead per call in microseconds using the CHEAPEST "
+        "profile:\n"
+    )
+    print(
+        f"{'operation':<34} {'total':>8} {'C':>8} {'overhead':>9}"
+        + (f" {'baseline':>9}" if baseline is not None else "")
+    )
+    for r in results:
+        c = "-" if r.c is None else f"{r.c:.2f}"
+        line = f"{r.name:<34} {r.total:>8.2f} {c:>8} {r.overhead:>9.2f}"
+        if baseline is not None:
+            base = baseline.get(r.name)
+            line += (
+                f" {'-':>9}"
+                if not base
+                else f" {r.overhead / base - 1:>+9.1%}"
+            )
+        print(line)
+
+    if baseline is None:
+        return
+
+    print()
+    if not regressions:
+        print(f"No regressions beyond {threshold:g}%.")
+        return
+
+    print(f"Regressions beyond {threshold:g}%:")
+    for reg in regressions:
+        print(
+            f"  {reg.name}: {reg.baseline:.2f} -> {reg.current:.2f} "
+            f"({reg.change:+.1%})"
+        )
+
+
+def main(argv: list[str]) -> None:
+    if argv[1:2] == ["bench"]:
+        bench(argv[2:])
+        return
+
+    if argv[1:2] == ["overhead"]:
+        overhead(argv[2:])
+        return
+
+    if argv[1:2] == ["scaling"]:
+        scaling(argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(
+        prog="python -m argon2",
+        description="Benchmark Argon2. Use `bench` as the first argument to "
+        "benchmark under concurrency, `scaling` to compare scaling across "
+        "threads and processes, or `overhead` to measure the overhead of the "
+        "Python wrapper.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "-n", type=int, default=100, help="Number of iterations to measure."
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=3,
+        help="Number of iterations to run before measuring.",
+    )
+    _add_parameter_arguments(parser, multiple_profiles=True)
+
+    args = parser.parse_args(argv[1:])
+
+    runs = (
+        [(name, getattr(profiles, name)) for name in args.profile]
+        if args.profile
+        else [(None, _parameters_from_args(args))]
+    )
+
+    print(
+        f"Running each operation {args.n} times after {args.warmup} warmup "
+        "runs."
+    )
+    for name, params in runs:
+        print()
+        if name:
+            print(f"Profile {name}:")
+        print(f"type: Argon2{params.type.name.lower()}")
+        _print_parameters(params)
+        _print_latencies(params, n=args.n, warmup=args.warmup)
+
+
+def _print_latencies(params: Parameters, *, n: int, warmup: int) -> None:
+    ph = PasswordHasher.from_parameters(params)
+    hash = ph.hash(PASSWORD)
+    salt = os.urandom(params.salt_len)
+
+    print("\nMeasuring...\n")
+    for label, fn in [
+        ("hash", lambda: ph.hash(PASSWORD)),
+        ("verify", lambda: ph.verify(hash, PASSWORD)),
+        (
+            "hash_secret_raw",
+            lambda: hash_secret_raw(
+                PASSWORD,
+                salt,
+                params.time_cost,
+                params.memory_cost,
+                params.parallelism,
+                params.hash_len,
+                params.type,
+                params.version,
+            ),
+        ),
+    ]:
+        r = measure_latency(fn, n=n, warmup=warmup)
+        ci = "n/a" if r.ci is None else f"{r.ci:.3f}ms"
+        print(
+            f"{label:<16} {r.mean:.3f}ms ± {ci} (95% CI, "
+            f"{r.outliers} outlier(s) rejected)"
+        )
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,185 @@
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import sys
+
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Literal, TypeVar
+
+from ._password_hasher import PasswordHasher
+from ._utils import Parameters
+
+
+T = TypeVar("T")
+
+
+def _running_under_trio() -> bool:
+    """
+    Check whether we're called from within a Trio event loop.
+
+    We don't import Trio ourselves: if it's not imported yet, nobody can be
+    running it.
+    """
+    trio = sys.modules.get("trio")
+    if trio is None:
+        return False
+
+    try:
+        trio.lowlevel.current_task()
+    except RuntimeError:
+        return False
+
+    return True
+
+
+async def _wait_trio(fut: Future[T]) -> T:
+    """
+    Wait for *fut* without blocking Trio's event loop.
+    """
+    import trio
+
+    token = trio.lowlevel.current_trio_token()
+    done = trio.Event()
+
+    def wake_up(_: Future[T]) -> None:
+        with contextlib.suppress(trio.RunFinishedError):
+            token.run_sync_soon(done.set)
+
+    fut.add_done_callback(wake_up)
+    try:
+        await done.wait()
+    except trio.Cancelled:
+        fut.cancel()
+        raise
+
+    return fut.result()
+
+
+class AsyncPasswordHasher:
+    r"""
+    Asynchronous version of :class:`PasswordHasher`.
+
+    Hashing and verifying is CPU-bound and takes tens of milliseconds with the
+    default parameters, so it's run in a dedicated pool of at most
+    *max_workers* threads.  Since Argon2 releases the GIL, the event loop stays
+    responsive and throughput scales to the number of workers.
+
+    Jobs that wait for a free worker are cancelled together with the task
+    that awaits them.  Jobs that already started run to completion, but their
+    results are discarded.
+
+    Works with :mod:`asyncio`, and with Trio_ or AnyIO_ on either backend.
+
+    Args:
+        password_hasher:
+            The :class:`PasswordHasher` that does the actual work.  If None, a
+            new one with default parameters is created.
+
+        max_workers:
+            Maximum number of hashes that are computed concurrently.  If None,
+            the number of CPUs is used.
+
+    .. versionadded:: 26.1.0
+
+    .. _Trio: https://trio.readthedocs.io/
+    .. _AnyIO: https://anyio.readthedocs.io/
+    """
+
+    __slots__ = ["_executor", "_password_hasher"]
+
+    _executor: ThreadPoolExecutor
+    _password_hasher: PasswordHasher
+
+    def __init__(
+        self,
+        password_hasher: PasswordHasher | None = None,
+        *,
+        max_workers: int | None = None,
+    ):
+        if password_hasher is None:
+            password_hasher = PasswordHasher()
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        self._password_hasher = password_hasher
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="argon2"
+        )
+
+    @classmethod
+    def from_parameters(
+        cls, params: Parameters, *, max_workers: int | None = None
+    ) -> AsyncPasswordHasher:
+        """
+        Construct an `AsyncPasswordHasher` from *params*.
+
+        Returns:
+            An `AsyncPasswordHasher` instance with the parameters from
+            *params*.
+        """
+        return cls(
+            PasswordHasher.from_parameters(params), max_workers=max_workers
+        )
+
+    @property
+    def password_hasher(self) -> PasswordHasher:
+        """
+        The wrapped :class:`PasswordHasher`.
+        """
+        return self._password_hasher
+
+    async def _run(self, fn: Callable[..., T], *args: Any, **kw: Any) -> T:
+        fut = self._executor.submit(fn, *args, **kw)
+        if _running_under_trio():
+            return await _wait_trio(fut)
+
+        return await asyncio.wrap_future(fut)
+
+    async def hash(
+        self, password: str | bytes, *, salt: bytes | None = None
+    ) -> str:
+        """
+        Hash *password* and return an encoded hash.
+
+        See :meth:`PasswordHasher.hash`.
+        """
+        return await self._run(self._password_hasher.hash, password, salt=salt)
+
+    async def verify(
+        self, hash: str | bytes, password: str | bytes
+    ) -> Literal[True]:
+        """
+        Verify that *password* matches *hash*.
+
+        See :meth:`PasswordHasher.verify`.
+        """
+        return await self._run(self._password_hasher.verify, hash, password)
+
+    def check_needs_rehash(self, hash: str | bytes) -> bool:
+        """
+        Check whether *hash* was created using the instance's parameters.
+
+        This is cheap and therefore not asynchronous.  See
+        :meth:`PasswordHasher.check_needs_rehash`.
+        """
+        return self._password_hasher.check_needs_rehash(hash)
+
+    def close(self) -> None:
+        """
+        Shut down the worker threads.
+
+        Jobs that haven't started yet are cancelled.  It's not possible to
+        hash or verify using this instance afterwards.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> AsyncPasswordHasher:  # noqa: PYI034
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,515 @@
+# SPDX-License-Identifier: MIT
+
+"""
+Measurement helpers for ``python -m argon2``.
+
+They live outside of ``__main__`` so worker processes can import them.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import statistics
+import sys
+import threading
+import time
+import timeit
+
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from _argon2_cffi_bindings import ffi, lib
+
+from . import low_level
+from ._password_hasher import PasswordHasher, _ensure_bytes
+from ._utils import Parameters, _check_types, extract_parameters
+from .low_level import Type, hash_secret_raw
+
+
+try:
+    import resource
+except ImportError:  # pragma: no cover -- Windows
+    resource = None  # type: ignore[assignment]
+
+
+Operation = Literal["hash", "verify"]
+PASSWORD = b"secret"
+
+# Two-sided 95% quantile of the standard normal distribution.
+_Z_95 = statistics.NormalDist().inv_cdf(0.975)
+
+
+@dataclass(frozen=True, slots=True)
+class ThroughputResult:
+    """
+    Throughput and resource usage of one operation under concurrency.
+
+    Latencies are in milliseconds, *peak_rss* is the sum of the peak resident
+    set sizes of all worker processes in bytes, and *cpu_utilization* is the
+    share of all CPUs that were busy.
+    """
+
+    operation: Operation
+    ops: int
+    wall: float
+    ops_per_sec: float
+    p50: float
+    p95: float
+    p99: float
+    peak_rss: int | None
+    cpu_utilization: float
+
+
+@dataclass(frozen=True, slots=True)
+class LatencyResult:
+    """
+    Latency of one operation in milliseconds after rejecting outliers.
+
+    *ci* is the half-width of the 95% confidence interval of *mean*, or None
+    if there are too few samples to compute it.
+    """
+
+    mean: float
+    ci: float | None
+    samples: int
+    outliers: int
+
+
+@dataclass(frozen=True, slots=True)
+class OverheadResult:
+    """
+    Per-call cost of one operation in microseconds.
+
+    *overhead* is the time spent in Python and *c* the rest -- the time spent
+    in Argon2 -- or None for operations that don't call into Argon2.
+    """
+
+    name: str
+    total: float
+    c: float | None
+    overhead: float
+
+
+@dataclass(frozen=True, slots=True)
+class Regression:
+    """
+    An operation whose overhead grew beyond the threshold compared to a
+    baseline.  *change* is relative, so 0.5 means 50% slower.
+    """
+
+    name: str
+    baseline: float
+    current: float
+    change: float
+
+
+@dataclass(frozen=True, slots=True)
+class ScalingResult:
+    """
+    Throughput of one operation with *workers* concurrent workers -- once as
+    threads in a single process and once as single-threaded processes.
+
+    *threads_ops_per_sec* divided by *processes_ops_per_sec* shows how close
+    threads come to processes: on free-threaded builds it should be close to
+    1.0.
+    """
+
+    workers: int
+    threads_ops_per_sec: float
+    processes_ops_per_sec: float
+
+
+def reject_outliers(samples: list[float]) -> list[float]:
+    """
+    Drop samples outside of Tukey's fences -- 1.5 interquartile ranges below
+    the first or above the third quartile.
+    """
+    if len(samples) < 4:
+        return samples
+
+    q1, _, q3 = statistics.quantiles(samples, n=4, method="inclusive")
+    iqr = q3 - q1
+    low, high = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+    return [s for s in samples if low <= s <= high]
+
+
+def measure_latency(
+    fn: Callable[[], object], *, n: int, warmup: int
+) -> LatencyResult:
+    """
+    Call *fn* *warmup* times without measuring and then *n* times measuring
+    each call.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    kept = reject_outliers(samples)
+
+    return LatencyResult(
+        mean=statistics.fmean(kept),
+        ci=(
+            _Z_95 * statistics.stdev(kept) / math.sqrt(len(kept))
+            if len(kept) > 1
+            else None
+        ),
+        samples=len(kept),
+        outliers=len(samples) - len(kept),
+    )
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """
+    Return the *p*-th percentile of *sorted_values* using the nearest-rank
+    method.
+    """
+    rank = math.ceil(p / 100 * len(sorted_values))
+
+    return sorted_values[max(rank, 1) - 1]
+
+
+def split(n: int, k: int) -> list[int]:
+    """
+    Split *n* into *k* parts whose sizes differ by at most one.
+    """
+    q, r = divmod(n, k)
+
+    return [q + 1] * r + [q] * (k - r)
+
+
+def _peak_rss() -> int | None:
+    if resource is None:  # pragma: no cover -- Windows
+        return None
+
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kibibytes, macOS bytes.
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def _throughput_worker(
+    params: Parameters,
+    operation: Operation,
+    threads: int,
+    n: int,
+    hash: str,
+) -> tuple[list[float], float, float, float, int | None]:
+    """
+    Run *n* *operation*s in *threads* threads.
+
+    Returns:
+        The latencies in seconds, the wall clock times when the measurement
+        started and ended, the CPU time used, and the peak RSS.
+    """
+    ph = PasswordHasher.from_parameters(params)
+    if operation == "hash":
+
+        def op() -> None:
+            ph.hash(PASSWORD)
+
+    else:
+
+        def op() -> None:
+            ph.verify(hash, PASSWORD)
+
+    # Page in the library and the memory before measuring.
+    op()
+
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def run(count: int) -> None:
+        own = []
+        for _ in range(count):
+            start = time.perf_counter()
+            op()
+            own.append(time.perf_counter() - start)
+
+        with lock:
+            latencies.extend(own)
+
+    workers = [
+        threading.Thread(target=run, args=(count,))
+        for count in split(n, threads)
+    ]
+
+    cpu_start = time.process_time()
+    start = time.time()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    end = time.time()
+    cpu = time.process_time() - cpu_start
+
+    return latencies, start, end, cpu, _peak_rss()
+
+
+def measure_throughput(
+    params: Parameters,
+    operation: Operation,
+    *,
+    threads: int,
+    processes: int,
+    n: int,
+) -> ThroughputResult:
+    """
+    Run *operation* *n* times in *processes* fresh worker processes with
+    *threads* threads each.
+    """
+    hash = PasswordHasher.from_parameters(params).hash(PASSWORD)
+    counts = [c for c in split(n, processes) if c]
+
+    with ProcessPoolExecutor(len(counts)) as ppe:
+        futures = [
+            ppe.submit(
+                _throughput_worker, params, operation, threads, count, hash
+            )
+            for count in counts
+        ]
+        results = [f.result() for f in futures]
+
+    latencies = sorted(lat * 1000 for r in results for lat in r[0])
+    wall = max(r[2] for r in results) - min(r[1] for r in results)
+    cpu = sum(r[3] for r in results)
+    rsss = [r[4] for r in results]
+
+    return ThroughputResult(
+        operation=operation,
+        ops=len(latencies),
+        wall=wall,
+        ops_per_sec=len(latencies) / wall,
+        p50=percentile(latencies, 50),
+        p95=percentile(latencies, 95),
+        p99=percentile(latencies, 99),
+        peak_rss=None if None in rsss else sum(rsss),  # type: ignore[arg-type]
+        cpu_utilization=cpu / (wall * (os.cpu_count() or 1)),
+    )
+
+
+def gil_enabled() -> bool:
+    """
+    Return whether the GIL is enabled, which it always is before Python 3.13.
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def worker_counts(max_workers: int) -> list[int]:
+    """
+    Return the powers of two up to *max_workers*, and *max_workers* itself.
+    """
+    counts = []
+    n = 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+
+    return [*counts, max_workers]
+
+
+def measure_scaling(
+    params: Parameters,
+    operation: Operation,
+    *,
+    workers: list[int],
+    n: int,
+) -> list[ScalingResult]:
+    """
+    Run *operation* *n* times per worker for each number of *workers*; once
+    in threads of a single process and once in as many processes.
+    """
+    return [
+        ScalingResult(
+            workers=w,
+            threads_ops_per_sec=measure_throughput(
+                params, operation, threads=w, processes=1, n=n * w
+            ).ops_per_sec,
+            processes_ops_per_sec=measure_throughput(
+                params, operation, threads=1, processes=w, n=n * w
+            ).ops_per_sec,
+        )
+        for w in workers
+    ]
+
+
+def _fastest_per_call_us(
+    fn: Callable[[], object], *, repeat: int, number: int | None
+) -> float:
+    """
+    Return the fastest per-call time of *fn* in microseconds out of *repeat*
+    runs of *number* calls.  If *number* is None, it's chosen such that each
+    run takes at least 0.2 seconds.
+    """
+    timer = timeit.Timer(fn)
+    if number is None:
+        number, _ = timer.autorange()
+
+    return min(timer.repeat(repeat, number)) / number * 1_000_000
+
+
+class _NullLib:
+    """
+    Forward everything to the real ``lib`` except for the functions that
+    compute hashes, which succeed immediately without doing anything.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(lib, name)
+
+    @staticmethod
+    def argon2_verify(*_args: object) -> int:
+        return lib.ARGON2_OK  # type: ignore[no-any-return]
+
+    argon2_ctx = argon2_verify
+
+    @staticmethod
+    def argon2_hash(*args: Any) -> int:
+        # Like Argon2, fill the encoded hash -- if requested -- so callers
+        # don't decode uninitialized memory.
+        encoded, encoded_len = args[9], args[10]
+        if encoded != ffi.NULL:
+            ffi.memmove(encoded, bytes(encoded_len), encoded_len)
+
+        return lib.ARGON2_OK  # type: ignore[no-any-return]
+
+
+@contextmanager
+def _without_argon2() -> Iterator[None]:
+    """
+    Make all calls into Argon2 return immediately, so that only the time
+    spent in Python remains.
+    """
+    low_level.lib = _NullLib()  # type: ignore[attr-defined]
+    try:
+        yield
+    finally:
+        low_level.lib = lib  # type: ignore[attr-defined]
+
+
+def _overhead_cases(
+    params: Parameters,
+) -> list[tuple[str, Callable[[], object], bool]]:
+    """
+    Return the name, the call, and whether it calls into Argon2 for each
+    operation whose overhead is measured.
+    """
+    ph = PasswordHasher.from_parameters(params)
+    hash = ph.hash(PASSWORD)
+    salt = os.urandom(params.salt_len)
+
+    return [
+        ("PasswordHasher.hash", lambda: ph.hash(PASSWORD), True),
+        ("PasswordHasher.verify", lambda: ph.verify(hash, PASSWORD), True),
+        (
+            "low_level.hash_secret_raw",
+            lambda: hash_secret_raw(
+                PASSWORD,
+                salt,
+                params.time_cost,
+                params.memory_cost,
+                params.parallelism,
+                params.hash_len,
+                params.type,
+                params.version,
+            ),
+            True,
+        ),
+        (
+            "PasswordHasher.check_needs_rehash",
+            lambda: ph.check_needs_rehash(hash),
+            False,
+        ),
+        ("extract_parameters", lambda: extract_parameters(hash), False),
+        (
+            "_check_types",
+            lambda: _check_types(
+                time_cost=(params.time_cost, int),
+                memory_cost=(params.memory_cost, int),
+                parallelism=(params.parallelism, int),
+                hash_len=(params.hash_len, int),
+                salt_len=(params.salt_len, int),
+                encoding=("utf-8", str),
+                type=(params.type, Type),
+            ),
+            False,
+        ),
+        ("_ensure_bytes", lambda: _ensure_bytes("secret", "utf-8"), False),
+    ]
+
+
+def measure_overhead(
+    params: Parameters, *, repeat: int, number: int | None = None
+) -> list[OverheadResult]:
+    """
+    Measure how much time each operation spends in Python on top of Argon2,
+    using *params* for the operations that hash.
+
+    The overhead is measured directly by making Argon2 a no-op -- subtracting
+    the time of bare C calls would drown it in Argon2's own jitter.
+
+    See `_fastest_per_call_us` for *repeat* and *number*.
+    """
+    results = []
+    for name, fn, calls_c in _overhead_cases(params):
+        total = _fastest_per_call_us(fn, repeat=repeat, number=number)
+        if calls_c:
+            with _without_argon2():
+                overhead = _fastest_per_call_us(
+                    fn, repeat=repeat, number=number
+                )
+            c: float | None = max(total - overhead, 0.0)
+        else:
+            overhead = total
+            c = None
+
+        results.append(
+            OverheadResult(name=name, total=total, c=c, overhead=overhead)
+        )
+
+    return results
+
+
+def compare_overhead(
+    results: list[OverheadResult],
+    baseline: dict[str, float],
+    threshold: float,
+) -> list[Regression]:
+    """
+    Compare the overhead of *results* to *baseline* -- a mapping of operation
+    names to their overhead.
+
+    Returns:
+        The operations whose overhead grew by more than *threshold* (relative,
+        so 0.1 means 10%).  Operations that are missing from *baseline* are
+        ignored.
+    """
+    regressions = []
+    for r in results:
+        base = baseline.get(r.name)
+        if not base:
+            continue
+
+        change = r.overhead / base - 1
+        if change > threshold:
+            regressions.append(
+                Regression(
+                    name=r.name,
+                    baseline=base,
+                    current=r.overhead,
+                    change=change,
+                )
+            )
+
+    return regressions
@@ -0,0 +1,252 @@
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import threading
+import time
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Literal
+
+from ._fork import _register_after_fork
+from ._password_hasher import PasswordHasher
+from ._utils import Parameters, _extract_parameters, _hash_to_str
+from .exceptions import MemoryBudgetExceededError
+
+
+@dataclass(frozen=True, slots=True)
+class BudgetStats:
+    """
+    A snapshot of the state of a :class:`BudgetedPasswordHasher`.
+
+    Attributes:
+        in_use: Bytes currently reserved by running jobs.
+
+        queue_depth: Number of jobs currently waiting for memory.
+
+        admitted: Total number of admitted jobs.
+
+        rejected: Total number of rejected jobs.
+
+        total_wait: Total time in seconds that admitted jobs waited.
+
+        max_wait: Longest time in seconds that an admitted job waited.
+
+    .. versionadded:: 26.1.0
+    """
+
+    in_use: int
+    queue_depth: int
+    admitted: int
+    rejected: int
+    total_wait: float
+    max_wait: float
+
+
+class BudgetedPasswordHasher:
+    """
+    A :class:`PasswordHasher` that keeps the memory used by concurrent jobs
+    within a budget.
+
+    Before hashing or verifying, the memory cost of the job is determined --
+    when verifying using :func:`argon2.extract_parameters` on the hash.  If
+    the job doesn't fit into what's left of *max_memory*, it waits for running
+    jobs to finish.  Jobs are admitted in the order they arrived.
+
+    Args:
+        password_hasher:
+            The :class:`PasswordHasher` that does the actual work.  If None, a
+            new one with default parameters is created.
+
+        max_memory:
+            Maximum number of bytes that all running jobs may use together.
+
+        timeout:
+            Maximum number of seconds a job waits for memory.  If None, jobs
+            wait indefinitely; if 0, they are rejected immediately if they
+            don't fit.
+
+    Raises:
+        argon2.exceptions.MemoryBudgetExceededError:
+            From :meth:`hash` and :meth:`verify` if a job has been rejected.
+
+    .. versionadded:: 26.1.0
+    """
+
+    __slots__ = [
+        "__weakref__",
+        "_admitted",
+        "_cond",
+        "_in_use",
+        "_max_wait",
+        "_password_hasher",
+        "_rejected",
+        "_total_wait",
+        "_waiters",
+        "max_memory",
+        "timeout",
+    ]
+
+    _password_hasher: PasswordHasher
+    max_memory: int
+    timeout: float | None
+
+    def __init__(
+        self,
+        password_hasher: PasswordHasher | None = None,
+        *,
+        max_memory: int,
+        timeout: float | None = None,
+    ):
+        if password_hasher is None:
+            password_hasher = PasswordHasher()
+
+        self._password_hasher = password_hasher
+        self.max_memory = max_memory
+        self.timeout = timeout
+
+        self._cond = threading.Condition()
+        self._waiters: deque[object] = deque()
+        self._in_use = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+        _register_after_fork(self)
+
+    def _after_fork(self) -> None:
+        # Running and waiting jobs belong to threads of the parent that don't
+        # exist in the child.
+        self._cond = threading.Condition()
+        self._waiters = deque()
+        self._in_use = 0
+
+    @property
+    def password_hasher(self) -> PasswordHasher:
+        """
+        The wrapped :class:`PasswordHasher`.
+        """
+        return self._password_hasher
+
+    def stats(self) -> BudgetStats:
+        """
+        Return the current state of the budget.
+        """
+        with self._cond:
+            return BudgetStats(
+                in_use=self._in_use,
+                queue_depth=len(self._waiters),
+                admitted=self._admitted,
+                rejected=self._rejected,
+                total_wait=self._total_wait,
+                max_wait=self._max_wait,
+            )
+
+    def _reject(self, msg: str) -> MemoryBudgetExceededError:
+        self._rejected += 1
+
+        return MemoryBudgetExceededError(msg)
+
+    def _acquire(self, size: int) -> None:
+        with self._cond:
+            if size > self.max_memory:
+                msg = (
+                    f"Job needs {size} bytes but the budget is only "
+                    f"{self.max_memory} bytes."
+                )
+                raise self._reject(msg)
+
+            if not self._waiters and self._in_use + size <= self.max_memory:
+                self._in_use += size
+                self._admitted += 1
+                return
+
+            if self.timeout == 0:
+                msg = "Not enough memory left in budget."
+                raise self._reject(msg)
+
+            start = time.monotonic()
+            deadline = None if self.timeout is None else start + self.timeout
+
+            me = object()
+            self._waiters.append(me)
+            try:
+                while (
+                    self._waiters[0] is not me
+                    or self._in_use + size > self.max_memory
+                ):
+                    remaining = None
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            msg = "Timed out waiting for memory in budget."
+                            raise self._reject(msg)
+
+                    self._cond.wait(remaining)
+            finally:
+                self._waiters.remove(me)
+                # The next waiter in line may fit now.
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            self._in_use += size
+            self._admitted += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+    def _release(self, size: int) -> None:
+        with self._cond:
+            self._in_use -= size
+            self._cond.notify_all()
+
+    @contextmanager
+    def _reserve(self, params: Parameters) -> Iterator[None]:
+        size = params.memory_cost * 1024
+
+        self._acquire(size)
+        try:
+            yield
+        finally:
+            self._release(size)
+
+    def hash(self, password: str | bytes, *, salt: bytes | None = None) -> str:
+        """
+        Hash *password* as soon as it fits into the budget.
+
+        See :meth:`PasswordHasher.hash`.
+        """
+        with self._reserve(self._password_hasher._parameters):
+            return self._password_hasher.hash(password, salt=salt)
+
+    def verify(
+        self, hash: str | bytes, password: str | bytes
+    ) -> Literal[True]:
+        """
+        Verify *password* against *hash* as soon as it fits into the budget.
+
+        See :meth:`PasswordHasher.verify`.
+        """
+        hash_str = _hash_to_str(hash)
+        # Reject hashes beyond the limits before they queue for memory.
+        limits = self._password_hasher.limits
+        params = (
+            _extract_parameters(hash_str)
+            if limits is None
+            else limits._check(hash_str)
+        )
+
+        with self._reserve(params):
+            return self._password_hasher.verify(hash, password)
+
+    def check_needs_rehash(self, hash: str | bytes) -> bool:
+        """
+        Check whether *hash* was created using the instance's parameters.
+
+        This is cheap and therefore not subject to the budget.  See
+        :meth:`PasswordHasher.check_needs_rehash`.
+        """
+        return self._password_hasher.check_needs_rehash(hash)
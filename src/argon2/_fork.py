@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import os
+import weakref
+
+from typing import TYPE_CHECKING, Protocol
+
+
+if TYPE_CHECKING:
+    from ._utils import Parameters
+    from .low_level import MemoryArena
+
+
+class _ForkAware(Protocol):
+    def _after_fork(self) -> None: ...
+
+
+# Objects with locks -- and the state they protect -- that must be reset in the
+# child after a fork.  The threads that may have held the locks or were in the
+# middle of a hash don't exist in the child.
+_fork_aware: weakref.WeakSet[_ForkAware] = weakref.WeakSet()
+
+
+def _register_after_fork(obj: _ForkAware) -> None:
+    """
+    Call *obj*'s ``_after_fork`` in the child process after each fork, as long
+    as *obj* is alive.
+    """
+    _fork_aware.add(obj)
+
+
+def _reinit_after_fork() -> None:
+    for obj in list(_fork_aware):
+        obj._after_fork()
+
+
+if hasattr(os, "register_at_fork"):  # pragma: no branch -- not on Windows
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
+def warmup(
+    params: Parameters | None = None,
+    *,
+    allocator: MemoryArena | None = None,
+) -> None:
+    """
+    Prepare the current process for hashing and verifying using *params*.
+
+    Call it in the master process of pre-fork servers like gunicorn or uWSGI
+    before it forks its workers, so they don't pay for it on their first
+    request.  It loads the CFFI bindings and pages in Argon2 by hashing and
+    verifying a password, and fills the cache of parsed hash headers and
+    :meth:`PasswordHasher.for_parameters`'s shared instances.
+
+    The locks and counters of :class:`~argon2.low_level.MemoryArena`,
+    :class:`~argon2.low_level.ThreadLimiter`,
+    :class:`BudgetedPasswordHasher`, and :class:`UsageMeter` are reset in the
+    child after each fork, so it's safe to create them before forking.
+
+    Args:
+        params:
+            The parameters to warm up for.  If None,
+            :func:`argon2.profiles.get_default_parameters` is used.
+
+        allocator:
+            A :class:`~argon2.low_level.MemoryArena` that each forked worker
+            fills up to its *max_buffers* with fresh buffers that fit *params*
+            right after the fork and faults in all of their pages.  It isn't
+            filled in the calling process: the master would keep the memory
+            for good, and each worker would copy the inherited pages one by
+            one on its first hash.  Processes that the workers fork in turn
+            don't fill it again.
+
+    .. versionadded:: 26.1.0
+    """
+    from ._meter import _memory_bytes
+    from ._password_hasher import PasswordHasher
+    from .profiles import get_default_parameters
+
+    if params is None:
+        params = get_default_parameters()
+
+    if allocator is not None:
+        allocator._fill_after_fork = _memory_bytes(
+            params.memory_cost, params.parallelism
+        )
+
+    ph = PasswordHasher.for_parameters(params)
+    hash = ph.hash(b"warmup")
+    ph.verify(hash, b"warmup")
+    ph.check_needs_rehash(hash)
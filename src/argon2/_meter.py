@@ -0,0 +1,243 @@
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import threading
+import time
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Literal
+
+from _argon2_cffi_bindings import lib
+
+from ._fork import _register_after_fork
+from ._utils import Parameters, _extract_parameters, _hash_to_str
+from .exceptions import InvalidHashError, VerifyMismatchError
+
+
+# Argon2's blocks are always 1 KiB.  The bindings don't export the constant.
+_BLOCK_SIZE = 1024
+
+
+def _memory_bytes(memory_cost: int, parallelism: int) -> int:
+    """
+    Compute how many bytes Argon2 allocates for its blocks, exactly like
+    ``initialize`` in Argon2's ``core.c`` does: at least two blocks per
+    segment, rounded down to full segments.
+    """
+    segments: int = parallelism * lib.ARGON2_SYNC_POINTS
+    blocks = max(memory_cost, 2 * segments)
+
+    return blocks // segments * segments * _BLOCK_SIZE
+
+
+def _parameters_or_none(hash: bytes) -> Parameters | None:
+    """
+    Return the parameters of *hash*, or None if it can't be parsed -- in which
+    case Argon2 won't get far enough to allocate memory either.
+    """
+    try:
+        return _extract_parameters(_hash_to_str(hash))
+    except InvalidHashError:
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class CallStats:
+    """
+    The cost of one hash or verification.
+
+    Attributes:
+        operation: Whether a password was hashed or verified.
+
+        memory: Bytes allocated by Argon2.
+
+        wall_time: Wall clock time in seconds.
+
+        cpu_time:
+            CPU time in seconds that the calling thread used during the call.
+            Only known if Argon2 computed all lanes in the calling thread --
+            that is, if the hash has a *parallelism* of 1 or the
+            :class:`PasswordHasher` has *threads* of 1.  Otherwise, the lanes
+            were computed in threads whose CPU time can't be told apart from
+            that of concurrent calls, and it's None.
+
+    .. versionadded:: 26.1.0
+    """
+
+    operation: Literal["hash", "verify"]
+    memory: int
+    wall_time: float
+    cpu_time: float | None
+
+
+@dataclass(frozen=True, slots=True)
+class UsageStats:
+    """
+    A snapshot of the totals of a :class:`UsageMeter`.
+
+    Attributes:
+        hashes: Number of hashed passwords.
+
+        verifications: Number of verified passwords, including mismatches.
+
+        memory: Total bytes allocated by Argon2.
+
+        wall_time: Total wall clock time in seconds.
+
+        cpu_time:
+            Total CPU time in seconds of the calls whose CPU time is known,
+            see :attr:`CallStats.cpu_time`.
+
+    .. versionadded:: 26.1.0
+    """
+
+    hashes: int
+    verifications: int
+    memory: int
+    wall_time: float
+    cpu_time: float
+
+
+class UsageMeter:
+    """
+    Account for the memory, wall clock time, and CPU time of each hash and
+    verification.
+
+    Pass it as *meter* to :class:`PasswordHasher` -- or share one between
+    several of them.  Totals are available from :meth:`stats`; if you need
+    the cost of every single call, pass *on_call*.
+
+    Hashes and verifications are metered including the parsing and encoding
+    around Argon2 and regardless of whether they succeed.
+    :meth:`PasswordHasher.verify_many`, :meth:`PasswordHasher.verify_any`,
+    :meth:`PasswordHasher.verify_all`, and the work of a
+    :class:`ProcessPoolPasswordHasher`'s workers are not metered.
+
+    Args:
+        on_call:
+            Called with the :class:`CallStats` of each call from the thread
+            that made the call.
+
+    .. versionadded:: 26.1.0
+    """
+
+    __slots__ = (
+        "__weakref__",
+        "_cpu_time",
+        "_hashes",
+        "_lock",
+        "_memory",
+        "_verifications",
+        "_wall_time",
+        "on_call",
+    )
+
+    on_call: Callable[[CallStats], None] | None
+
+    def __init__(self, on_call: Callable[[CallStats], None] | None = None):
+        self.on_call = on_call
+
+        self._lock = threading.Lock()
+        self._hashes = 0
+        self._verifications = 0
+        self._memory = 0
+        self._wall_time = 0.0
+        self._cpu_time = 0.0
+
+        _register_after_fork(self)
+
+    def _after_fork(self) -> None:
+        # Keep the totals -- they're the parent's until reset -- but not a
+        # lock that may have been held by a thread of the parent.
+        self._lock = threading.Lock()
+
+    def stats(self) -> UsageStats:
+        """
+        Return the totals of all metered calls.
+        """
+        with self._lock:
+            return UsageStats(
+                hashes=self._hashes,
+                verifications=self._verifications,
+                memory=self._memory,
+                wall_time=self._wall_time,
+                cpu_time=self._cpu_time,
+            )
+
+    def reset(self) -> None:
+        """
+        Set all totals to zero.
+        """
+        with self._lock:
+            self._hashes = 0
+            self._verifications = 0
+            self._memory = 0
+            self._wall_time = 0.0
+            self._cpu_time = 0.0
+
+    def _record(self, stats: CallStats) -> None:
+        with self._lock:
+            if stats.operation == "hash":
+                self._hashes += 1
+            else:
+                self._verifications += 1
+            self._memory += stats.memory
+            self._wall_time += stats.wall_time
+            if stats.cpu_time is not None:
+                self._cpu_time += stats.cpu_time
+
+        if self.on_call is not None:
+            self.on_call(stats)
+
+    @contextmanager
+    def _measure(
+        self,
+        operation: Literal["hash", "verify"],
+        params: Parameters | None,
+        threads: int | None,
+    ) -> Iterator[None]:
+        """
+        Meter the block as *operation* with *params* computed using *threads*
+        threads.  If *params* is None, Argon2 is assumed to have allocated
+        nothing.
+        """
+        # Only if Argon2 doesn't start threads of its own, its CPU time is
+        # that of the calling thread.  The process's CPU time would include
+        # all concurrent calls.
+        cpu_start = (
+            time.thread_time()
+            if params is None or params.parallelism == 1 or threads == 1
+            else None
+        )
+        start = time.perf_counter()
+        try:
+            yield
+        except VerifyMismatchError:
+            raise
+        except BaseException:
+            # Apart from mismatches, Argon2 fails before allocating memory.
+            params = None
+            raise
+        finally:
+            wall_time = time.perf_counter() - start
+            cpu_time = (
+                None if cpu_start is None else time.thread_time() - cpu_start
+            )
+
+            self._record(
+                CallStats(
+                    operation=operation,
+                    memory=(
+                        0
+                        if params is None
+                        else _memory_bytes(
+                            params.memory_cost, params.parallelism
+                        )
+                    ),
+                    wall_time=wall_time,
+                    cpu_time=cpu_time,
+                )
+            )
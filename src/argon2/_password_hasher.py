@@ -2,18 +2,48 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
 import os
 
+from collections.abc import Iterable
+from dataclasses import dataclass
 from typing import ClassVar, Literal
 
+from _argon2_cffi_bindings import lib
+
+from ._meter import UsageMeter, _parameters_or_none
+from ._prepared_hash import PreparedHash
+from ._salt_pool import SaltPool
 from ._utils import (
+    NoneType,
     Parameters,
+    VerificationLimits,
     _check_types,
+    _extract_parameters,
+    _hash_to_str,
     extract_parameters,
     validate_params_for_platform,
 )
-from .exceptions import InvalidHashError
-from .low_level import Type, hash_secret, verify_secret
+from .exceptions import (
+    HashingError,
+    InvalidHashError,
+    VerificationError,
+    VerifyMismatchError,
+)
+from .low_level import (
+    MemoryArena,
+    ThreadLimiter,
+    Type,
+    _check_threads,
+    _compare_digest,
+    _verify_secret_code,
+    error_to_str,
+    hash_secret,
+    hash_secret_raw,
+    verify_secret,
+    verify_secret_many,
+)
 from .profiles import get_default_parameters
 
 
@@ -26,6 +56,10 @@ DEFAULT_MEMORY_COST = default_params.memory_cost
 DEFAULT_PARALLELISM = default_params.parallelism
 
 
+_NOT_METERED = contextlib.nullcontext()
+_SHARED_CACHE_SIZE = 128
+
+
 def _ensure_bytes(s: bytes | str, encoding: str) -> bytes:
     """
     Ensure *s* is a bytes string.  Encode using *encoding* if it isn't.
@@ -35,6 +69,35 @@ def _ensure_bytes(s: bytes | str, encoding: str) -> bytes:
     return s.encode(encoding)
 
 
+@dataclass(frozen=True, slots=True)
+class VerificationResult:
+    """
+    The outcome of :meth:`PasswordHasher.verify_ex`.
+
+    Attributes:
+        ok: Whether the password matches the hash.
+
+        needs_rehash:
+            Whether the hash was created using different parameters than the
+            :class:`PasswordHasher`'s.  See
+            :meth:`PasswordHasher.check_needs_rehash`.
+
+        parameters: The parameters that were used to create the hash.
+
+        new_hash:
+            A new hash of the password using the :class:`PasswordHasher`'s
+            parameters if it has been requested, the password matches, and
+            the hash needs rehashing.  Otherwise None.
+
+    .. versionadded:: 26.1.0
+    """
+
+    ok: bool
+    needs_rehash: bool
+    parameters: Parameters
+    new_hash: str | None
+
+
 class PasswordHasher:
     r"""
     High level class to hash passwords with sensible defaults.
@@ -70,6 +133,33 @@ class PasswordHasher:
             Argon2 type to use.  Only change for interoperability with legacy
             systems.
 
+        allocator:
+            A :class:`argon2.low_level.MemoryArena` that Argon2's memory is
+            taken from.  If None, Argon2 allocates and frees it on every call.
+
+        thread_limiter:
+            A :class:`argon2.low_level.ThreadLimiter` that caps the number of
+            threads Argon2 uses.  If None, it uses *threads* threads.
+
+        threads:
+            Number of threads that compute the *parallelism* lanes of each
+            hash.  Unlike *parallelism*, it doesn't change the hashes, so you
+            can compute hashes with many lanes using a single thread.  Must be
+            at least 1.  If None, one thread per lane is used.
+
+        limits:
+            :class:`argon2.VerificationLimits` that hashes must stay within to
+            be verified.  Use them if you're not in full control of the hashes
+            you verify.  If None, any hash is passed to Argon2.
+
+        meter:
+            A :class:`argon2.UsageMeter` that accounts for the memory and time
+            used by each hash and verification.  If None, nothing is metered.
+
+        salt_pool:
+            A :class:`argon2.SaltPool` that random salts are taken from.  If
+            None, each salt is read from :func:`os.urandom` separately.
+
     .. versionadded:: 16.0.0
     .. versionchanged:: 18.2.0
        Switch from Argon2i to Argon2id based on the recommendation by the
@@ -81,15 +171,33 @@ class PasswordHasher:
     .. versionadded:: 21.2.0 :meth:`from_parameters`
     .. versionchanged:: 21.2.0
        Changed defaults to :data:`argon2.profiles.RFC_9106_LOW_MEMORY`.
+    .. versionadded:: 26.1.0
+       *allocator*, *thread_limiter*, *threads*, *limits*, *meter*, and
+       *salt_pool*
 
     .. _salt: https://en.wikipedia.org/wiki/Salt_(cryptography)
     .. _kibibytes: https://en.wikipedia.org/wiki/Binary_prefix#kibi
     """
 
-    __slots__ = ["_parameters", "encoding"]
+    __slots__ = [
+        "_parameters",
+        "allocator",
+        "encoding",
+        "limits",
+        "meter",
+        "salt_pool",
+        "thread_limiter",
+        "threads",
+    ]
 
     _parameters: Parameters
     encoding: str
+    allocator: MemoryArena | None
+    thread_limiter: ThreadLimiter | None
+    threads: int | None
+    limits: VerificationLimits | None
+    meter: UsageMeter | None
+    salt_pool: SaltPool | None
 
     def __init__(
         self,
@@ -100,6 +208,13 @@ class PasswordHasher:
         salt_len: int = DEFAULT_RANDOM_SALT_LENGTH,
         encoding: str = "utf-8",
         type: Type = Type.ID,
+        *,
+        allocator: MemoryArena | None = None,
+        thread_limiter: ThreadLimiter | None = None,
+        threads: int | None = None,
+        limits: VerificationLimits | None = None,
+        meter: UsageMeter | None = None,
+        salt_pool: SaltPool | None = None,
     ):
         e = _check_types(
             time_cost=(time_cost, int),
@@ -109,10 +224,18 @@ class PasswordHasher:
             salt_len=(salt_len, int),
             encoding=(encoding, str),
             type=(type, Type),
+            allocator=(allocator, (MemoryArena, NoneType)),
+            thread_limiter=(thread_limiter, (ThreadLimiter, NoneType)),
+            threads=(threads, (int, NoneType)),
+            limits=(limits, (VerificationLimits, NoneType)),
+            meter=(meter, (UsageMeter, NoneType)),
+            salt_pool=(salt_pool, (SaltPool, NoneType)),
         )
         if e:
             raise TypeError(e)
 
+        _check_threads(threads)
+
         params = Parameters(
             type=type,
             version=19,
@@ -128,9 +251,25 @@ class PasswordHasher:
         # Cache a Parameters object for check_needs_rehash.
         self._parameters = params
         self.encoding = encoding
+        self.allocator = allocator
+        self.thread_limiter = thread_limiter
+        self.threads = threads
+        self.limits = limits
+        self.meter = meter
+        self.salt_pool = salt_pool
 
     @classmethod
-    def from_parameters(cls, params: Parameters) -> PasswordHasher:
+    def from_parameters(
+        cls,
+        params: Parameters,
+        *,
+        allocator: MemoryArena | None = None,
+        thread_limiter: ThreadLimiter | None = None,
+        threads: int | None = None,
+        limits: VerificationLimits | None = None,
+        meter: UsageMeter | None = None,
+        salt_pool: SaltPool | None = None,
+    ) -> PasswordHasher:
         """
         Construct a `PasswordHasher` from *params*.
 
@@ -138,6 +277,9 @@ class PasswordHasher:
             A `PasswordHasher` instance with the parameters from *params*.
 
         .. versionadded:: 21.2.0
+        .. versionadded:: 26.1.0
+           *allocator*, *thread_limiter*, *threads*, *limits*, *meter*, and
+           *salt_pool*
         """
 
         return cls(
@@ -147,6 +289,41 @@ class PasswordHasher:
             hash_len=params.hash_len,
             salt_len=params.salt_len,
             type=params.type,
+            allocator=allocator,
+            thread_limiter=thread_limiter,
+            threads=threads,
+            limits=limits,
+            meter=meter,
+            salt_pool=salt_pool,
+        )
+
+    @classmethod
+    def for_parameters(cls, params: Parameters) -> PasswordHasher:
+        """
+        Return a shared `PasswordHasher` with the parameters from *params*.
+
+        Unlike :meth:`from_parameters`, a new instance is only created -- and
+        its parameters only validated -- the first time a set of parameters is
+        seen.  Afterwards, the same instance is returned from a process-wide
+        registry.  The 128 most recently used instances are kept.
+
+        Since the instances are shared between all callers, you must not
+        change their attributes.
+
+        Returns:
+            A shared `PasswordHasher` instance with the parameters from
+            *params*.
+
+        .. versionadded:: 26.1.0
+        """
+        return _shared_password_hasher(
+            cls,  # type: ignore[arg-type]
+            params.type,
+            params.salt_len,
+            params.hash_len,
+            params.time_cost,
+            params.memory_cost,
+            params.parallelism,
         )
 
     @property
@@ -196,15 +373,28 @@ class PasswordHasher:
 
         .. versionadded:: 23.1.0 *salt* parameter
         """
-        return hash_secret(
-            secret=_ensure_bytes(password, self.encoding),
-            salt=salt or os.urandom(self.salt_len),
-            time_cost=self.time_cost,
-            memory_cost=self.memory_cost,
-            parallelism=self.parallelism,
-            hash_len=self.hash_len,
-            type=self.type,
-        ).decode("ascii")
+        with (
+            _NOT_METERED
+            if self.meter is None
+            else self.meter._measure("hash", self._parameters, self.threads)
+        ):
+            return hash_secret(
+                secret=_ensure_bytes(password, self.encoding),
+                salt=salt
+                or (
+                    os.urandom(self.salt_len)
+                    if self.salt_pool is None
+                    else self.salt_pool.take(self.salt_len)
+                ),
+                time_cost=self.time_cost,
+                memory_cost=self.memory_cost,
+                parallelism=self.parallelism,
+                hash_len=self.hash_len,
+                type=self.type,
+                allocator=self.allocator,
+                thread_limiter=self.thread_limiter,
+                threads=self.threads,
+            ).decode("ascii")
 
     _header_to_type: ClassVar[dict[bytes, Type]] = {
         b"$argon2i$": Type.I,
@@ -222,7 +412,7 @@ class PasswordHasher:
 
             It is assumed that the caller is in full control of the hash.  No
             other parsing than the determination of the hash type is done by
-            *argon2-cffi*.
+            *argon2-cffi* -- unless the instance has *limits*.
 
         Args:
             hash: An encoded hash as returned from :meth:`PasswordHasher.hash`.
@@ -241,6 +431,9 @@ class PasswordHasher:
                 If *hash* is so clearly invalid, that it couldn't be passed to
                 Argon2.
 
+            argon2.exceptions.HashLimitExceededError:
+                If *hash* exceeds the instance's *limits*.
+
         Returns:
             ``True`` on success, otherwise an exception is raised.
 
@@ -255,8 +448,334 @@ class PasswordHasher:
         except LookupError:
             raise InvalidHashError from None
 
-        return verify_secret(
-            hash, _ensure_bytes(password, self.encoding), hash_type
+        if self.limits is not None:
+            self.limits._check(hash)
+
+        with (
+            _NOT_METERED
+            if self.meter is None
+            else self.meter._measure(
+                "verify", _parameters_or_none(hash), self.threads
+            )
+        ):
+            return verify_secret(
+                hash,
+                _ensure_bytes(password, self.encoding),
+                hash_type,
+                allocator=self.allocator,
+                thread_limiter=self.thread_limiter,
+                threads=self.threads,
+            )
+
+    def verify_prepared(
+        self, prepared: PreparedHash, password: str | bytes
+    ) -> Literal[True]:
+        """
+        Verify that *password* matches the already parsed hash *prepared*.
+
+        Works like :meth:`verify`, but instead of letting Argon2 parse the
+        encoded hash again, the raw hash is recomputed using the decoded salt
+        and parameters and compared in constant time.
+
+        Args:
+            prepared: A hash parsed by :class:`PreparedHash`.
+
+            password: The password to verify.
+
+        Raises:
+            argon2.exceptions.VerifyMismatchError:
+                If verification fails because *prepared* is not valid for
+                *password*.
+
+            argon2.exceptions.VerificationError:
+                If verification fails for other reasons.
+
+            argon2.exceptions.HashLimitExceededError:
+                If *prepared* exceeds the instance's cost *limits*.
+
+        Returns:
+            ``True`` on success, otherwise an exception is raised.
+
+        .. versionadded:: 26.1.0
+        """
+        params = prepared._parameters
+        if self.limits is not None:
+            self.limits._check_parameters(params)
+
+        with (
+            _NOT_METERED
+            if self.meter is None
+            else self.meter._measure("verify", params, self.threads)
+        ):
+            try:
+                computed = hash_secret_raw(
+                    _ensure_bytes(password, self.encoding),
+                    prepared.salt,
+                    params.time_cost,
+                    params.memory_cost,
+                    params.parallelism,
+                    len(prepared.digest),
+                    params.type,
+                    params.version,
+                    allocator=self.allocator,
+                    thread_limiter=self.thread_limiter,
+                    threads=self.threads,
+                )
+            except HashingError as e:
+                raise VerificationError(*e.args) from None
+
+            if not _compare_digest(computed, prepared.digest):
+                raise VerifyMismatchError(
+                    error_to_str(lib.ARGON2_VERIFY_MISMATCH)
+                )
+
+        return True
+
+    def verify_many(
+        self,
+        pairs: Iterable[tuple[str | bytes, str | bytes]],
+        *,
+        max_workers: int | None = None,
+    ) -> list[bool]:
+        """
+        Verify many passwords against their hashes at once.
+
+        The verifications run concurrently in at most *max_workers* threads.
+        Like :meth:`verify`, they use the instance's *allocator*,
+        *thread_limiter*, and *threads*.  Instead of raising exceptions, the
+        result of each verification is reported in the returned list.
+
+        Args:
+            pairs:
+                ``(hash, password)`` tuples like the arguments of
+                :meth:`verify`.
+
+            max_workers:
+                Maximum number of threads to use.  If None, the number of CPUs
+                is used.
+
+        Returns:
+            For each pair, in the order of *pairs*: ``True`` if the password
+            matches the hash.  ``False`` if it doesn't, if the hash is invalid,
+            or if it exceeds the instance's *limits*.
+
+        .. versionadded:: 26.1.0
+        """
+        return self._verify_pairs(
+            (
+                (hash, _ensure_bytes(password, self.encoding))
+                for hash, password in pairs
+            ),
+            max_workers,
+        )
+
+    def verify_any(
+        self,
+        hashes: Iterable[str | bytes],
+        password: str | bytes,
+        *,
+        max_workers: int | None = None,
+    ) -> int | None:
+        """
+        Check whether *password* matches any of *hashes*.
+
+        Useful for password histories or accounts with several credentials.
+        The verifications run concurrently in at most *max_workers* threads,
+        so -- given enough cores -- it takes about as long as a single
+        :meth:`verify`.  Like :meth:`verify`, they use the instance's
+        *allocator*, *thread_limiter*, and *threads*.  *password* is encoded
+        only once.
+
+        Args:
+            hashes: Encoded hashes as returned from :meth:`hash`.
+
+            password: The password to verify.
+
+            max_workers:
+                Maximum number of threads to use.  If None, the number of CPUs
+                is used.
+
+        Returns:
+            The index of the first hash in *hashes* that *password* matches,
+            or None if it matches none of them.  Invalid hashes and hashes
+            that exceed the instance's *limits* never match.
+
+        .. versionadded:: 26.1.0
+        """
+        for i, ok in enumerate(
+            self._verify_all(hashes, password, max_workers)
+        ):
+            if ok:
+                return i
+
+        return None
+
+    def verify_all(
+        self,
+        hashes: Iterable[str | bytes],
+        password: str | bytes,
+        *,
+        max_workers: int | None = None,
+    ) -> list[int]:
+        """
+        Find all of *hashes* that *password* matches.
+
+        Like :meth:`verify_any`, but doesn't stop at the first match.
+
+        Returns:
+            The indexes of all hashes in *hashes* that *password* matches, in
+            ascending order.
+
+        .. versionadded:: 26.1.0
+        """
+        return [
+            i
+            for i, ok in enumerate(
+                self._verify_all(hashes, password, max_workers)
+            )
+            if ok
+        ]
+
+    def _verify_all(
+        self,
+        hashes: Iterable[str | bytes],
+        password: str | bytes,
+        max_workers: int | None,
+    ) -> list[bool]:
+        password = _ensure_bytes(password, self.encoding)
+
+        return self._verify_pairs(
+            ((hash, password) for hash in hashes), max_workers
+        )
+
+    def _verify_pairs(
+        self,
+        pairs: Iterable[tuple[str | bytes, bytes]],
+        max_workers: int | None,
+    ) -> list[bool]:
+        """
+        Verify the already encoded passwords in *pairs* concurrently and
+        report invalid hashes as mismatches.
+        """
+        items = []
+        positions = []
+        rv = []
+        for i, (hash, password) in enumerate(pairs):
+            rv.append(False)
+
+            try:
+                hash = _ensure_bytes(hash, "ascii")
+            except UnicodeEncodeError:
+                continue
+
+            hash_type = self._header_to_type.get(hash[:9])
+            if hash_type is None:
+                continue
+
+            if self.limits is not None:
+                try:
+                    self.limits._check(hash)
+                except InvalidHashError:
+                    continue
+
+            items.append((hash, password, hash_type))
+            positions.append(i)
+
+        for i, err in zip(
+            positions,
+            verify_secret_many(
+                items,
+                max_workers,
+                allocator=self.allocator,
+                thread_limiter=self.thread_limiter,
+                threads=self.threads,
+            ),
+            strict=True,
+        ):
+            rv[i] = err == lib.ARGON2_OK
+
+        return rv
+
+    def verify_ex(
+        self,
+        hash: str | bytes,
+        password: str | bytes,
+        *,
+        rehash: bool = False,
+    ) -> VerificationResult:
+        """
+        Verify that *password* matches *hash* and check whether *hash* needs
+        rehashing -- all at once.
+
+        Unlike :meth:`verify`, a wrong password doesn't raise an exception but
+        is reported using :attr:`VerificationResult.ok`.  *hash* is parsed
+        only once for both checks.
+
+        Args:
+            hash: An encoded hash as returned from :meth:`PasswordHasher.hash`.
+
+            password: The password to verify.
+
+            rehash:
+                If True and the password is correct but *hash* needs
+                rehashing, *password* is hashed again using the instance's
+                parameters and returned as :attr:`VerificationResult.new_hash`.
+
+        Raises:
+            argon2.exceptions.VerificationError:
+                If verification fails for other reasons than a wrong password.
+
+            argon2.exceptions.InvalidHashError:
+                If *hash* is so clearly invalid, that it couldn't be passed to
+                Argon2.
+
+            argon2.exceptions.HashLimitExceededError:
+                If *hash* exceeds the instance's *limits*.
+
+        Returns:
+            The outcome of the verification.
+
+        .. versionadded:: 26.1.0
+        """
+        hash_str = _hash_to_str(hash)
+        if isinstance(hash, str):
+            try:
+                hash = hash.encode("ascii")
+            except UnicodeEncodeError:
+                raise InvalidHashError from None
+
+        if self.limits is not None:
+            self.limits._check(hash_str)
+
+        params = extract_parameters(hash_str)
+        password = _ensure_bytes(password, self.encoding)
+
+        with (
+            _NOT_METERED
+            if self.meter is None
+            else self.meter._measure("verify", params, self.threads)
+        ):
+            rv = _verify_secret_code(
+                hash,
+                password,
+                params.type,
+                self.allocator,
+                self.thread_limiter,
+                self.threads,
+            )
+        if rv not in (lib.ARGON2_OK, lib.ARGON2_VERIFY_MISMATCH):
+            raise VerificationError(error_to_str(rv))
+
+        ok = rv == lib.ARGON2_OK
+        needs_rehash = self._parameters != params
+
+        return VerificationResult(
+            ok=ok,
+            needs_rehash=needs_rehash,
+            parameters=params,
+            new_hash=(
+                self.hash(password) if rehash and ok and needs_rehash else None
+            ),
         )
 
     def check_needs_rehash(self, hash: str | bytes) -> bool:
@@ -284,4 +803,30 @@ class PasswordHasher:
         if isinstance(hash, bytes):
             hash = hash.decode("ascii")
 
-        return self._parameters != extract_parameters(hash)
+        return self._parameters != _extract_parameters(hash)
+
+
+@functools.lru_cache(maxsize=_SHARED_CACHE_SIZE)
+def _shared_password_hasher(
+    cls: type[PasswordHasher],
+    type: Type,
+    salt_len: int,
+    hash_len: int,
+    time_cost: int,
+    memory_cost: int,
+    parallelism: int,
+) -> PasswordHasher:
+    """
+    Create the instances of `PasswordHasher.for_parameters`.
+
+    Parameters are mutable and therefore not hashable, so the registry is
+    keyed on the values that `PasswordHasher` uses instead.
+    """
+    return cls(
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+        hash_len=hash_len,
+        salt_len=salt_len,
+        type=type,
+    )
@@ -0,0 +1,71 @@
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import dataclasses
+
+from ._utils import Parameters, _extract_parameters, _hash_to_str
+from .exceptions import InvalidHashError
+from .low_level import _decode_hash
+
+
+class PreparedHash:
+    """
+    An encoded hash that has been parsed once, so it can be verified many
+    times without parsing it again.
+
+    Useful for credentials like API keys that are verified on every request:
+    keep the prepared hashes in a cache and pass them to
+    :meth:`PasswordHasher.verify_prepared`.  Each instance holds only the
+    decoded salt and digest -- the parameters are shared with all other hashes
+    with the same header -- so millions of them fit into memory.
+
+    Args:
+        hash: An encoded hash as returned from :meth:`PasswordHasher.hash`.
+
+    Raises:
+        argon2.exceptions.InvalidHashError: If *hash* is invalid.
+
+    Attributes:
+        salt: The decoded salt.
+
+        digest: The decoded raw hash.
+
+    .. versionadded:: 26.1.0
+    """
+
+    __slots__ = ("_parameters", "digest", "salt")
+
+    salt: bytes
+    digest: bytes
+
+    def __init__(self, hash: str | bytes):
+        hash_str = _hash_to_str(hash)
+        if isinstance(hash, str):
+            try:
+                hash = hash.encode("ascii")
+            except UnicodeEncodeError:
+                raise InvalidHashError from None
+
+        # Shared between all hashes with the same header; must not be mutated.
+        params = _extract_parameters(hash_str)
+
+        decoded = _decode_hash(hash, params.type)
+        if decoded is None:
+            raise InvalidHashError
+
+        version, *_, self.salt, self.digest = decoded
+        if version != params.version:
+            # Hashes without a version are reported as v1.2 by
+            # extract_parameters, but were created using version 0x10.
+            params = dataclasses.replace(params, version=version)
+
+        self._parameters = params
+
+    @property
+    def parameters(self) -> Parameters:
+        """
+        The parameters that were used to create the hash.
+        """
+        # Parameters are mutable, so callers get their own copy.
+        return dataclasses.replace(self._parameters)
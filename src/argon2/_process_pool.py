@@ -0,0 +1,219 @@
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Literal
+
+from ._password_hasher import PasswordHasher
+from ._salt_pool import SaltPool
+from ._utils import Parameters, VerificationLimits
+
+
+if TYPE_CHECKING:
+    from multiprocessing.context import BaseContext
+
+
+# Each worker process holds exactly one PasswordHasher that is created once by
+# the pool's initializer and then reused for every job.
+_worker_password_hasher: PasswordHasher | None = None
+
+
+def _init_worker(
+    params: Parameters,
+    encoding: str,
+    threads: int | None,
+    limits: VerificationLimits | None,
+    salt_pool_block_size: int | None,
+) -> None:
+    global _worker_password_hasher  # noqa: PLW0603
+
+    ph = PasswordHasher.from_parameters(
+        params,
+        threads=threads,
+        limits=limits,
+        salt_pool=(
+            None
+            if salt_pool_block_size is None
+            else SaltPool(salt_pool_block_size)
+        ),
+    )
+    ph.encoding = encoding
+
+    _worker_password_hasher = ph
+
+
+def _get_worker_password_hasher() -> PasswordHasher:
+    if _worker_password_hasher is None:
+        msg = "Not running in an initialized worker process."
+        raise RuntimeError(msg)
+
+    return _worker_password_hasher
+
+
+def _hash(password: str | bytes, salt: bytes | None) -> str:
+    return _get_worker_password_hasher().hash(password, salt=salt)
+
+
+def _verify(hash: str | bytes, password: str | bytes) -> Literal[True]:
+    return _get_worker_password_hasher().verify(hash, password)
+
+
+class ProcessPoolPasswordHasher:
+    """
+    A :class:`PasswordHasher` that does its work in a pool of worker processes.
+
+    Each worker holds its own :class:`PasswordHasher` with the same parameters
+    as *password_hasher* and is reused across calls.  This allows to saturate
+    all cores without the worker threads competing within one process.
+
+    Exceptions like :exc:`~argon2.exceptions.VerifyMismatchError` or
+    :exc:`~argon2.exceptions.InvalidHashError` are raised exactly like
+    :class:`PasswordHasher` would.
+
+    Args:
+        password_hasher:
+            The :class:`PasswordHasher` whose parameters, encoding, *threads*,
+            and *limits* are used by the workers.  If it has a *salt_pool*,
+            each worker gets its own with the same *block_size*.  If None,
+            the default parameters are used.
+
+        max_workers:
+            Number of worker processes.  If None, the number of CPUs is used.
+
+        mp_context:
+            A :mod:`multiprocessing` context that is used to start the
+            workers.  If None, the default context is used.
+
+    .. versionadded:: 26.1.0
+    """
+
+    __slots__ = ["_executor", "_password_hasher"]
+
+    _executor: ProcessPoolExecutor
+    _password_hasher: PasswordHasher
+
+    def __init__(
+        self,
+        password_hasher: PasswordHasher | None = None,
+        *,
+        max_workers: int | None = None,
+        mp_context: BaseContext | None = None,
+    ):
+        if password_hasher is None:
+            password_hasher = PasswordHasher()
+
+        self._password_hasher = password_hasher
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(
+                password_hasher._parameters,
+                password_hasher.encoding,
+                password_hasher.threads,
+                password_hasher.limits,
+                (
+                    None
+                    if password_hasher.salt_pool is None
+                    else password_hasher.salt_pool.block_size
+                ),
+            ),
+        )
+
+    @classmethod
+    def from_parameters(
+        cls,
+        params: Parameters,
+        *,
+        max_workers: int | None = None,
+        mp_context: BaseContext | None = None,
+    ) -> ProcessPoolPasswordHasher:
+        """
+        Construct a `ProcessPoolPasswordHasher` from *params*.
+
+        Returns:
+            A `ProcessPoolPasswordHasher` instance with the parameters from
+            *params*.
+        """
+        return cls(
+            PasswordHasher.from_parameters(params),
+            max_workers=max_workers,
+            mp_context=mp_context,
+        )
+
+    @property
+    def password_hasher(self) -> PasswordHasher:
+        """
+        The :class:`PasswordHasher` in the parent process.
+        """
+        return self._password_hasher
+
+    def submit_hash(
+        self, password: str | bytes, *, salt: bytes | None = None
+    ) -> Future[str]:
+        """
+        Schedule hashing *password* in a worker process.
+
+        Returns:
+            A :class:`concurrent.futures.Future` of the result of
+            :meth:`PasswordHasher.hash`.
+        """
+        return self._executor.submit(_hash, password, salt)
+
+    def submit_verify(
+        self, hash: str | bytes, password: str | bytes
+    ) -> Future[Literal[True]]:
+        """
+        Schedule verifying *password* against *hash* in a worker process.
+
+        Returns:
+            A :class:`concurrent.futures.Future` of the result of
+            :meth:`PasswordHasher.verify`.
+        """
+        return self._executor.submit(_verify, hash, password)
+
+    def hash(self, password: str | bytes, *, salt: bytes | None = None) -> str:
+        """
+        Hash *password* in a worker process and wait for the result.
+
+        See :meth:`PasswordHasher.hash`.
+        """
+        return self.submit_hash(password, salt=salt).result()
+
+    def verify(
+        self, hash: str | bytes, password: str | bytes
+    ) -> Literal[True]:
+        """
+        Verify *password* against *hash* in a worker process and wait for the
+        result.
+
+        See :meth:`PasswordHasher.verify`.
+        """
+        return self.submit_verify(hash, password).result()
+
+    def check_needs_rehash(self, hash: str | bytes) -> bool:
+        """
+        Check whether *hash* was created using the instance's parameters.
+
+        This is cheap and therefore done in the calling process.  See
+        :meth:`PasswordHasher.check_needs_rehash`.
+        """
+        return self._password_hasher.check_needs_rehash(hash)
+
+    def close(self, *, wait: bool = True) -> None:
+        """
+        Shut down the worker processes.
+
+        Jobs that haven't started yet are cancelled.
+
+        Args:
+            wait: Whether to wait for the running jobs to finish.
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self) -> ProcessPoolPasswordHasher:  # noqa: PYI034
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import os
+
+from collections import deque
+
+from ._fork import _register_after_fork
+
+
+class SaltPool:
+    """
+    Hand out random salts from large blocks of randomness.
+
+    Normally, :meth:`PasswordHasher.hash` asks the operating system for each
+    salt separately -- one system call for 16 bytes.  A pool asks for
+    *block_size* bytes at once, splits them into salts, and hands each of them
+    out exactly once.  It keeps no reference to salts it has handed out.
+
+    Pass it as *salt_pool* to :class:`PasswordHasher`.  It's safe to share a
+    pool between threads without any locking.  After a fork, the child
+    discards the salts it inherited, so parent and child never hand out the
+    same salt.
+
+    Args:
+        block_size: Number of random bytes to draw at once.
+
+    .. versionadded:: 26.1.0
+    """
+
+    __slots__ = ("__weakref__", "_salts", "block_size")
+
+    block_size: int
+
+    def __init__(self, block_size: int = 4096):
+        self.block_size = block_size
+
+        # Salt length -> salts that haven't been handed out yet.  Popping from
+        # a deque is atomic, so no salt is ever handed out twice.
+        self._salts: dict[int, deque[bytes]] = {}
+
+        _register_after_fork(self)
+
+    def _after_fork(self) -> None:
+        self._salts = {}
+
+    def take(self, n: int) -> bytes:
+        """
+        Return *n* random bytes that haven't been handed out before.
+        """
+        salts = self._salts.get(n)
+        if salts is None:
+            salts = self._salts.setdefault(n, deque())
+
+        try:
+            return salts.popleft()
+        except IndexError:
+            return self._refill(salts, n)
+
+    def _refill(self, salts: deque[bytes], n: int) -> bytes:
+        """
+        Draw a new block of salts of *n* bytes into *salts* and return one of
+        them.
+
+        The caller gets a salt straight from the new block, so concurrent
+        callers can't take them all before it gets its own.  Concurrent
+        refills only add more salts.
+        """
+        if n == 0:
+            return b""
+
+        count = max(self.block_size // n, 1)
+        data = os.urandom(count * n)
+        salts.extend([data[i : i + n] for i in range(n, len(data), n)])
+
+        return data[:n]
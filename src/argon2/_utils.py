@@ -2,15 +2,26 @@
 
 from __future__ import annotations
 
+import functools
 import platform
+import re
 import sys
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-from .exceptions import InvalidHashError, UnsupportedParametersError
+from .exceptions import (
+    HashLimitExceededError,
+    InvalidHashError,
+    UnsupportedParametersError,
+)
 from .low_level import Type
 
 
+if TYPE_CHECKING:
+    from functools import _CacheInfo
+
+
 NoneType = type(None)
 
 
@@ -44,6 +55,19 @@ def _is_wasm() -> bool:
     ]
 
 
+def _hash_to_str(hash: str | bytes) -> str:
+    """
+    Return *hash* as a str, decoding it as Latin-1 if it's bytes.
+
+    Latin-1 maps each byte to one character, so decoding never fails and
+    keeps the length intact.  Non-ASCII hashes don't parse anyway.
+    """
+    if isinstance(hash, bytes):
+        return hash.decode("latin-1")
+
+    return hash
+
+
 def _decoded_str_len(length: int) -> int:
     """
     Compute how long an encoded string of length *l* becomes.
@@ -106,27 +130,23 @@ class Parameters:
 
 _NAME_TO_TYPE = {"argon2id": Type.ID, "argon2i": Type.I, "argon2d": Type.D}
 _REQUIRED_KEYS = sorted(("v", "m", "t", "p"))
+# The canonical header as written by Argon2 itself.  Everything else takes the
+# slow path in _parse_header_slow.
+_HEADER_RE = re.compile(
+    r"\$(argon2id|argon2i|argon2d)(?:\$v=(\d+))?\$m=(\d+),t=(\d+),p=(\d+)",
+    re.ASCII,
+)
+_HEADER_CACHE_SIZE = 128
 
 
-def extract_parameters(hash: str) -> Parameters:
-    """
-    Extract parameters from an encoded *hash*.
-
-    Args:
-        hash: An encoded Argon2 hash string.
-
-    Returns:
-        The parameters used to create the hash.
-
-    .. versionadded:: 18.2.0
-    """
-    parts = hash.split("$")
+def _parse_header_slow(header: str) -> tuple[Type, dict[str, int]]:
+    parts = header.split("$")
 
     # Backwards compatibility for Argon v1.2 hashes
-    if len(parts) == 5:
+    if len(parts) == 3:
         parts.insert(2, "v=18")
 
-    if len(parts) != 6:
+    if len(parts) != 4:
         raise InvalidHashError
 
     if parts[0]:
@@ -147,10 +167,36 @@ def extract_parameters(hash: str) -> Parameters:
     if sorted(kvs.keys()) != _REQUIRED_KEYS:
         raise InvalidHashError
 
+    return type, kvs
+
+
+@functools.lru_cache(maxsize=_HEADER_CACHE_SIZE)
+def _parse_header(
+    header: str, salt_b64_len: int, hash_b64_len: int
+) -> Parameters:
+    """
+    Parse *header* -- everything in front of the salt -- into `Parameters`.
+
+    Since most applications only ever see a handful of different headers, the
+    results are cached and shared.  Therefore, they must not be mutated.
+    """
+    m = _HEADER_RE.fullmatch(header)
+    if m is not None:
+        name, v, m_cost, t_cost, p = m.groups()
+        type = _NAME_TO_TYPE[name]
+        kvs = {
+            "v": 18 if v is None else int(v),
+            "m": int(m_cost),
+            "t": int(t_cost),
+            "p": int(p),
+        }
+    else:
+        type, kvs = _parse_header_slow(header)
+
     return Parameters(
         type=type,
-        salt_len=_decoded_str_len(len(parts[4])),
-        hash_len=_decoded_str_len(len(parts[5])),
+        salt_len=_decoded_str_len(salt_b64_len),
+        hash_len=_decoded_str_len(hash_b64_len),
         version=kvs["v"],
         time_cost=kvs["t"],
         memory_cost=kvs["m"],
@@ -158,6 +204,166 @@ def extract_parameters(hash: str) -> Parameters:
     )
 
 
+def _extract_parameters(hash: str) -> Parameters:
+    """
+    Like `extract_parameters` but returns a cached instance that is shared
+    between all callers and must not be mutated.
+    """
+    hash_start = hash.rfind("$")
+    if hash_start < 0:
+        raise InvalidHashError
+
+    salt_start = hash.rfind("$", 0, hash_start)
+    if salt_start < 0:
+        raise InvalidHashError
+
+    return _parse_header(
+        hash[:salt_start],
+        hash_start - salt_start - 1,
+        len(hash) - hash_start - 1,
+    )
+
+
+def extract_parameters(hash: str) -> Parameters:
+    """
+    Extract parameters from an encoded *hash*.
+
+    Parsed headers are kept in a bounded cache, see
+    :func:`extract_parameters_cache_info`.
+
+    Args:
+        hash: An encoded Argon2 hash string.
+
+    Returns:
+        The parameters used to create the hash.
+
+    .. versionadded:: 18.2.0
+    """
+    params = _extract_parameters(hash)
+
+    # Parameters are mutable, so callers get their own copy.
+    return Parameters(
+        type=params.type,
+        version=params.version,
+        salt_len=params.salt_len,
+        hash_len=params.hash_len,
+        time_cost=params.time_cost,
+        memory_cost=params.memory_cost,
+        parallelism=params.parallelism,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class VerificationLimits:
+    """
+    Ceilings for the parameters of hashes that are verified.
+
+    A corrupted or malicious hash with a huge memory or time cost can tie up a
+    worker for minutes and allocate gigabytes of memory.  A
+    :class:`PasswordHasher` with limits checks each hash's header -- which is
+    cheap -- and rejects it with
+    :exc:`~argon2.exceptions.HashLimitExceededError` before passing it to
+    Argon2.
+
+    A limit of None means no limit.
+
+    Attributes:
+        max_time_cost: Maximum time cost in iterations.
+
+        max_memory_cost: Maximum memory cost in kibibytes.
+
+        max_parallelism: Maximum number of lanes.
+
+        max_length: Maximum length of the encoded hash in characters.
+
+    .. versionadded:: 26.1.0
+    """
+
+    max_time_cost: int | None = None
+    max_memory_cost: int | None = None
+    max_parallelism: int | None = None
+    max_length: int | None = None
+
+    @classmethod
+    def from_parameters(
+        cls, params: Parameters, *, headroom: int = 1
+    ) -> VerificationLimits:
+        """
+        Create limits that admit hashes with up to *headroom* times the costs
+        of *params*.
+
+        Returns:
+            Limits based on *params*.
+        """
+        return cls(
+            max_time_cost=params.time_cost * headroom,
+            max_memory_cost=params.memory_cost * headroom,
+            max_parallelism=params.parallelism * headroom,
+        )
+
+    def _check(self, hash: str | bytes) -> Parameters:
+        """
+        Parse *hash* and raise HashLimitExceededError if it exceeds any
+        limit.
+        """
+        hash = _hash_to_str(hash)
+
+        # Check the length first, so overlong hashes are never parsed.
+        if self.max_length is not None and len(hash) > self.max_length:
+            msg = (
+                f"Hash is {len(hash)} characters long, but the limit is "
+                f"{self.max_length}."
+            )
+            raise HashLimitExceededError(msg)
+
+        params = _extract_parameters(hash)
+        self._check_parameters(params)
+
+        return params
+
+    def _check_parameters(self, params: Parameters) -> None:
+        """
+        Raise HashLimitExceededError if *params* exceed any cost limit.
+        """
+        for name, value, limit in (
+            ("time_cost", params.time_cost, self.max_time_cost),
+            ("memory_cost", params.memory_cost, self.max_memory_cost),
+            ("parallelism", params.parallelism, self.max_parallelism),
+        ):
+            if limit is not None and value > limit:
+                msg = (
+                    f"Hash has a {name} of {value}, but the limit is {limit}."
+                )
+                raise HashLimitExceededError(msg)
+
+
+def extract_parameters_cache_info() -> _CacheInfo:
+    """
+    Return statistics about the cache of parsed hash headers.
+
+    The cache is used by :func:`extract_parameters` and
+    :meth:`PasswordHasher.check_needs_rehash`.  It's keyed on the type,
+    version, and parameters of a hash, and the lengths of its salt and hash.
+
+    Returns:
+        A :func:`~collections.namedtuple` with the fields ``hits``,
+        ``misses``, ``maxsize``, and ``currsize`` -- just like
+        :func:`functools.lru_cache`'s ``cache_info()``.
+
+    .. versionadded:: 26.1.0
+    """
+    return _parse_header.cache_info()
+
+
+def extract_parameters_cache_clear() -> None:
+    """
+    Empty the cache of parsed hash headers and reset its statistics.
+
+    .. versionadded:: 26.1.0
+    """
+    _parse_header.cache_clear()
+
+
 def validate_params_for_platform(params: Parameters) -> None:
     """
     Validate *params* against current platform.
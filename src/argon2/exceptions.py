@@ -37,6 +37,15 @@ class HashingError(Argon2Error):
     """
 
 
+class MemoryBudgetExceededError(Argon2Error):
+    """
+    Raised if a job doesn't fit into the memory budget of a
+    :class:`argon2.BudgetedPasswordHasher` in time.
+
+    .. versionadded:: 26.1.0
+    """
+
+
 class InvalidHashError(ValueError):
     """
     Raised if the hash is invalid before passing it to Argon2.
@@ -46,6 +55,20 @@ class InvalidHashError(ValueError):
     """
 
 
+class HashLimitExceededError(InvalidHashError):
+    """
+    Raised if the parameters of a hash exceed the
+    :class:`argon2.VerificationLimits` of a :class:`argon2.PasswordHasher`.
+
+    The hash is rejected before passing it to Argon2, so no memory is
+    allocated and no time is spent on it.
+
+    Subclass of :exc:`argon2.exceptions.InvalidHashError`.
+
+    .. versionadded:: 26.1.0
+    """
+
+
 class UnsupportedParametersError(ValueError):
     """
     Raised if the current platform does not support the parameters.
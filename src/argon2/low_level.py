@@ -11,21 +11,41 @@ Low-level functions if you want to build your own higher level abstractions.
 
 from __future__ import annotations
 
+import base64
+import binascii
+import contextlib
+import functools
+import mmap
+import os
+import re
+import sys
+import threading
+
+from collections.abc import Iterable, Sequence
 from enum import Enum
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 from _argon2_cffi_bindings import ffi, lib
 
+from ._fork import _register_after_fork
 from .exceptions import HashingError, VerificationError, VerifyMismatchError
 
 
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
 __all__ = [
     "ARGON2_VERSION",
+    "MemoryArena",
+    "ThreadLimiter",
     "Type",
     "ffi",
     "hash_secret",
+    "hash_secret_into",
     "hash_secret_raw",
+    "hash_secret_raw_into",
     "verify_secret",
+    "verify_secret_many",
 ]
 
 ARGON2_VERSION = lib.ARGON2_VERSION_NUMBER
@@ -49,15 +69,792 @@ class Type(Enum):
     ID = lib.Argon2_id
 
 
-def hash_secret(
-    secret: bytes,
+_TYPE_TO_NAME = {Type.D: b"argon2d", Type.I: b"argon2i", Type.ID: b"argon2id"}
+
+# Mirrors the strictness of Argon2's own decoder: no leading zeros, no
+# padding.
+_ENCODED_HASH_RE = re.compile(
+    rb"\$(argon2(?:id|i|d))"
+    rb"(?:\$v=(0|[1-9][0-9]*))?"
+    rb"\$m=(0|[1-9][0-9]*),t=(0|[1-9][0-9]*),p=(0|[1-9][0-9]*)"
+    rb"\$([A-Za-z0-9+/]*)\$([A-Za-z0-9+/]*)"
+)
+_UINT32_MAX = 2**32 - 1
+
+_new_uninitialized = ffi.new_allocator(should_clear_after_alloc=False)
+
+# Architectures whose Linux MAP_HUGETLB is the generic 0x40000.  On others,
+# like MIPS and PA-RISC, it's 0x80000 and 0x40000 means something else.
+_GENERIC_HUGETLB_MACHINES = re.compile(
+    r"x86_64|amd64|i[3-6]86|aarch64|arm\w*|ppc\w*|s390x?|riscv64"
+)
+
+
+def _fallback_map_hugetlb(platform: str, machine: str) -> int:
+    """
+    Return Linux's MAP_HUGETLB for *machine* if it's known, otherwise 0 --
+    which means that only transparent huge pages are used.
+    """
+    if platform.startswith("linux") and _GENERIC_HUGETLB_MACHINES.fullmatch(
+        machine
+    ):
+        return 0x40000
+
+    return 0
+
+
+# Python only exposes these constants in recent versions; the fallbacks are
+# Linux's values.
+_LINUX = sys.platform.startswith("linux")
+_MAP_HUGETLB = getattr(
+    mmap,
+    "MAP_HUGETLB",
+    _fallback_map_hugetlb(
+        sys.platform, os.uname().machine if hasattr(os, "uname") else ""
+    ),
+)
+_MADV_POPULATE_WRITE = getattr(
+    mmap, "MADV_POPULATE_WRITE", 23 if _LINUX else None
+)
+
+
+@functools.cache
+def _huge_page_size() -> int:
+    """
+    Return the size of the default huge pages in bytes.
+    """
+    try:
+        with open("/proc/meminfo") as f:  # noqa: PTH123
+            for line in f:
+                if line.startswith("Hugepagesize:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+
+    return 2 * 1024 * 1024
+
+
+def _map_anonymous(size: int, *, huge_pages: bool, prefault: bool) -> Any:
+    """
+    Map *size* bytes of anonymous memory and return it as C data.
+
+    With *huge_pages*, try explicit huge pages first, and transparent huge
+    pages if there are none reserved.  With *prefault*, ask the kernel to
+    fault in all pages at once.  Both are best-effort.
+
+    Returns:
+        None if anonymous mappings aren't supported on this platform.
+    """
+    if not hasattr(mmap, "MAP_ANONYMOUS"):  # pragma: no cover -- Windows
+        return None
+
+    flags = mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS
+    populate = getattr(mmap, "MAP_POPULATE", 0) if prefault else 0
+
+    mm = None
+    if huge_pages and _MAP_HUGETLB:
+        page = _huge_page_size()
+        # Fails if there are no huge pages reserved.
+        with contextlib.suppress(OSError):
+            mm = mmap.mmap(
+                -1,
+                -(-size // page) * page,
+                flags=flags | _MAP_HUGETLB | populate,
+            )
+
+    if mm is None and huge_pages and hasattr(mmap, "MADV_HUGEPAGE"):
+        mm = mmap.mmap(-1, size, flags=flags)
+        # Advise before faulting in, otherwise the pages are small.
+        try:
+            mm.madvise(mmap.MADV_HUGEPAGE)
+            if prefault and _MADV_POPULATE_WRITE is not None:
+                mm.madvise(_MADV_POPULATE_WRITE)
+        except OSError:
+            pass  # No THP support or too old a kernel.
+
+    if mm is None:
+        mm = mmap.mmap(-1, size, flags=flags | populate)
+
+    # The C data keeps the mapping alive until it's garbage collected.
+    return ffi.from_buffer("uint8_t[]", mm)
+
+
+def _touch_pages(buf: Any) -> None:
+    """
+    Fault in all pages of *buf* by writing a zero to each of them.
+    """
+    view = memoryview(ffi.buffer(buf))
+    view[:: mmap.PAGESIZE] = bytes(-(-len(view) // mmap.PAGESIZE))
+
+
+class MemoryArena:
+    """
+    Keep the memory that Argon2 needs for hashing around between calls.
+
+    Normally, Argon2 allocates *memory_cost* kibibytes on each call and frees
+    them afterwards.  With big memory costs, that means a lot of work for the
+    operating system that has to map -- and fault in -- fresh pages every
+    single time.
+
+    An arena keeps up to *max_buffers* buffers alive after use and hands them
+    out again to subsequent calls that fit into them.  If there are more idle
+    buffers than that, the smallest ones are dropped, so the buffers adapt to
+    the largest parameters that are in use.
+
+    Argon2 wipes the memory before giving it back to the arena, so no secrets
+    are kept around.
+
+    For high memory costs, the pages themselves become a cost: gibibytes of
+    4 KiB pages mean hundreds of thousands of page faults and a lot of TLB
+    pressure.  Therefore, the arena can map its buffers using huge pages and
+    have the kernel fault them in all at once.
+
+    Pass it as *allocator* to :func:`hash_secret`, :func:`hash_secret_raw`,
+    :func:`verify_secret`, or :class:`argon2.PasswordHasher`.  It's safe to
+    share an arena between threads.
+
+    Args:
+        max_buffers:
+            Maximum number of idle buffers to keep.  Set it to the number of
+            hashes you compute concurrently.
+
+        huge_pages:
+            Map buffers using explicit huge pages (``MAP_HUGETLB``) if any are
+            reserved, transparent huge pages (``MADV_HUGEPAGE``) otherwise.
+            If neither is available, regular pages are used.
+
+        prefault:
+            Fault in all pages of a new buffer at once when mapping it
+            (``MAP_POPULATE`` / ``MADV_POPULATE_WRITE``) instead of one by one
+            while hashing.  Ignored if unavailable.
+
+    .. versionadded:: 26.1.0
+    """
+
+    __slots__ = (
+        "__weakref__",
+        "_allocate_cbk",
+        "_busy",
+        "_fill_after_fork",
+        "_free_cbk",
+        "_idle",
+        "_lock",
+        "huge_pages",
+        "max_buffers",
+        "prefault",
+    )
+
+    def __init__(
+        self,
+        max_buffers: int = 1,
+        *,
+        huge_pages: bool = False,
+        prefault: bool = False,
+    ):
+        self.max_buffers = max_buffers
+        self.huge_pages = huge_pages
+        self.prefault = prefault
+
+        self._lock = threading.Lock()
+        self._idle: list[Any] = []  # sorted by size
+        self._busy: dict[int, Any] = {}
+        # Size of the buffers to fill a forked child with; set by warmup.
+        self._fill_after_fork = 0
+
+        self._allocate_cbk = ffi.callback(
+            "int(uint8_t **, size_t)", self._allocate
+        )
+        self._free_cbk = ffi.callback("void(uint8_t *, size_t)", self._free)
+
+        _register_after_fork(self)
+
+    @property
+    def idle_bytes(self) -> int:
+        """
+        Number of bytes that are currently kept by the arena without being
+        used.
+        """
+        with self._lock:
+            return sum(len(buf) for buf in self._idle)
+
+    def clear(self) -> None:
+        """
+        Drop all idle buffers.
+        """
+        with self._lock:
+            self._idle.clear()
+
+    def _fill(self, size: int, *, touch: bool = False) -> None:
+        """
+        Add idle buffers of *size* bytes until there are *max_buffers* idle
+        buffers that fit *size*.  With *touch*, all of their pages are faulted
+        in right away.
+        """
+        with self._lock:
+            missing = self.max_buffers - sum(
+                len(buf) >= size for buf in self._idle
+            )
+
+        new = [self._new_buffer(size) for _ in range(missing)]
+        if touch:
+            for buf in new:
+                _touch_pages(buf)
+
+        with self._lock:
+            self._idle.extend(new)
+            self._idle.sort(key=len)
+            del self._idle[: max(len(self._idle) - self.max_buffers, 0)]
+
+    def _after_fork(self) -> None:
+        # The buffers that other threads were hashing in when the parent
+        # forked are never freed in the child and hold intermediate state.
+        self._lock = threading.Lock()
+        self._busy = {}
+
+        # Only the direct children of the process that was warmed up fill
+        # the arena -- not the processes they fork in turn.
+        size, self._fill_after_fork = self._fill_after_fork, 0
+        if size:
+            # Inherited buffers are shared with the parent until they're
+            # written to, so the first hash would copy them page by page.
+            self._idle = []
+            # Best-effort: without buffers, hashing just maps them itself.
+            with contextlib.suppress(MemoryError, OSError):
+                self._fill(size, touch=True)
+
+    def _allocate(self, memory: Any, size: int) -> int:
+        memory[0] = ffi.NULL
+
+        buf = None
+        with self._lock:
+            for i, idle in enumerate(self._idle):
+                if len(idle) >= size:
+                    buf = self._idle.pop(i)
+                    break
+
+        if buf is None:
+            try:
+                buf = self._new_buffer(size)
+            except (MemoryError, OSError):
+                return lib.ARGON2_MEMORY_ALLOCATION_ERROR  # type: ignore[no-any-return]
+
+        ptr = ffi.cast("uint8_t *", buf)
+        with self._lock:
+            self._busy[int(ffi.cast("uintptr_t", ptr))] = buf
+
+        memory[0] = ptr
+
+        return lib.ARGON2_OK  # type: ignore[no-any-return]
+
+    def _new_buffer(self, size: int) -> Any:
+        if self.huge_pages or self.prefault:
+            buf = _map_anonymous(
+                size, huge_pages=self.huge_pages, prefault=self.prefault
+            )
+            if buf is not None:
+                return buf
+
+        return _new_uninitialized("uint8_t[]", size)
+
+    def _free(self, memory: Any, size: int) -> None:  # noqa: ARG002
+        with self._lock:
+            buf = self._busy.pop(int(ffi.cast("uintptr_t", memory)))
+
+            self._idle.append(buf)
+            self._idle.sort(key=len)
+            del self._idle[: max(len(self._idle) - self.max_buffers, 0)]
+
+
+class ThreadLimiter:
+    """
+    Cap the number of threads that Argon2 uses for all calls that share the
+    limiter.
+
+    Normally, each call computes its *parallelism* lanes in as many threads,
+    that Argon2 starts and joins several times per call.  With many concurrent
+    calls, that means lots of thread creations and many more threads than
+    there are cores, fighting each other for CPU time.
+
+    A limiter hands out at most *max_threads* threads to concurrent calls.  A
+    call that wants more threads than are left, gets the rest.  If none are
+    left, it computes all lanes in the calling thread without starting any
+    threads at all.  The lanes -- and therefore the hashes -- stay the same,
+    only the amount of parallel work changes.
+
+    Pass it as *thread_limiter* to :func:`hash_secret`,
+    :func:`hash_secret_raw`, :func:`verify_secret`, or
+    :class:`argon2.PasswordHasher`.  Share one limiter across your whole
+    process to cap its total.
+
+    Args:
+        max_threads:
+            Maximum number of threads that may be used at the same time.  If
+            None, the number of CPUs is used.
+
+    .. versionadded:: 26.1.0
+    """
+
+    __slots__ = ("__weakref__", "_in_use", "_lock", "max_threads")
+
+    def __init__(self, max_threads: int | None = None):
+        self.max_threads = (
+            max_threads if max_threads is not None else os.cpu_count() or 1
+        )
+
+        self._lock = threading.Lock()
+        self._in_use = 0
+
+        _register_after_fork(self)
+
+    def _after_fork(self) -> None:
+        # The calls that used threads in the parent don't exist in the child.
+        self._lock = threading.Lock()
+        self._in_use = 0
+
+    @property
+    def in_use(self) -> int:
+        """
+        Number of threads that are currently used by Argon2.
+        """
+        with self._lock:
+            return self._in_use
+
+    def _acquire(self, wanted: int) -> int:
+        """
+        Take up to *wanted* threads and return how many the call may use.
+
+        One thread means the calling thread, which doesn't count.
+        """
+        if wanted <= 1:
+            return 1
+
+        with self._lock:
+            granted = min(wanted, self.max_threads - self._in_use)
+            if granted <= 1:
+                return 1
+
+            self._in_use += granted
+
+        return granted
+
+    def _release(self, granted: int) -> None:
+        if granted <= 1:
+            return
+
+        with self._lock:
+            self._in_use -= granted
+
+
+def _from_buffer(data: bytes | bytearray | memoryview) -> Any:
+    """
+    Make *data* accessible to C without copying it.
+    """
+    return ffi.from_buffer("uint8_t[]", data)
+
+
+def _encoded_to_c(hash: bytes | bytearray | memoryview) -> Any:
+    """
+    Make *hash* accessible to C as a NUL-terminated string.
+
+    Only bytes are guaranteed to be NUL-terminated, so everything else is
+    copied.
+    """
+    if isinstance(hash, bytes):
+        return hash
+
+    src = ffi.from_buffer("char[]", hash)
+    buf = _new_uninitialized("char[]", len(src) + 1)
+    ffi.memmove(buf, src, len(src))
+    buf[len(src)] = b"\0"
+
+    return buf
+
+
+def _check_threads(threads: int | None) -> None:
+    """
+    Raise ValueError if Argon2 can't compute lanes using *threads* threads.
+    """
+    if threads is not None and threads < 1:
+        msg = f"'threads' must be at least 1 (got {threads})."
+        raise ValueError(msg)
+
+
+def _needs_ctx(
+    parallelism: int,
+    allocator: MemoryArena | None,
+    thread_limiter: ThreadLimiter | None,
+    threads: int | None,
+) -> bool:
+    """
+    Whether a call can't be served by ``argon2_hash`` that always uses its own
+    allocator and one thread per lane.
+    """
+    _check_threads(threads)
+
+    return (
+        allocator is not None
+        or thread_limiter is not None
+        or (threads is not None and threads != parallelism)
+    )
+
+
+def _argon2_ctx(
+    out: Any,
+    csecret: Any,
+    csalt: Any,
+    time_cost: int,
+    memory_cost: int,
+    parallelism: int,
+    type: Type,
+    version: int,
+    allocator: MemoryArena | None,
+    thread_limiter: ThreadLimiter | None,
+    threads: int | None,
+) -> int:
+    """
+    Compute a raw hash into *out* using ``argon2_ctx`` with the callbacks of
+    *allocator* and *threads* threads -- or as many of them as
+    *thread_limiter* allows.
+
+    Returns:
+        An Argon2 error code.
+    """
+    # More threads than lanes are never used.
+    wanted = parallelism if threads is None else min(threads, parallelism)
+    threads = (
+        wanted
+        if thread_limiter is None or wanted <= 1
+        else thread_limiter._acquire(wanted)
+    )
+    try:
+        return _argon2_ctx_threads(
+            out,
+            csecret,
+            csalt,
+            time_cost,
+            memory_cost,
+            parallelism,
+            threads,
+            type,
+            version,
+            allocator,
+        )
+    finally:
+        if thread_limiter is not None and threads > 1:
+            thread_limiter._release(threads)
+
+
+def _argon2_ctx_threads(
+    out: Any,
+    csecret: Any,
+    csalt: Any,
+    time_cost: int,
+    memory_cost: int,
+    parallelism: int,
+    threads: int,
+    type: Type,
+    version: int,
+    allocator: MemoryArena | None,
+) -> int:
+    ctx = ffi.new(
+        "argon2_context *",
+        {
+            "out": out,
+            "outlen": len(out),
+            "pwd": csecret,
+            "pwdlen": len(csecret),
+            "salt": csalt,
+            "saltlen": len(csalt),
+            "secret": ffi.NULL,
+            "secretlen": 0,
+            "ad": ffi.NULL,
+            "adlen": 0,
+            "t_cost": time_cost,
+            "m_cost": memory_cost,
+            "lanes": parallelism,
+            "threads": threads,
+            "version": version,
+            "allocate_cbk": (
+                ffi.NULL if allocator is None else allocator._allocate_cbk
+            ),
+            "free_cbk": ffi.NULL if allocator is None else allocator._free_cbk,
+            "flags": lib.ARGON2_DEFAULT_FLAGS,
+        },
+    )
+
+    return core(ctx, type.value)
+
+
+def _hash_raw_into(
+    out: Any,
+    secret: bytes | bytearray | memoryview,
+    salt: bytes | bytearray | memoryview,
+    time_cost: int,
+    memory_cost: int,
+    parallelism: int,
+    type: Type,
+    version: int,
+    allocator: MemoryArena | None,
+    thread_limiter: ThreadLimiter | None,
+    threads: int | None,
+) -> None:
+    """
+    Hash *secret* into the C buffer *out*, or raise a HashingError.
+    """
+    csecret = _from_buffer(secret)
+    csalt = _from_buffer(salt)
+
+    if not _needs_ctx(parallelism, allocator, thread_limiter, threads):
+        rv = lib.argon2_hash(
+            time_cost,
+            memory_cost,
+            parallelism,
+            csecret,
+            len(csecret),
+            csalt,
+            len(csalt),
+            out,
+            len(out),
+            ffi.NULL,
+            0,
+            type.value,
+            version,
+        )
+    else:
+        rv = _argon2_ctx(
+            out,
+            csecret,
+            csalt,
+            time_cost,
+            memory_cost,
+            parallelism,
+            type,
+            version,
+            allocator,
+            thread_limiter,
+            threads,
+        )
+
+    if rv != lib.ARGON2_OK:
+        raise HashingError(error_to_str(rv))
+
+
+def _hash_encoded_into(
+    out: Any,
+    secret: bytes | bytearray | memoryview,
+    salt: bytes | bytearray | memoryview,
+    time_cost: int,
+    memory_cost: int,
+    parallelism: int,
+    hash_len: int,
+    type: Type,
+    version: int,
+    allocator: MemoryArena | None,
+    thread_limiter: ThreadLimiter | None,
+    threads: int | None,
+) -> int:
+    """
+    Hash *secret* into the C buffer *out* as a NUL-terminated encoded hash,
+    or raise a HashingError.
+
+    Returns:
+        The length of the encoded hash without the trailing NUL.
+    """
+    if _needs_ctx(parallelism, allocator, thread_limiter, threads):
+        raw = _new_uninitialized("uint8_t[]", hash_len)
+        _hash_raw_into(
+            raw,
+            secret,
+            salt,
+            time_cost,
+            memory_cost,
+            parallelism,
+            type,
+            version,
+            allocator,
+            thread_limiter,
+            threads,
+        )
+        encoded = _encode_hash(
+            type,
+            version,
+            time_cost,
+            memory_cost,
+            parallelism,
+            bytes(salt),
+            ffi.buffer(raw)[:],
+        )
+        if len(encoded) >= len(out):
+            raise HashingError(error_to_str(lib.ARGON2_ENCODING_FAIL))
+
+        ffi.memmove(out, encoded + b"\0", len(encoded) + 1)
+
+        return len(encoded)
+
+    csecret = _from_buffer(secret)
+    csalt = _from_buffer(salt)
+    rv = lib.argon2_hash(
+        time_cost,
+        memory_cost,
+        parallelism,
+        csecret,
+        len(csecret),
+        csalt,
+        len(csalt),
+        ffi.NULL,
+        hash_len,
+        out,
+        len(out),
+        type.value,
+        version,
+    )
+    if rv != lib.ARGON2_OK:
+        raise HashingError(error_to_str(rv))
+
+    # The length computed by Argon2 includes the trailing NUL.
+    size: int = lib.argon2_encodedlen(
+        time_cost, memory_cost, parallelism, len(csalt), hash_len, type.value
+    )
+
+    return size - 1
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes | None:
+    try:
+        rv = base64.b64decode(data + b"=" * (-len(data) % 4), validate=True)
+    except binascii.Error:
+        return None
+
+    # Reject non-canonical encodings like Argon2 does.
+    if _b64encode(rv) != data:
+        return None
+
+    return rv
+
+
+def _encode_hash(
+    type: Type,
+    version: int,
+    time_cost: int,
+    memory_cost: int,
+    parallelism: int,
     salt: bytes,
+    raw: bytes,
+) -> bytes:
+    """
+    Encode a raw hash exactly like Argon2 does.
+    """
+    return b"$%s$v=%d$m=%d,t=%d,p=%d$%s$%s" % (
+        _TYPE_TO_NAME[type],
+        version,
+        memory_cost,
+        time_cost,
+        parallelism,
+        _b64encode(salt),
+        _b64encode(raw),
+    )
+
+
+def _decode_hash(
+    hash: bytes | bytearray | memoryview, type: Type
+) -> tuple[int, int, int, int, bytes, bytes] | None:
+    """
+    Decode an encoded *hash* of *type* exactly like Argon2 does.
+
+    Returns:
+        The version, time cost, memory cost, parallelism, salt, and raw hash;
+        or None if *hash* is invalid.
+    """
+    m = _ENCODED_HASH_RE.fullmatch(hash)
+    if m is None or m[1] != _TYPE_TO_NAME[type]:
+        return None
+
+    version = lib.ARGON2_VERSION_10 if m[2] is None else int(m[2])
+    memory_cost = int(m[3])
+    time_cost = int(m[4])
+    parallelism = int(m[5])
+    if max(version, memory_cost, time_cost, parallelism) > _UINT32_MAX:
+        return None
+
+    salt = _b64decode(m[6])
+    raw = _b64decode(m[7])
+    if salt is None or raw is None:
+        return None
+
+    return version, time_cost, memory_cost, parallelism, salt, raw
+
+
+def _compare_digest(a: Any, b: bytes) -> bool:
+    """
+    Compare *a* to *b* in constant time.
+    """
+    # hmac pulls in OpenSSL, so only import it once it's needed.
+    import hmac
+
+    return hmac.compare_digest(a, b)
+
+
+def _verify_ctx(
+    hash: bytes | bytearray | memoryview,
+    secret: bytes | bytearray | memoryview,
+    type: Type,
+    allocator: MemoryArena | None,
+    thread_limiter: ThreadLimiter | None,
+    threads: int | None,
+) -> int:
+    """
+    Verify *secret* against *hash* like ``argon2_verify`` but using
+    ``argon2_ctx`` with the callbacks of *allocator* and *threads* threads --
+    or as many of them as *thread_limiter* allows.
+
+    Returns:
+        An Argon2 error code.
+    """
+    decoded = _decode_hash(hash, type)
+    if decoded is None:
+        return lib.ARGON2_DECODING_FAIL  # type: ignore[no-any-return]
+
+    version, time_cost, memory_cost, parallelism, salt, raw = decoded
+    computed = _new_uninitialized("uint8_t[]", len(raw))
+    rv = _argon2_ctx(
+        computed,
+        _from_buffer(secret),
+        _from_buffer(salt),
+        time_cost,
+        memory_cost,
+        parallelism,
+        type,
+        version,
+        allocator,
+        thread_limiter,
+        threads,
+    )
+    if rv != lib.ARGON2_OK:
+        return rv
+
+    if not _compare_digest(ffi.buffer(computed), raw):
+        return lib.ARGON2_VERIFY_MISMATCH  # type: ignore[no-any-return]
+
+    return lib.ARGON2_OK  # type: ignore[no-any-return]
+
+
+def hash_secret(
+    secret: bytes | bytearray | memoryview,
+    salt: bytes | bytearray | memoryview,
     time_cost: int,
     memory_cost: int,
     parallelism: int,
     hash_len: int,
     type: Type,
     version: int = ARGON2_VERSION,
+    *,
+    allocator: MemoryArena | None = None,
+    thread_limiter: ThreadLimiter | None = None,
+    threads: int | None = None,
 ) -> bytes:
     """
     Hash *secret* and return an **encoded** hash.
@@ -74,6 +871,22 @@ def hash_secret(
 
         version: Which Argon2 version to use.
 
+        allocator:
+            A :class:`MemoryArena` to take Argon2's memory from.  If None,
+            Argon2 allocates and frees it itself.
+
+        thread_limiter:
+            A :class:`ThreadLimiter` that caps the number of threads Argon2
+            uses.  If None, it uses *threads* threads.
+
+        threads:
+            Number of threads that compute the *parallelism* lanes.  Unlike
+            *parallelism*, it doesn't change the hash.  Must be at least 1.
+            If None, one thread per lane is used.
+
+    *secret* and *salt* can be any contiguous bytes-like objects.  They are
+    passed to Argon2 without copying them.
+
     For an explanation of the Argon2 parameters see
     :class:`argon2.PasswordHasher`.
 
@@ -83,7 +896,12 @@ def hash_secret(
     Raises:
         argon2.exceptions.HashingError: If hashing fails.
 
+        ValueError: If *threads* is less than 1.
+
     .. versionadded:: 16.0.0
+    .. versionadded:: 26.1.0 *allocator*, *thread_limiter*, and *threads*
+    .. versionchanged:: 26.1.0
+       *secret* and *salt* can be any bytes-like objects.
 
     .. _salt: https://en.wikipedia.org/wiki/Salt_(cryptography)
     """
@@ -92,43 +910,94 @@ def hash_secret(
             time_cost,
             memory_cost,
             parallelism,
-            len(salt),
+            len(_from_buffer(salt)),
             hash_len,
             type.value,
         )
         + 1
     )
-    buf = ffi.new("char[]", size)
-    rv = lib.argon2_hash(
+    buf = _new_uninitialized("char[]", size)
+    length = _hash_encoded_into(
+        buf,
+        secret,
+        salt,
         time_cost,
         memory_cost,
         parallelism,
-        ffi.new("uint8_t[]", secret),
-        len(secret),
-        ffi.new("uint8_t[]", salt),
-        len(salt),
-        ffi.NULL,
         hash_len,
-        buf,
-        size,
-        type.value,
+        type,
         version,
+        allocator,
+        thread_limiter,
+        threads,
     )
-    if rv != lib.ARGON2_OK:
-        raise HashingError(error_to_str(rv))
 
-    return ffi.string(buf)  # type: ignore[no-any-return]
+    return ffi.buffer(buf, length)[:]  # type: ignore[no-any-return]
+
+
+def hash_secret_into(
+    out: bytearray | memoryview,
+    secret: bytes | bytearray | memoryview,
+    salt: bytes | bytearray | memoryview,
+    time_cost: int,
+    memory_cost: int,
+    parallelism: int,
+    hash_len: int,
+    type: Type,
+    version: int = ARGON2_VERSION,
+    *,
+    allocator: MemoryArena | None = None,
+    thread_limiter: ThreadLimiter | None = None,
+    threads: int | None = None,
+) -> int:
+    """
+    Hash *secret* and write the NUL-terminated **encoded** hash into *out*.
+
+    This function takes the same parameters as :func:`hash_secret`.
+
+    Args:
+        out:
+            A writable, contiguous bytes-like object.  It must be big enough
+            for the encoded hash plus the trailing NUL.
+
+    Returns:
+        The length of the encoded hash without the trailing NUL.
+
+    Raises:
+        argon2.exceptions.HashingError:
+            If hashing fails, or if *out* is too small.
+
+    .. versionadded:: 26.1.0
+    """
+    return _hash_encoded_into(
+        ffi.from_buffer("char[]", out, require_writable=True),
+        secret,
+        salt,
+        time_cost,
+        memory_cost,
+        parallelism,
+        hash_len,
+        type,
+        version,
+        allocator,
+        thread_limiter,
+        threads,
+    )
 
 
 def hash_secret_raw(
-    secret: bytes,
-    salt: bytes,
+    secret: bytes | bytearray | memoryview,
+    salt: bytes | bytearray | memoryview,
     time_cost: int,
     memory_cost: int,
     parallelism: int,
     hash_len: int,
     type: Type,
     version: int = ARGON2_VERSION,
+    *,
+    allocator: MemoryArena | None = None,
+    thread_limiter: ThreadLimiter | None = None,
+    threads: int | None = None,
 ) -> bytes:
     """
     Hash *password* and return a **raw** hash.
@@ -136,31 +1005,111 @@ def hash_secret_raw(
     This function takes the same parameters as :func:`hash_secret`.
 
     .. versionadded:: 16.0.0
+    .. versionadded:: 26.1.0 *allocator*, *thread_limiter*, and *threads*
+    .. versionchanged:: 26.1.0
+       *secret* and *salt* can be any bytes-like objects.
     """
-    buf = ffi.new("uint8_t[]", hash_len)
+    buf = _new_uninitialized("uint8_t[]", hash_len)
+    _hash_raw_into(
+        buf,
+        secret,
+        salt,
+        time_cost,
+        memory_cost,
+        parallelism,
+        type,
+        version,
+        allocator,
+        thread_limiter,
+        threads,
+    )
 
-    rv = lib.argon2_hash(
+    return ffi.buffer(buf)[:]  # type: ignore[no-any-return]
+
+
+def hash_secret_raw_into(
+    out: bytearray | memoryview,
+    secret: bytes | bytearray | memoryview,
+    salt: bytes | bytearray | memoryview,
+    time_cost: int,
+    memory_cost: int,
+    parallelism: int,
+    type: Type,
+    version: int = ARGON2_VERSION,
+    *,
+    allocator: MemoryArena | None = None,
+    thread_limiter: ThreadLimiter | None = None,
+    threads: int | None = None,
+) -> None:
+    """
+    Hash *secret* and write the **raw** hash into *out*.
+
+    This function takes the same parameters as :func:`hash_secret` -- except
+    for *hash_len* which is the length of *out*.
+
+    Args:
+        out: A writable, contiguous bytes-like object.
+
+    Raises:
+        argon2.exceptions.HashingError: If hashing fails.
+
+    .. versionadded:: 26.1.0
+    """
+    _hash_raw_into(
+        ffi.from_buffer("uint8_t[]", out, require_writable=True),
+        secret,
+        salt,
         time_cost,
         memory_cost,
         parallelism,
-        ffi.new("uint8_t[]", secret),
-        len(secret),
-        ffi.new("uint8_t[]", salt),
-        len(salt),
-        buf,
-        hash_len,
-        ffi.NULL,
-        0,
-        type.value,
+        type,
         version,
+        allocator,
+        thread_limiter,
+        threads,
+    )
+
+
+def _verify_secret_code(
+    hash: bytes | bytearray | memoryview,
+    secret: bytes | bytearray | memoryview,
+    type: Type,
+    allocator: MemoryArena | None,
+    thread_limiter: ThreadLimiter | None,
+    threads: int | None,
+) -> int:
+    """
+    Verify *secret* against *hash* and return Argon2's error code instead of
+    raising an exception.
+    """
+    _check_threads(threads)
+
+    if (
+        allocator is not None
+        or thread_limiter is not None
+        or threads is not None
+    ):
+        return _verify_ctx(
+            hash, secret, type, allocator, thread_limiter, threads
+        )
+
+    csecret = _from_buffer(secret)
+    rv: int = lib.argon2_verify(
+        _encoded_to_c(hash), csecret, len(csecret), type.value
     )
-    if rv != lib.ARGON2_OK:
-        raise HashingError(error_to_str(rv))
 
-    return bytes(ffi.buffer(buf, hash_len))
+    return rv
 
 
-def verify_secret(hash: bytes, secret: bytes, type: Type) -> Literal[True]:
+def verify_secret(
+    hash: bytes | bytearray | memoryview,
+    secret: bytes | bytearray | memoryview,
+    type: Type,
+    *,
+    allocator: MemoryArena | None = None,
+    thread_limiter: ThreadLimiter | None = None,
+    threads: int | None = None,
+) -> Literal[True]:
     """
     Verify whether *secret* is correct for *hash* of *type*.
 
@@ -173,6 +1122,18 @@ def verify_secret(hash: bytes, secret: bytes, type: Type) -> Literal[True]:
 
         type: Type for *hash*.
 
+        allocator:
+            A :class:`MemoryArena` to take Argon2's memory from.  If None,
+            Argon2 allocates and frees it itself.
+
+        thread_limiter:
+            A :class:`ThreadLimiter` that caps the number of threads Argon2
+            uses.  If None, it uses *threads* threads.
+
+        threads:
+            Number of threads that compute the lanes of *hash*.  Must be at
+            least 1.  If None, one thread per lane is used.
+
     Raises:
         argon2.exceptions.VerifyMismatchError:
             If verification fails because *hash* is not valid for *secret* of
@@ -181,6 +1142,8 @@ def verify_secret(hash: bytes, secret: bytes, type: Type) -> Literal[True]:
         argon2.exceptions.VerificationError:
             If verification fails for other reasons.
 
+        ValueError: If *threads* is less than 1.
+
     Returns:
         ``True`` on success, raise :exc:`~argon2.exceptions.VerificationError`
         otherwise.
@@ -189,14 +1152,13 @@ def verify_secret(hash: bytes, secret: bytes, type: Type) -> Literal[True]:
     .. versionchanged:: 16.1.0
         Raise :exc:`~argon2.exceptions.VerifyMismatchError` on mismatches
         instead of its more generic superclass.
+    .. versionadded:: 26.1.0 *allocator*, *thread_limiter*, and *threads*
+    .. versionchanged:: 26.1.0
+       *hash* and *secret* can be any bytes-like objects.
     """
-    rv = lib.argon2_verify(
-        ffi.new("char[]", hash),
-        ffi.new("uint8_t[]", secret),
-        len(secret),
-        type.value,
+    rv = _verify_secret_code(
+        hash, secret, type, allocator, thread_limiter, threads
     )
-
     if rv == lib.ARGON2_OK:
         return True
 
@@ -206,6 +1168,135 @@ def verify_secret(hash: bytes, secret: bytes, type: Type) -> Literal[True]:
     raise VerificationError(error_to_str(rv))
 
 
+def _verify_secrets(
+    items: Sequence[tuple[Any, Any, Type]],
+    allocator: MemoryArena | None,
+    thread_limiter: ThreadLimiter | None,
+    threads: int | None,
+) -> list[int]:
+    """
+    Verify all *items* one after another and return the error codes.
+    """
+    return [
+        _verify_secret_code(
+            hash, secret, type, allocator, thread_limiter, threads
+        )
+        for hash, secret, type in items
+    ]
+
+
+class _SharedExecutor:
+    """
+    A thread pool with one thread per CPU that is shared by all batch
+    verifications, so they don't start and join threads on every call.
+
+    It's only created once it's needed.  A forked child doesn't have the
+    parent's threads, so it creates its own.
+    """
+
+    __slots__ = ("__weakref__", "_executor", "_lock")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+        _register_after_fork(self)
+
+    def _after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def get(self) -> ThreadPoolExecutor:
+        # Taken once per batch, so the lock costs nothing worth avoiding.
+        with self._lock:
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._executor = ThreadPoolExecutor(
+                    os.cpu_count() or 1, thread_name_prefix="argon2"
+                )
+
+            return self._executor
+
+
+_verify_executor = _SharedExecutor()
+
+
+def verify_secret_many(
+    items: Iterable[
+        tuple[
+            bytes | bytearray | memoryview,
+            bytes | bytearray | memoryview,
+            Type,
+        ]
+    ],
+    max_workers: int | None = None,
+    *,
+    allocator: MemoryArena | None = None,
+    thread_limiter: ThreadLimiter | None = None,
+    threads: int | None = None,
+) -> list[int]:
+    """
+    Verify many secrets against their hashes at once.
+
+    The items are distributed evenly over at most *max_workers* threads that
+    verify them without holding the GIL.  The threads are taken from a pool
+    with one thread per CPU that is shared by all calls.  Failures don't raise
+    exceptions but are reported using Argon2 error codes.
+
+    Args:
+        items:
+            ``(hash, secret, type)`` tuples with the same meaning as the
+            arguments of :func:`verify_secret`.
+
+        max_workers:
+            Maximum number of threads to use.  If None, the number of CPUs is
+            used.
+
+        allocator: Like for :func:`verify_secret`.
+
+        thread_limiter:
+            Like for :func:`verify_secret`.  It also caps the threads that
+            compute lanes within each of the *max_workers* threads.
+
+        threads: Like for :func:`verify_secret`.
+
+    Returns:
+        An Argon2 error code for each item in the order of *items*.
+        ``lib.ARGON2_OK`` means that the secret matches,
+        ``lib.ARGON2_VERIFY_MISMATCH`` that it doesn't.  Can be transformed
+        into a string using :func:`error_to_str`.
+
+    .. versionadded:: 26.1.0
+    """
+    _check_threads(threads)
+
+    items = list(items)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    workers = min(max_workers, len(items))
+    if workers <= 1:
+        return _verify_secrets(items, allocator, thread_limiter, threads)
+
+    # Strided chunks spread runs of expensive hashes over all workers.
+    chunk_results = _verify_executor.get().map(
+        functools.partial(
+            _verify_secrets,
+            allocator=allocator,
+            thread_limiter=thread_limiter,
+            threads=threads,
+        ),
+        [items[i::workers] for i in range(workers)],
+    )
+
+    rv = [0] * len(items)
+    for i, chunk_rv in enumerate(chunk_results):
+        rv[i::workers] = chunk_rv
+
+    return rv
+
+
 def core(context: Any, type: int) -> int:
     """
     Direct binding to the ``argon2_ctx`` function.
@@ -217,8 +1308,7 @@ def core(context: Any, type: int) -> int:
         (e.g. clearing buffers). The structure of the *context* object can,
         has, and will change with *any* release!
 
-        Use at your own peril; *argon2-cffi* does *not* use this binding
-        itself.
+        Use at your own peril!
 
     Args:
         context:
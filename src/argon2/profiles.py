@@ -12,9 +12,18 @@ concrete values and :doc:`parameters` for more information.
 from __future__ import annotations
 
 import dataclasses
+import os
+import platform
+import time
+
+from typing import TYPE_CHECKING, Any
 
 from ._utils import Parameters, _is_wasm
-from .low_level import Type
+from .low_level import Type, hash_secret_raw
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 
 def get_default_parameters() -> Parameters:
@@ -77,3 +86,240 @@ CHEAPEST: Parameters = Parameters(
     memory_cost=8,
     parallelism=1,
 )
+
+
+def _measure_ms(
+    params: Parameters, concurrency: int, rounds: int = 3
+) -> float:
+    """
+    Measure the median latency of hashing with *params* in milliseconds while
+    *concurrency* hashes run at the same time.
+    """
+    secret = b"calibration"
+    salt = os.urandom(params.salt_len)
+
+    def timed_hash(_: object) -> float:
+        start = time.perf_counter()
+        hash_secret_raw(
+            secret,
+            salt,
+            params.time_cost,
+            params.memory_cost,
+            params.parallelism,
+            params.hash_len,
+            params.type,
+            params.version,
+        )
+        return (time.perf_counter() - start) * 1000
+
+    # Calibration is rare, so its imports don't slow down importing
+    # PasswordHasher.
+    import statistics
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(concurrency) as tpe:
+        return statistics.median(
+            tpe.map(timed_hash, range(concurrency * rounds))
+        )
+
+
+_PARAMETER_FIELDS = {f.name for f in dataclasses.fields(Parameters)}
+
+
+def _read_calibration(path: Path) -> list[Any]:
+    """
+    Read the entries of the calibration cache at *path*.
+
+    The file is only a cache, so if it's missing, unreadable, or has the wrong
+    shape, there are no entries.
+    """
+    import json
+
+    try:
+        entries = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return []
+
+    if not isinstance(entries, list):
+        return []
+
+    return [e for e in entries if isinstance(e, dict)]
+
+
+def _load_calibration(path: Path, key: dict[str, Any]) -> Parameters | None:
+    for entry in _read_calibration(path):
+        if entry.get("key") == key:
+            # A malformed entry is a miss and gets replaced.
+            params = entry.get("parameters")
+            if (
+                not isinstance(params, dict)
+                or params.keys() != _PARAMETER_FIELDS
+                or not isinstance(params["type"], str)
+                or params["type"] not in Type.__members__
+                or not all(
+                    type(v) is int for k, v in params.items() if k != "type"
+                )
+            ):
+                return None
+
+            return Parameters(**{**params, "type": Type[params["type"]]})
+
+    return None
+
+
+def _save_calibration(
+    path: Path, key: dict[str, Any], params: Parameters
+) -> None:
+    import json
+    import tempfile
+
+    from pathlib import Path
+
+    entries = [e for e in _read_calibration(path) if e.get("key") != key]
+    entries.append(
+        {
+            "key": key,
+            "parameters": {
+                **dataclasses.asdict(params),
+                "type": params.type.name,
+            },
+        }
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write atomically so concurrently starting processes never see a
+    # half-written file.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(entries, f, indent=2)
+        Path(tmp).replace(path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def calibrate(
+    target_ms: float,
+    max_memory_cost: int,
+    concurrency: int = 1,
+    *,
+    type: Type = Type.ID,
+    salt_len: int = 16,
+    hash_len: int = 32,
+    cache_path: str | os.PathLike[str] | None = None,
+) -> Parameters:
+    """
+    Find parameters that take about *target_ms* to verify on this host.
+
+    Follows the procedure from :rfc:`9106#section-4`: *parallelism* is the
+    number of CPUs that are available to each of the *concurrency*
+    simultaneous hashes, and *memory_cost* is as high as the memory ceiling
+    allows.  If a single pass with that much memory is slower than
+    *target_ms*, the memory is halved until it fits.  Otherwise, as many
+    passes as fit into *target_ms* are added.
+
+    All measurements are taken while *concurrency* hashes run at the same
+    time, so the result reflects the latency under load.
+
+    Args:
+        target_ms: Desired verification latency in milliseconds.
+
+        max_memory_cost:
+            Memory ceiling for all *concurrency* hashes together, in
+            kibibytes.
+
+        concurrency: Number of hashes that are expected to run at once.
+
+        type: Argon2 type of the parameters.
+
+        salt_len: Length of the salt in bytes.
+
+        hash_len: Length of the hash in bytes.
+
+        cache_path:
+            If not None, a JSON file where calibration results are stored.
+            If it already contains a result for this host and the same
+            arguments, it's returned without measuring anything.
+
+    Returns:
+        The calibrated parameters.
+
+    Raises:
+        ValueError:
+            If *concurrency* is less than 1 or *max_memory_cost* is too small
+            for *concurrency*.
+
+    .. versionadded:: 26.1.0
+    """
+    if concurrency < 1:
+        msg = f"'concurrency' must be at least 1 (got {concurrency})."
+        raise ValueError(msg)
+
+    key = {
+        "host": platform.node(),
+        "cpus": os.cpu_count(),
+        "target_ms": target_ms,
+        "max_memory_cost": max_memory_cost,
+        "concurrency": concurrency,
+        "type": type.name,
+        "salt_len": salt_len,
+        "hash_len": hash_len,
+    }
+    from pathlib import Path
+
+    path = None if cache_path is None else Path(cache_path)
+    if path is not None:
+        cached = _load_calibration(path, key)
+        if cached is not None:
+            return cached
+
+    memory_cost = max_memory_cost // concurrency
+    if memory_cost < 8:
+        msg = (
+            f"A memory ceiling of {max_memory_cost} KiB is too small for "
+            f"{concurrency} concurrent hashes."
+        )
+        raise ValueError(msg)
+
+    parallelism = (
+        1 if _is_wasm() else max(1, (os.cpu_count() or 1) // concurrency)
+    )
+    # Argon2 needs at least 8 KiB per lane.
+    parallelism = min(parallelism, memory_cost // 8)
+    min_memory_cost = 8 * parallelism
+
+    params = Parameters(
+        type=type,
+        version=19,
+        salt_len=salt_len,
+        hash_len=hash_len,
+        time_cost=1,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+    )
+
+    elapsed = _measure_ms(params, concurrency)
+    while elapsed > target_ms and params.memory_cost > min_memory_cost:
+        params = dataclasses.replace(
+            params, memory_cost=max(params.memory_cost // 2, min_memory_cost)
+        )
+        elapsed = _measure_ms(params, concurrency)
+
+    if elapsed < target_ms:
+        # The duration grows linearly with the number of passes.
+        params = dataclasses.replace(
+            params, time_cost=max(1, int(target_ms / elapsed))
+        )
+        elapsed = _measure_ms(params, concurrency)
+        while elapsed > target_ms and params.time_cost > 1:
+            params = dataclasses.replace(
+                params, time_cost=params.time_cost - 1
+            )
+            elapsed = _measure_ms(params, concurrency)
+
+    if path is not None:
+        _save_calibration(path, key, params)
+
+    return params
@@ -0,0 +1,238 @@
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import sys
+import threading
+
+import anyio
+import pytest
+import trio
+
+from argon2 import AsyncPasswordHasher, PasswordHasher, profiles
+from argon2._async import _running_under_trio
+from argon2.exceptions import InvalidHashError, VerifyMismatchError
+
+
+@pytest.fixture(name="aph")
+def _aph():
+    aph = AsyncPasswordHasher.from_parameters(profiles.CHEAPEST, max_workers=2)
+
+    yield aph
+
+    aph.close()
+
+
+class TestAsyncPasswordHasher:
+    def test_default(self):
+        """
+        If no PasswordHasher is passed, one with default parameters is used.
+        """
+        aph = AsyncPasswordHasher()
+
+        assert (
+            profiles.get_default_parameters()
+            == aph.password_hasher._parameters
+        )
+
+        aph.close()
+
+    def test_from_parameters(self, aph):
+        """
+        from_parameters wraps a PasswordHasher with the passed parameters.
+        """
+        assert profiles.CHEAPEST == aph.password_hasher._parameters
+        assert 2 == aph._executor._max_workers
+
+    def test_hash_verify(self, aph):
+        """
+        Hashes are valid and can be verified.
+        """
+
+        async def main():
+            hash = await aph.hash("password")
+
+            return hash, await aph.verify(hash, "password")
+
+        hash, rv = asyncio.run(main())
+
+        assert True is rv
+        assert PasswordHasher.from_parameters(profiles.CHEAPEST).verify(
+            hash, "password"
+        )
+        assert not aph.check_needs_rehash(hash)
+
+    def test_custom_salt(self, aph):
+        """
+        The salt is passed through.
+        """
+        hash = asyncio.run(aph.hash(b"password", salt=b"1234567890123456"))
+
+        assert hash == (
+            "$argon2id$v=19$m=8,t=1,p=1$MTIzNDU2Nzg5MDEyMzQ1Ng$maTa5w"
+        )
+
+    @pytest.mark.parametrize(
+        ("hash", "exc"),
+        [
+            (
+                "$argon2id$v=19$m=8,t=1,p=1$MTIzNDU2Nzg5MDEyMzQ1Ng$maTa5w",
+                VerifyMismatchError,
+            ),
+            ("tiger", InvalidHashError),
+        ],
+    )
+    def test_verify_errors(self, aph, hash, exc):
+        """
+        Exceptions are propagated to the awaiting task.
+        """
+        with pytest.raises(exc):
+            asyncio.run(aph.verify(hash, "wrong"))
+
+    def test_runs_off_loop(self, aph):
+        """
+        The work is done in the worker threads, not the event loop's thread.
+        """
+        threads = []
+
+        class SpyHasher(PasswordHasher):
+            __slots__ = ()
+
+            def hash(self, password, *, salt=None):
+                threads.append(threading.current_thread())
+                return super().hash(password, salt=salt)
+
+        aph._password_hasher = SpyHasher.from_parameters(profiles.CHEAPEST)
+
+        asyncio.run(aph.hash("password"))
+
+        assert threading.current_thread() is not threads[0]
+        assert threads[0].name.startswith("argon2")
+
+    def test_cancel_queued(self):
+        """
+        Cancelling a task whose job hasn't started yet, cancels the job.
+        """
+        aph = AsyncPasswordHasher.from_parameters(
+            profiles.CHEAPEST, max_workers=1
+        )
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def block():
+            started.set()
+            release.wait()
+
+        def record():
+            calls.append(True)
+
+        async def main():
+            blocker = asyncio.ensure_future(aph._run(block))
+            await asyncio.get_running_loop().run_in_executor(
+                None, started.wait
+            )
+
+            queued = asyncio.ensure_future(aph._run(record))
+            await asyncio.sleep(0)
+            queued.cancel()
+
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+
+            release.set()
+            await blocker
+
+        asyncio.run(main())
+        aph.close()
+
+        assert [] == calls
+
+    def test_context_manager(self):
+        """
+        Leaving the async context shuts down the executor.
+        """
+
+        async def main():
+            async with AsyncPasswordHasher.from_parameters(
+                profiles.CHEAPEST
+            ) as aph:
+                await aph.hash("password")
+
+            return aph
+
+        aph = asyncio.run(main())
+
+        with pytest.raises(RuntimeError):
+            aph._executor.submit(print)
+
+    def test_not_trio(self):
+        """
+        Outside of Trio, _running_under_trio is False.
+        """
+        assert not _running_under_trio()
+
+    def test_trio_not_imported(self, monkeypatch):
+        """
+        If Trio isn't imported, _running_under_trio is False.
+        """
+        monkeypatch.delitem(sys.modules, "trio")
+
+        assert not _running_under_trio()
+
+    def test_trio(self, aph):
+        """
+        Works under Trio.
+        """
+
+        async def main():
+            assert _running_under_trio()
+
+            hash = await aph.hash("password")
+
+            return await aph.verify(hash, "password")
+
+        assert True is trio.run(main)
+
+    def test_trio_cancel_queued(self):
+        """
+        Under Trio, cancelling a task whose job hasn't started yet, cancels the
+        job, too.
+        """
+        aph = AsyncPasswordHasher.from_parameters(
+            profiles.CHEAPEST, max_workers=1
+        )
+        release = threading.Event()
+        calls = []
+
+        def record():
+            calls.append(True)
+
+        async def main():
+            blocker = aph._executor.submit(release.wait)
+
+            with trio.move_on_after(0.01) as scope:
+                await aph._run(record)
+
+            release.set()
+            blocker.result()
+
+            return scope.cancelled_caught
+
+        assert True is trio.run(main)
+
+        aph.close()
+
+        assert [] == calls
+
+    @pytest.mark.parametrize("backend", ["asyncio", "trio"])
+    def test_anyio(self, aph, backend):
+        """
+        Works under AnyIO on both backends.
+        """
+
+        async def main():
+            hash = await aph.hash("password")
+
+            return await aph.verify(hash, "password")
+
+        assert True is anyio.run(main, backend=backend)
@@ -0,0 +1,232 @@
+# SPDX-License-Identifier: MIT
+
+import sys
+
+import pytest
+
+from argon2 import PasswordHasher, low_level, profiles
+from argon2._bench import (
+    PASSWORD,
+    OverheadResult,
+    Regression,
+    _throughput_worker,
+    _without_argon2,
+    compare_overhead,
+    gil_enabled,
+    measure_latency,
+    measure_overhead,
+    measure_scaling,
+    measure_throughput,
+    percentile,
+    reject_outliers,
+    split,
+    worker_counts,
+)
+
+
+@pytest.mark.parametrize(
+    ("p", "expected"), [(0, 1), (50, 5), (95, 10), (99, 10), (100, 10)]
+)
+def test_percentile(p, expected):
+    """
+    Percentiles are computed using the nearest rank.
+    """
+    assert expected == percentile(list(range(1, 11)), p)
+
+
+@pytest.mark.parametrize(
+    ("n", "k", "expected"),
+    [(10, 3, [4, 3, 3]), (2, 4, [1, 1, 0, 0]), (6, 2, [3, 3])],
+)
+def test_split(n, k, expected):
+    """
+    Work is split as evenly as possible.
+    """
+    assert expected == split(n, k)
+
+
+@pytest.mark.parametrize("operation", ["hash", "verify"])
+def test_measure_throughput(operation):
+    """
+    All operations are measured and reported.
+    """
+    r = measure_throughput(
+        profiles.CHEAPEST, operation, threads=2, processes=3, n=5
+    )
+
+    assert operation == r.operation
+    assert 5 == r.ops
+    assert 0 < r.ops_per_sec
+    assert 0 < r.p50 <= r.p95 <= r.p99
+    assert 0 < r.cpu_utilization
+    assert None is r.peak_rss or 0 < r.peak_rss
+
+
+@pytest.mark.parametrize("operation", ["hash", "verify"])
+def test_throughput_worker(operation):
+    """
+    The worker runs all operations across its threads and reports its
+    measurements.  It normally runs in a subprocess, so it's called
+    in-process here.
+    """
+    hash = PasswordHasher.from_parameters(profiles.CHEAPEST).hash(PASSWORD)
+
+    latencies, start, end, cpu, rss = _throughput_worker(
+        profiles.CHEAPEST, operation, 2, 5, hash
+    )
+
+    assert 5 == len(latencies)
+    assert all(0 < latency for latency in latencies)
+    assert start <= end
+    assert 0 <= cpu
+    assert None is rss or 0 < rss
+
+
+@pytest.mark.parametrize(
+    ("max_workers", "expected"),
+    [(1, [1]), (2, [1, 2]), (6, [1, 2, 4, 6]), (8, [1, 2, 4, 8])],
+)
+def test_worker_counts(max_workers, expected):
+    """
+    Worker counts double up to the maximum, which is always included.
+    """
+    assert expected == worker_counts(max_workers)
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_gil_enabled(monkeypatch, enabled):
+    """
+    The GIL status is reported by the interpreter if it knows it.
+    """
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: enabled, raising=False)
+
+    assert enabled is gil_enabled()
+
+
+def test_gil_enabled_old_python(monkeypatch):
+    """
+    Before Python 3.13, the GIL is always enabled.
+    """
+    monkeypatch.delattr(sys, "_is_gil_enabled", raising=False)
+
+    assert gil_enabled()
+
+
+def test_measure_scaling():
+    """
+    Threads and processes are measured for each number of workers.
+    """
+    rs = measure_scaling(profiles.CHEAPEST, "verify", workers=[1, 2], n=3)
+
+    assert [1, 2] == [r.workers for r in rs]
+    assert all(0 < r.threads_ops_per_sec for r in rs)
+    assert all(0 < r.processes_ops_per_sec for r in rs)
+
+
+@pytest.mark.parametrize(
+    ("samples", "expected"),
+    [
+        ([1.0, 1.1, 0.9, 1.0, 100.0], [1.0, 1.1, 0.9, 1.0]),
+        ([1.0, 100.0, 1000.0], [1.0, 100.0, 1000.0]),
+        ([], []),
+    ],
+)
+def test_reject_outliers(samples, expected):
+    """
+    Samples outside of Tukey's fences are dropped, unless there are too few to
+    tell.
+    """
+    assert expected == reject_outliers(samples)
+
+
+def test_measure_latency():
+    """
+    Warmup calls aren't measured and the mean comes with a confidence
+    interval.
+    """
+    calls = []
+
+    r = measure_latency(lambda: calls.append(None), n=10, warmup=3)
+
+    assert 13 == len(calls)
+    assert 10 == r.samples + r.outliers
+    assert 0 < r.mean
+    assert 0 <= r.ci
+
+
+def test_measure_latency_single_sample():
+    """
+    With a single sample, there's no confidence interval.
+    """
+    r = measure_latency(lambda: None, n=1, warmup=0)
+
+    assert 1 == r.samples
+    assert None is r.ci
+
+
+def test_measure_overhead():
+    """
+    All operations are measured, and only those that call into Argon2 have
+    their C time split off.
+    """
+    results = measure_overhead(profiles.CHEAPEST, repeat=1, number=2)
+    by_name = {r.name: r for r in results}
+
+    assert {
+        "PasswordHasher.hash",
+        "PasswordHasher.verify",
+        "low_level.hash_secret_raw",
+        "PasswordHasher.check_needs_rehash",
+        "extract_parameters",
+        "_check_types",
+        "_ensure_bytes",
+    } == set(by_name)
+    assert None is not by_name["PasswordHasher.verify"].c
+    assert None is by_name["extract_parameters"].c
+    assert all(0 < r.overhead for r in results)
+
+
+def test_without_argon2():
+    """
+    Within _without_argon2, Argon2 isn't called and the real library is
+    restored afterwards.
+    """
+    lib = low_level.lib
+
+    with _without_argon2():
+        # The output buffer is never written to.
+        assert 8 == len(
+            low_level.hash_secret_raw(
+                b"secret", b"salt" * 4, 1, 8, 1, 8, low_level.Type.ID
+            )
+        )
+        # Encoded hashes are zeroed to stay decodable.
+        assert b"" == low_level.hash_secret(
+            b"secret", b"salt" * 4, 1, 8, 1, 8, low_level.Type.ID
+        ).strip(b"\0")
+        assert low_level.verify_secret(
+            b"$argon2id$v=19$m=8,t=1,p=1$c2FsdHNhbHQ$aW52YWxpZA",
+            b"wrong",
+            low_level.Type.ID,
+        )
+
+    assert lib is low_level.lib
+
+
+def test_compare_overhead():
+    """
+    Only operations whose overhead grew beyond the threshold are reported.
+    Operations without a baseline are ignored.
+    """
+    results = [
+        OverheadResult(name="fast", total=3.0, c=2.0, overhead=1.0),
+        OverheadResult(name="slow", total=1.5, c=None, overhead=1.5),
+        OverheadResult(name="new", total=9.0, c=None, overhead=9.0),
+        OverheadResult(name="zero", total=9.0, c=None, overhead=9.0),
+    ]
+
+    assert [
+        Regression(name="slow", baseline=1.0, current=1.5, change=0.5)
+    ] == compare_overhead(
+        results, {"fast": 1.0, "slow": 1.0, "zero": 0.0}, 0.1
+    )
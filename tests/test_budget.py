@@ -0,0 +1,231 @@
+# SPDX-License-Identifier: MIT
+
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from argon2 import (
+    BudgetedPasswordHasher,
+    BudgetStats,
+    PasswordHasher,
+    VerificationLimits,
+    profiles,
+)
+from argon2.exceptions import (
+    HashLimitExceededError,
+    InvalidHashError,
+    MemoryBudgetExceededError,
+    VerificationError,
+    VerifyMismatchError,
+)
+
+
+CHEAPEST_BYTES = profiles.CHEAPEST.memory_cost * 1024
+
+
+@pytest.fixture(name="ph")
+def _ph():
+    return PasswordHasher.from_parameters(profiles.CHEAPEST)
+
+
+def wait_for_queue_depth(bph, depth):
+    """
+    Spin until *depth* jobs are waiting for memory.
+    """
+    while bph.stats().queue_depth != depth:
+        threading.Event().wait(0.001)
+
+
+class TestBudgetedPasswordHasher:
+    def test_default(self):
+        """
+        If no PasswordHasher is passed, one with default parameters is used.
+        """
+        bph = BudgetedPasswordHasher(max_memory=1)
+
+        assert (
+            profiles.get_default_parameters()
+            == bph.password_hasher._parameters
+        )
+
+    def test_hash_verify(self, ph):
+        """
+        Hashes are valid and can be verified.  Memory is returned afterwards.
+        """
+        bph = BudgetedPasswordHasher(ph, max_memory=CHEAPEST_BYTES)
+
+        hash = bph.hash("password")
+
+        assert bph.verify(hash.encode(), "password")
+        assert not bph.check_needs_rehash(hash)
+        assert (
+            BudgetStats(
+                in_use=0,
+                queue_depth=0,
+                admitted=2,
+                rejected=0,
+                total_wait=0.0,
+                max_wait=0.0,
+            )
+            == bph.stats()
+        )
+
+    def test_errors_release_memory(self, ph):
+        """
+        If verification fails, the reserved memory is released.
+        """
+        bph = BudgetedPasswordHasher(ph, max_memory=CHEAPEST_BYTES)
+
+        with pytest.raises(VerifyMismatchError):
+            bph.verify(bph.hash("password"), "wrong")
+
+        assert 0 == bph.stats().in_use
+
+    def test_invalid_hash(self, ph):
+        """
+        Invalid hashes are rejected before being admitted.
+        """
+        bph = BudgetedPasswordHasher(ph, max_memory=CHEAPEST_BYTES)
+
+        with pytest.raises(InvalidHashError):
+            bph.verify("tiger", "password")
+
+        assert 0 == bph.stats().admitted
+
+    def test_non_ascii_bytes(self, ph):
+        """
+        Non-ASCII bytes hashes fail like they do with PasswordHasher.
+        """
+        bph = BudgetedPasswordHasher(ph, max_memory=CHEAPEST_BYTES)
+        hash = ph.hash("password").encode()[:-1] + b"\xff"
+
+        with pytest.raises(VerificationError, match="Decoding failed"):
+            ph.verify(hash, "password")
+        with pytest.raises(VerificationError, match="Decoding failed"):
+            bph.verify(hash, "password")
+
+        with pytest.raises(InvalidHashError):
+            bph.verify(b"$argon2\xff", "password")
+
+    def test_limits(self):
+        """
+        Hashes that exceed the limits are rejected before they are admitted
+        or counted against the budget.
+        """
+        ph = PasswordHasher.from_parameters(
+            profiles.CHEAPEST, limits=VerificationLimits(max_memory_cost=8)
+        )
+        bph = BudgetedPasswordHasher(ph, max_memory=CHEAPEST_BYTES)
+
+        with pytest.raises(HashLimitExceededError):
+            bph.verify(PasswordHasher(1, 16, 1).hash("password"), "password")
+
+        stats = bph.stats()
+
+        assert 0 == stats.admitted
+        assert 0 == stats.rejected
+
+    def test_never_fits(self, ph):
+        """
+        Jobs that are bigger than the whole budget are rejected immediately.
+        """
+        bph = BudgetedPasswordHasher(ph, max_memory=CHEAPEST_BYTES - 1)
+
+        with pytest.raises(
+            MemoryBudgetExceededError,
+            match=f"Job needs {CHEAPEST_BYTES} bytes but the budget is only "
+            f"{CHEAPEST_BYTES - 1} bytes",
+        ):
+            bph.hash("password")
+
+        assert 1 == bph.stats().rejected
+
+    def test_verify_uses_memory_of_hash(self, ph):
+        """
+        Verification reserves the memory cost of the hash, not of the
+        instance's parameters.
+        """
+        bph = BudgetedPasswordHasher(ph, max_memory=CHEAPEST_BYTES)
+        hash = PasswordHasher(1, 16, 1).hash("password")
+
+        with pytest.raises(
+            MemoryBudgetExceededError, match="Job needs 16384 bytes"
+        ):
+            bph.verify(hash, "password")
+
+    def test_no_wait(self, ph):
+        """
+        With a timeout of 0, jobs that don't fit right away are rejected.
+        """
+        bph = BudgetedPasswordHasher(ph, max_memory=CHEAPEST_BYTES, timeout=0)
+        bph._acquire(CHEAPEST_BYTES)
+
+        with pytest.raises(
+            MemoryBudgetExceededError,
+            match="Not enough memory left in budget",
+        ):
+            bph.hash("password")
+
+        bph._release(CHEAPEST_BYTES)
+
+        assert bph.hash("password")
+
+    def test_timeout(self, ph):
+        """
+        Jobs that wait longer than timeout are rejected and leave the queue.
+        """
+        bph = BudgetedPasswordHasher(
+            ph, max_memory=CHEAPEST_BYTES, timeout=0.01
+        )
+        bph._acquire(CHEAPEST_BYTES)
+
+        with pytest.raises(
+            MemoryBudgetExceededError,
+            match="Timed out waiting for memory in budget",
+        ):
+            bph.hash("password")
+
+        stats = bph.stats()
+
+        assert 0 == stats.queue_depth
+        assert 1 == stats.rejected
+
+    def test_queue(self, ph):
+        """
+        Jobs that don't fit wait until memory is released, in the order of
+        their arrival.  Waiting is reported in the stats.
+        """
+        bph = BudgetedPasswordHasher(ph, max_memory=2 * CHEAPEST_BYTES)
+        bph._acquire(2 * CHEAPEST_BYTES)
+        order = []
+
+        def job(name, size):
+            bph._acquire(size)
+            order.append(name)
+            bph._release(size)
+
+        with ThreadPoolExecutor(2) as tpe:
+            big = tpe.submit(job, "big", 2 * CHEAPEST_BYTES)
+            wait_for_queue_depth(bph, 1)
+            small = tpe.submit(job, "small", CHEAPEST_BYTES)
+            wait_for_queue_depth(bph, 2)
+
+            # Releasing half doesn't let the small one overtake the big one.
+            bph._release(CHEAPEST_BYTES)
+            threading.Event().wait(0.01)
+
+            assert [] == order
+
+            bph._release(CHEAPEST_BYTES)
+            big.result()
+            small.result()
+
+        stats = bph.stats()
+
+        assert ["big", "small"] == order
+        assert 0 == stats.in_use
+        assert 0 == stats.queue_depth
+        assert 3 == stats.admitted
+        assert 0 < stats.max_wait <= stats.total_wait
@@ -0,0 +1,241 @@
+# SPDX-License-Identifier: MIT
+
+import gc
+import mmap
+import os
+import signal
+import weakref
+
+from unittest import mock
+
+import pytest
+
+import argon2
+
+from argon2 import (
+    BudgetedPasswordHasher,
+    PasswordHasher,
+    UsageMeter,
+    extract_parameters_cache_info,
+    low_level,
+    profiles,
+    warmup,
+)
+from argon2._fork import _fork_aware, _reinit_after_fork
+from argon2._meter import _memory_bytes
+from argon2._password_hasher import _shared_password_hasher
+from argon2.low_level import MemoryArena, ThreadLimiter, ffi
+
+
+CHEAPEST_BYTES = _memory_bytes(
+    profiles.CHEAPEST.memory_cost, profiles.CHEAPEST.parallelism
+)
+
+
+class TestWarmup:
+    def test_warmup(self):
+        """
+        The caches are filled and the arena gets max_buffers buffers that fit
+        -- but only after forking.
+        """
+        _shared_password_hasher.cache_clear()
+        argon2.extract_parameters_cache_clear()
+        arena = MemoryArena(max_buffers=3)
+
+        warmup(profiles.CHEAPEST, allocator=arena)
+
+        assert 1 == _shared_password_hasher.cache_info().currsize
+        assert 1 == extract_parameters_cache_info().currsize
+        assert 0 == arena.idle_bytes
+
+        arena._after_fork()
+        buffers = list(arena._idle)
+
+        assert 3 * CHEAPEST_BYTES == arena.idle_bytes
+
+        arena._after_fork()
+
+        assert buffers == arena._idle
+
+    def test_fill_after_fork_replaces_inherited(self):
+        """
+        Buffers inherited from the parent are replaced by fresh ones.
+        """
+        arena = MemoryArena(max_buffers=1)
+        PasswordHasher.from_parameters(
+            profiles.CHEAPEST, allocator=arena
+        ).hash("password")
+        inherited = arena._idle[0]
+
+        warmup(profiles.CHEAPEST, allocator=arena)
+        arena._after_fork()
+
+        assert [CHEAPEST_BYTES] == [len(b) for b in arena._idle]
+        assert inherited is not arena._idle[0]
+
+    def test_fill_after_fork_touches_pages(self):
+        """
+        After a fork, the pages of the new buffers are written to, so they're
+        faulted in before the first hash.
+        """
+        arena = MemoryArena(max_buffers=2)
+        warmup(profiles.CHEAPEST, allocator=arena)
+
+        with mock.patch.object(
+            low_level, "_touch_pages", wraps=low_level._touch_pages
+        ) as touch:
+            arena._after_fork()
+
+        assert arena._idle == [c.args[0] for c in touch.call_args_list]
+
+    def test_touch_pages(self):
+        """
+        _touch_pages writes to every page of the buffer.
+        """
+        buf = ffi.new("uint8_t[]", b"\xff" * (2 * mmap.PAGESIZE + 1))
+
+        low_level._touch_pages(buf)
+
+        assert [0, 0, 0] == [buf[i] for i in range(0, len(buf), mmap.PAGESIZE)]
+        assert 255 == buf[1]
+
+    def test_fill_after_fork_fails(self):
+        """
+        If the buffers can't be allocated after forking, the arena stays empty.
+        """
+        arena = MemoryArena(max_buffers=1)
+        warmup(profiles.CHEAPEST, allocator=arena)
+
+        with mock.patch.object(MemoryArena, "_fill", side_effect=MemoryError):
+            arena._after_fork()
+
+        assert 0 == arena.idle_bytes
+
+    def test_fill_keeps_fitting_buffers(self):
+        """
+        Buffers that fit already count and buffers that are too small are
+        replaced.
+        """
+        arena = MemoryArena(max_buffers=2)
+        PasswordHasher(1, 8, 1, allocator=arena).hash("password")
+        PasswordHasher(1, 16, 1, allocator=arena).hash("password")
+
+        arena._fill(_memory_bytes(16, 1))
+
+        assert [16 * 1024, 16 * 1024] == [len(b) for b in arena._idle]
+
+    def test_default_parameters(self, monkeypatch):
+        """
+        If no parameters are passed, the platform's defaults are used.
+        """
+        monkeypatch.setattr(
+            profiles, "get_default_parameters", lambda: profiles.CHEAPEST
+        )
+        _shared_password_hasher.cache_clear()
+
+        warmup()
+        PasswordHasher.for_parameters(profiles.CHEAPEST)
+
+        assert 1 == _shared_password_hasher.cache_info().hits
+
+
+class TestAfterFork:
+    def test_reinit(self):
+        """
+        Locks are replaced and the state of calls that were in flight when the
+        parent forked is dropped.
+        """
+        arena = MemoryArena()
+        limiter = ThreadLimiter(4)
+        meter = UsageMeter()
+        bph = BudgetedPasswordHasher(
+            PasswordHasher.from_parameters(profiles.CHEAPEST),
+            max_memory=2**20,
+        )
+        locks = [arena._lock, limiter._lock, meter._lock, bph._cond]
+
+        arena._busy[1] = object()
+        limiter._acquire(4)
+        bph._acquire(1024)
+        meter._record(argon2.CallStats("hash", 1, 1.0, 1.0))
+
+        _reinit_after_fork()
+
+        assert {} == arena._busy
+        assert 0 == limiter.in_use
+        assert 0 == bph.stats().in_use
+        assert 1 == meter.stats().hashes
+        assert not {id(lock) for lock in locks} & {
+            id(arena._lock),
+            id(limiter._lock),
+            id(meter._lock),
+            id(bph._cond),
+        }
+
+    def test_weak(self):
+        """
+        Objects aren't kept alive by the fork hooks.
+        """
+        arena = MemoryArena()
+        ref = weakref.ref(arena)
+
+        assert arena in _fork_aware
+
+        del arena
+        gc.collect()
+
+        assert None is ref()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Needs os.fork.")
+    def test_fork(self):
+        """
+        A child that forked while all locks were held can use everything.
+        """
+        arena = MemoryArena()
+        limiter = ThreadLimiter(2)
+        meter = UsageMeter()
+        ph = PasswordHasher.from_parameters(
+            profiles.CHEAPEST,
+            allocator=arena,
+            thread_limiter=limiter,
+            meter=meter,
+        )
+        bph = BudgetedPasswordHasher(ph, max_memory=CHEAPEST_BYTES)
+
+        with arena._lock, limiter._lock, meter._lock, bph._cond:
+            pid = os.fork()
+            if pid == 0:  # pragma: no cover -- child
+                # Deadlocks kill the child instead of hanging the tests.
+                signal.alarm(10)
+                ok = False
+                try:
+                    bph.verify(bph.hash("password"), "password")
+                    ok = (
+                        1 == meter.stats().hashes
+                        and 0 == limiter.in_use
+                        and 0 == bph.stats().in_use
+                    )
+                finally:
+                    os._exit(0 if ok else 1)
+
+        _, status = os.waitpid(pid, 0)
+
+        assert os.WIFEXITED(status)
+        assert 0 == os.WEXITSTATUS(status)
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Needs os.fork.")
+    def test_warmup_fork(self):
+        """
+        Forked children fill a warmed-up arena while the parent doesn't.
+        """
+        arena = MemoryArena(max_buffers=2)
+        warmup(profiles.CHEAPEST, allocator=arena)
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover -- child
+            os._exit(0 if 2 * CHEAPEST_BYTES == arena.idle_bytes else 1)
+
+        _, status = os.waitpid(pid, 0)
+
+        assert 0 == os.WEXITSTATUS(status)
+        assert 0 == arena.idle_bytes
@@ -1,6 +1,8 @@
 # SPDX-License-Identifier: MIT
 
 import binascii
+import io
+import mmap
 import os
 
 import pytest
@@ -8,6 +10,7 @@ import pytest
 from hypothesis import assume, given, settings
 from hypothesis import strategies as st
 
+from argon2 import low_level
 from argon2.exceptions import (
     HashingError,
     VerificationError,
@@ -15,13 +18,22 @@ from argon2.exceptions import (
 )
 from argon2.low_level import (
     ARGON2_VERSION,
+    MemoryArena,
+    ThreadLimiter,
     Type,
+    _decode_hash,
+    _new_uninitialized,
+    _verify_executor,
     core,
+    error_to_str,
     ffi,
     hash_secret,
+    hash_secret_into,
     hash_secret_raw,
+    hash_secret_raw_into,
     lib,
     verify_secret,
+    verify_secret_many,
 )
 
 
@@ -236,8 +248,9 @@ class TestVerify:
         with pytest.raises(TypeError) as e:
             verify_secret(TEST_HASH_I, TEST_PASSWORD.decode("ascii"), Type.I)
 
-        assert e.value.args[0].startswith(
-            "initializer for ctype 'uint8_t[]' must be a"
+        assert (
+            "from_buffer() cannot return the address of a unicode object"
+            == e.value.args[0]
         )
 
     def test_old_hash(self):
@@ -247,6 +260,654 @@ class TestVerify:
         assert True is verify_secret(TEST_HASH_I_OLD, TEST_PASSWORD, Type.I)
 
 
+buffer_types = pytest.mark.parametrize(
+    "to_buffer",
+    [bytes, bytearray, memoryview],
+    ids=["bytes", "bytearray", "mv"],
+)
+with_and_without_arena = pytest.mark.parametrize(
+    "allocator", [None, MemoryArena()], ids=["malloc", "arena"]
+)
+
+
+class TestBuffers:
+    @buffer_types
+    @with_and_without_arena
+    def test_hash_secret(self, to_buffer, allocator):
+        """
+        Secret and salt can be any bytes-like objects.
+        """
+        assert TEST_HASH_ID == hash_secret(
+            to_buffer(TEST_PASSWORD),
+            to_buffer(TEST_SALT),
+            TEST_TIME,
+            TEST_MEMORY,
+            TEST_PARALLELISM,
+            TEST_HASH_LEN,
+            Type.ID,
+            allocator=allocator,
+        )
+
+    @buffer_types
+    @with_and_without_arena
+    def test_hash_secret_raw(self, to_buffer, allocator):
+        """
+        Secret and salt can be any bytes-like objects.
+        """
+        assert TEST_RAW_ID == hash_secret_raw(
+            to_buffer(TEST_PASSWORD),
+            to_buffer(TEST_SALT),
+            TEST_TIME,
+            TEST_MEMORY,
+            TEST_PARALLELISM,
+            TEST_HASH_LEN,
+            Type.ID,
+            allocator=allocator,
+        )
+
+    @buffer_types
+    @with_and_without_arena
+    def test_verify_secret(self, to_buffer, allocator):
+        """
+        Hash and secret can be any bytes-like objects.
+        """
+        assert verify_secret(
+            to_buffer(TEST_HASH_ID),
+            to_buffer(TEST_PASSWORD),
+            Type.ID,
+            allocator=allocator,
+        )
+
+        with pytest.raises(VerifyMismatchError):
+            verify_secret(
+                to_buffer(TEST_HASH_ID),
+                to_buffer(b"wrong"),
+                Type.ID,
+                allocator=allocator,
+            )
+
+    @buffer_types
+    def test_verify_secret_many(self, to_buffer):
+        """
+        Hashes and secrets can be any bytes-like objects.
+        """
+        assert [lib.ARGON2_OK] == verify_secret_many(
+            [(to_buffer(TEST_HASH_ID), to_buffer(TEST_PASSWORD), Type.ID)]
+        )
+
+    def test_verify_hash_not_nul_terminated(self):
+        """
+        Hashes that aren't bytes are NUL-terminated before passing them to
+        Argon2.
+        """
+        buf = bytearray(TEST_HASH_ID + b"garbage")
+
+        assert verify_secret(
+            memoryview(buf)[: len(TEST_HASH_ID)], TEST_PASSWORD, Type.ID
+        )
+
+    @with_and_without_arena
+    def test_hash_secret_raw_into(self, allocator):
+        """
+        The raw hash is written into the passed buffer whose length determines
+        the hash length.
+        """
+        out = bytearray(TEST_HASH_LEN + 2)
+
+        assert None is hash_secret_raw_into(
+            memoryview(out)[1:-1],
+            TEST_PASSWORD,
+            TEST_SALT,
+            TEST_TIME,
+            TEST_MEMORY,
+            TEST_PARALLELISM,
+            Type.ID,
+            allocator=allocator,
+        )
+
+        assert b"\0" + TEST_RAW_ID + b"\0" == out
+
+    @with_and_without_arena
+    def test_hash_secret_into(self, allocator):
+        """
+        The encoded hash is written NUL-terminated into the passed buffer and
+        its length is returned.
+        """
+        out = bytearray(b"x" * 200)
+
+        rv = hash_secret_into(
+            out,
+            TEST_PASSWORD,
+            TEST_SALT,
+            TEST_TIME,
+            TEST_MEMORY,
+            TEST_PARALLELISM,
+            TEST_HASH_LEN,
+            Type.ID,
+            allocator=allocator,
+        )
+
+        assert len(TEST_HASH_ID) == rv
+        assert TEST_HASH_ID + b"\0" == out[: rv + 1]
+
+    @with_and_without_arena
+    def test_hash_secret_into_too_small(self, allocator):
+        """
+        If the buffer is too small, HashingError is raised.
+        """
+        with pytest.raises(HashingError, match="Encoding failed"):
+            hash_secret_into(
+                bytearray(len(TEST_HASH_ID)),
+                TEST_PASSWORD,
+                TEST_SALT,
+                TEST_TIME,
+                TEST_MEMORY,
+                TEST_PARALLELISM,
+                TEST_HASH_LEN,
+                Type.ID,
+                allocator=allocator,
+            )
+
+    def test_into_read_only(self):
+        """
+        The output buffer must be writable.
+        """
+        with pytest.raises(BufferError):
+            hash_secret_into(
+                b"x" * 200, TEST_PASSWORD, TEST_SALT, 1, 8, 1, 8, Type.ID
+            )
+
+        with pytest.raises(BufferError):
+            hash_secret_raw_into(
+                b"x" * 8, TEST_PASSWORD, TEST_SALT, 1, 8, 1, Type.ID
+            )
+
+
+class TestVerifyMany:
+    @pytest.mark.parametrize("max_workers", [None, 1, 2, 8])
+    def test_results(self, max_workers):
+        """
+        Returns the error codes in the order of the items regardless of the
+        number of workers.
+        """
+        items = [
+            (TEST_HASH_I, TEST_PASSWORD, Type.I),
+            (TEST_HASH_D, b"wrong", Type.D),
+            (TEST_HASH_ID, TEST_PASSWORD, Type.ID),
+            (TEST_HASH_I, TEST_PASSWORD, Type.D),
+            (TEST_HASH_I_OLD, TEST_PASSWORD, Type.I),
+        ]
+
+        rv = verify_secret_many(iter(items), max_workers=max_workers)
+
+        assert [
+            lib.ARGON2_OK,
+            lib.ARGON2_VERIFY_MISMATCH,
+            lib.ARGON2_OK,
+            lib.ARGON2_DECODING_FAIL,
+            lib.ARGON2_OK,
+        ] == rv
+        assert "Decoding failed" == error_to_str(rv[3])
+
+    def test_empty(self):
+        """
+        No items, no results.
+        """
+        assert [] == verify_secret_many([])
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_ctx(self, max_workers):
+        """
+        allocator, thread_limiter, and threads are used for all items.
+        """
+        arena = MemoryArena()
+        limiter = ThreadLimiter(2)
+        items = [
+            (TEST_HASH_I, TEST_PASSWORD, Type.I),
+            (TEST_HASH_D, b"wrong", Type.D),
+        ]
+
+        assert [lib.ARGON2_OK, lib.ARGON2_VERIFY_MISMATCH] == (
+            verify_secret_many(
+                items,
+                max_workers,
+                allocator=arena,
+                thread_limiter=limiter,
+                threads=2,
+            )
+        )
+        assert 0 < arena.idle_bytes
+        assert 0 == limiter.in_use
+
+    def test_shared_executor(self):
+        """
+        All calls share one lazily created thread pool.
+        """
+        items = [(TEST_HASH_I, TEST_PASSWORD, Type.I)] * 2
+
+        verify_secret_many(items, max_workers=2)
+        executor = _verify_executor.get()
+        verify_secret_many(items, max_workers=2)
+
+        assert executor is _verify_executor.get()
+
+    def test_shared_executor_after_fork(self):
+        """
+        After a fork, the child creates a new thread pool instead of using
+        the parent's one, whose threads it doesn't have.
+        """
+        executor = _verify_executor.get()
+
+        _verify_executor._after_fork()
+
+        assert None is _verify_executor._executor
+        assert executor is not _verify_executor.get()
+
+        executor.shutdown()
+
+    def test_wrong_arg_type(self):
+        """
+        Passing an argument of wrong type raises TypeError.
+        """
+        with pytest.raises(TypeError):
+            verify_secret_many(
+                [(TEST_HASH_I, TEST_PASSWORD.decode("ascii"), Type.I)]
+            )
+
+
+class TestMemoryArena:
+    @i_and_d_encoded
+    def test_hash_secret(self, type, hash):
+        """
+        Creates the same encoded hash as the Argon2 CLI client.
+        """
+        rv = hash_secret(
+            TEST_PASSWORD,
+            TEST_SALT,
+            TEST_TIME,
+            TEST_MEMORY,
+            TEST_PARALLELISM,
+            TEST_HASH_LEN,
+            type,
+            allocator=MemoryArena(),
+        )
+
+        assert hash == rv
+
+    @i_and_d_raw
+    def test_hash_secret_raw(self, type, hash):
+        """
+        Creates the same raw hash as the Argon2 CLI client.
+        """
+        rv = hash_secret_raw(
+            TEST_PASSWORD,
+            TEST_SALT,
+            TEST_TIME,
+            TEST_MEMORY,
+            TEST_PARALLELISM,
+            TEST_HASH_LEN,
+            type,
+            allocator=MemoryArena(),
+        )
+
+        assert hash == rv
+
+    @pytest.mark.parametrize(
+        "version", [lib.ARGON2_VERSION_10, ARGON2_VERSION]
+    )
+    @given(
+        secret=st.binary(max_size=32), salt=st.binary(min_size=8, max_size=32)
+    )
+    @settings(deadline=None)
+    def test_same_as_argon2_hash(self, version, secret, salt):
+        """
+        Hashing using an arena is identical to hashing without.
+        """
+        args = (secret, salt, 2, 32, 2, 12, Type.ID, version)
+
+        assert hash_secret(*args) == hash_secret(
+            *args, allocator=MemoryArena()
+        )
+
+    @i_and_d_encoded
+    def test_verify(self, type, hash):
+        """
+        Verification works with an arena.
+        """
+        arena = MemoryArena()
+
+        assert True is verify_secret(
+            hash, TEST_PASSWORD, type, allocator=arena
+        )
+
+        with pytest.raises(VerifyMismatchError) as e:
+            verify_secret(hash, b"wrong", type, allocator=arena)
+
+        assert "The password does not match the supplied hash" == str(e.value)
+
+    def test_verify_old_hash(self):
+        """
+        Hashes without a version tag are verified as version 1.0.
+        """
+        assert True is verify_secret(
+            TEST_HASH_I_OLD, TEST_PASSWORD, Type.I, allocator=MemoryArena()
+        )
+
+    @pytest.mark.parametrize(
+        "hash",
+        [
+            TEST_HASH_D,  # wrong type
+            TEST_HASH_I + b"$",
+            TEST_HASH_I.replace(b"t=2", b"t=02"),
+            TEST_HASH_I.replace(b"t=2", b"t=4294967296"),
+            TEST_HASH_I.replace(b"c29tZXNhbHQ", b"c29tZXNhbHQ="),
+            TEST_HASH_I.replace(b"c29tZXNhbHQ", b"c29tZXNhbHR"),
+            TEST_HASH_I.replace(b"c29tZXNhbHQ", b"c29tZXNhbHQ%"),
+            TEST_HASH_I.replace(b"c29tZXNhbHQ", b"c29tZXNhb"),
+        ],
+    )
+    def test_verify_invalid(self, hash):
+        """
+        Hashes that Argon2 can't decode fail with the same error.
+        """
+        with pytest.raises(VerificationError) as e:
+            verify_secret(hash, TEST_PASSWORD, Type.I)
+
+        with pytest.raises(VerificationError) as e_arena:
+            verify_secret(hash, TEST_PASSWORD, Type.I, allocator=MemoryArena())
+
+        assert "Decoding failed" == str(e.value) == str(e_arena.value)
+        assert None is _decode_hash(hash, Type.I)
+
+    def test_verify_hashing_fails(self):
+        """
+        If the hash is decodable but has invalid parameters, Argon2's error is
+        passed through.
+        """
+        hash = TEST_HASH_I.replace(b"m=65536", b"m=1")
+
+        with pytest.raises(VerificationError) as e:
+            verify_secret(hash, TEST_PASSWORD, Type.I)
+
+        with pytest.raises(VerificationError) as e_arena:
+            verify_secret(hash, TEST_PASSWORD, Type.I, allocator=MemoryArena())
+
+        assert "Memory cost is too small" == str(e.value) == str(e_arena.value)
+
+    @both_hash_funcs
+    def test_hashing_fails(self, func):
+        """
+        Raises HashingError if hashing fails.
+        """
+        with pytest.raises(HashingError):
+            func(
+                TEST_PASSWORD,
+                TEST_SALT,
+                TEST_TIME,
+                1,
+                TEST_PARALLELISM,
+                TEST_HASH_LEN,
+                Type.I,
+                allocator=MemoryArena(),
+            )
+
+    def test_reuse(self):
+        """
+        Buffers are kept after use and reused for jobs that fit into them.
+        """
+        arena = MemoryArena()
+        args = (TEST_PASSWORD, TEST_SALT, 1, 64, 1, 8, Type.ID)
+
+        assert 0 == arena.idle_bytes
+
+        hash_secret_raw(*args, allocator=arena)
+        (buf,) = arena._idle
+
+        assert 64 * 1024 == arena.idle_bytes
+
+        hash_secret_raw(
+            TEST_PASSWORD, TEST_SALT, 1, 32, 1, 8, Type.ID, allocator=arena
+        )
+
+        assert [buf] == arena._idle
+        assert {} == arena._busy
+
+        arena.clear()
+
+        assert 0 == arena.idle_bytes
+
+    def test_keeps_biggest(self):
+        """
+        If there are more idle buffers than max_buffers, the smallest ones are
+        dropped.
+        """
+        arena = MemoryArena(max_buffers=2)
+        arena._idle = [
+            _new_uninitialized("uint8_t[]", size) for size in (1, 2, 3)
+        ]
+        buf = _new_uninitialized("uint8_t[]", 4)
+        ptr = ffi.cast("uint8_t *", buf)
+        arena._busy[int(ffi.cast("uintptr_t", ptr))] = buf
+
+        arena._free(ptr, 4)
+
+        assert [3, 4] == [len(b) for b in arena._idle]
+
+    def test_allocation_fails(self, monkeypatch):
+        """
+        If the memory can't be allocated, Argon2 reports it.
+        """
+
+        new_uninitialized = low_level._new_uninitialized
+
+        def fail_big(cdecl, size):
+            if size > 1024:
+                raise MemoryError
+
+            return new_uninitialized(cdecl, size)
+
+        monkeypatch.setattr(low_level, "_new_uninitialized", fail_big)
+
+        with pytest.raises(HashingError, match="Memory allocation error"):
+            hash_secret_raw(
+                TEST_PASSWORD,
+                TEST_SALT,
+                1,
+                8,
+                1,
+                8,
+                Type.ID,
+                allocator=MemoryArena(),
+            )
+
+    @pytest.mark.parametrize(
+        ("huge_pages", "prefault"),
+        [(True, False), (False, True), (True, True)],
+    )
+    def test_mapped(self, huge_pages, prefault):
+        """
+        Mapped buffers produce the same hashes and are kept like regular
+        ones.
+        """
+        arena = MemoryArena(huge_pages=huge_pages, prefault=prefault)
+
+        for _ in range(2):
+            assert TEST_HASH_ID == hash_secret(
+                TEST_PASSWORD,
+                TEST_SALT,
+                TEST_TIME,
+                TEST_MEMORY,
+                TEST_PARALLELISM,
+                TEST_HASH_LEN,
+                Type.ID,
+                allocator=arena,
+            )
+
+        assert TEST_MEMORY * 1024 <= arena.idle_bytes
+
+    def test_huge_pages_fallback(self, monkeypatch):
+        """
+        If there are no huge pages reserved, transparent huge pages are used.
+        Explicit huge pages are mapped in multiples of their size.
+        """
+        calls = []
+        real_mmap = mmap.mmap
+
+        def fake_mmap(fileno, length, flags):
+            calls.append((length, flags))
+            if flags & low_level._MAP_HUGETLB:
+                raise OSError
+
+            return real_mmap(fileno, length, flags=flags)
+
+        monkeypatch.setattr(low_level, "_MAP_HUGETLB", 0x40000)
+        monkeypatch.setattr(mmap, "mmap", fake_mmap)
+
+        buf = low_level._map_anonymous(
+            3 * 1024, huge_pages=True, prefault=False
+        )
+
+        assert 3 * 1024 == len(buf)
+        assert [
+            (
+                low_level._huge_page_size(),
+                mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS | 0x40000,
+            ),
+            (3 * 1024, mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS),
+        ] == calls
+
+    @pytest.mark.parametrize(
+        ("platform", "machine", "expected"),
+        [
+            ("linux", "x86_64", 0x40000),
+            ("linux", "i686", 0x40000),
+            ("linux", "aarch64", 0x40000),
+            ("linux", "armv7l", 0x40000),
+            ("linux", "ppc64le", 0x40000),
+            ("linux", "s390x", 0x40000),
+            ("linux", "mips64", 0),
+            ("linux", "parisc64", 0),
+            ("linux", "", 0),
+            ("darwin", "x86_64", 0),
+            ("win32", "", 0),
+        ],
+    )
+    def test_fallback_map_hugetlb(self, platform, machine, expected):
+        """
+        The fallback for MAP_HUGETLB is only used on Linux on architectures
+        where its value is known.
+        """
+        assert expected == low_level._fallback_map_hugetlb(platform, machine)
+
+    def test_no_map_hugetlb(self, monkeypatch):
+        """
+        If MAP_HUGETLB is unknown, only transparent huge pages are used.
+        """
+        calls = []
+        real_mmap = mmap.mmap
+
+        def fake_mmap(fileno, length, flags):
+            calls.append((length, flags))
+
+            return real_mmap(fileno, length, flags=flags)
+
+        monkeypatch.setattr(low_level, "_MAP_HUGETLB", 0)
+        monkeypatch.setattr(mmap, "mmap", fake_mmap)
+
+        buf = low_level._map_anonymous(
+            3 * 1024, huge_pages=True, prefault=False
+        )
+
+        assert 3 * 1024 == len(buf)
+        assert [(3 * 1024, mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS)] == calls
+
+    def test_huge_page_size(self):
+        """
+        The huge page size is a multiple of the regular page size.
+        """
+        size = low_level._huge_page_size()
+
+        assert 0 < size
+        assert 0 == size % mmap.PAGESIZE
+
+    @pytest.mark.parametrize(
+        "meminfo", [None, "Hugepagesize: lots kB\n", "MemTotal: 8 kB\n"]
+    )
+    def test_huge_page_size_fallback(self, monkeypatch, meminfo):
+        """
+        If /proc/meminfo can't be read, can't be parsed, or doesn't know huge
+        pages, 2 MiB are assumed.
+        """
+
+        def fake_open(path):
+            if meminfo is None:
+                raise OSError
+
+            return io.StringIO(meminfo)
+
+        monkeypatch.setattr(low_level, "open", fake_open, raising=False)
+
+        assert 2 * 1024 * 1024 == low_level._huge_page_size.__wrapped__()
+
+    def test_madvise_fails(self, monkeypatch):
+        """
+        If the kernel doesn't support the advice, the memory is used anyway.
+        """
+        calls = []
+
+        class FailingMmap(mmap.mmap):
+            def madvise(self, *args):
+                calls.append(args)
+                raise OSError
+
+        monkeypatch.setattr(low_level, "_MAP_HUGETLB", 0)
+        monkeypatch.setattr(mmap, "mmap", FailingMmap)
+
+        buf = low_level._map_anonymous(
+            3 * 1024, huge_pages=True, prefault=True
+        )
+
+        assert 3 * 1024 == len(buf)
+        assert [(mmap.MADV_HUGEPAGE,)] == calls
+
+    def test_no_anonymous_mappings(self, monkeypatch):
+        """
+        If anonymous mappings aren't supported, regular buffers are used.
+        """
+        monkeypatch.setattr(
+            low_level, "_map_anonymous", lambda *args, **kw: None
+        )
+        arena = MemoryArena(prefault=True)
+
+        hash_secret_raw(
+            TEST_PASSWORD, TEST_SALT, 1, 8, 1, 8, Type.ID, allocator=arena
+        )
+
+        assert 8 * 1024 == arena.idle_bytes
+
+    def test_mapping_fails(self, monkeypatch):
+        """
+        If the memory can't be mapped, Argon2 reports it.
+        """
+
+        def fail(*args, **kw):
+            raise OSError
+
+        monkeypatch.setattr(low_level, "_map_anonymous", fail)
+
+        with pytest.raises(HashingError, match="Memory allocation error"):
+            hash_secret_raw(
+                TEST_PASSWORD,
+                TEST_SALT,
+                1,
+                8,
+                1,
+                8,
+                Type.ID,
+                allocator=MemoryArena(prefault=True),
+            )
+
+
 @given(
     password=st.binary(min_size=lib.ARGON2_MIN_PWD_LENGTH, max_size=65),
     time_cost=st.integers(lib.ARGON2_MIN_TIME, 3),
@@ -330,3 +991,224 @@ def test_core():
         hash_len=hash_len,
         type=Type.D,
     ) == bytes(ffi.buffer(ctx.out, ctx.outlen))
+
+
+class TestThreadLimiter:
+    def test_default(self):
+        """
+        By default, as many threads as there are CPUs are allowed.
+        """
+        assert (os.cpu_count() or 1) == ThreadLimiter().max_threads
+
+    def test_acquire_release(self):
+        """
+        Threads are handed out until there are none left.  Single threads are
+        never counted because they're the calling thread.
+        """
+        tl = ThreadLimiter(6)
+
+        assert 4 == tl._acquire(4)
+        assert 2 == tl._acquire(4)
+        assert 1 == tl._acquire(4)
+        assert 1 == tl._acquire(1)
+        assert 6 == tl.in_use
+
+        tl._release(1)
+        tl._release(2)
+
+        assert 4 == tl.in_use
+
+        tl._release(4)
+
+        assert 0 == tl.in_use
+
+    def test_never_single_thread(self):
+        """
+        If only one thread is left, it's not taken.
+        """
+        tl = ThreadLimiter(5)
+        tl._acquire(4)
+
+        assert 1 == tl._acquire(4)
+        assert 4 == tl.in_use
+
+    @pytest.mark.parametrize("max_threads", [0, 1, 2, 4])
+    @with_and_without_arena
+    def test_same_hashes(self, max_threads, allocator):
+        """
+        The number of threads doesn't affect the hashes.
+        """
+        tl = ThreadLimiter(max_threads)
+        args = (
+            TEST_PASSWORD,
+            TEST_SALT,
+            TEST_TIME,
+            TEST_MEMORY,
+            TEST_PARALLELISM,
+            TEST_HASH_LEN,
+            Type.ID,
+        )
+        kw = {"allocator": allocator, "thread_limiter": tl}
+
+        assert TEST_HASH_ID == hash_secret(*args, **kw)
+        assert TEST_RAW_ID == hash_secret_raw(*args, **kw)
+        assert True is verify_secret(
+            TEST_HASH_ID, TEST_PASSWORD, Type.ID, **kw
+        )
+        assert 0 == tl.in_use
+
+    def test_released_on_errors(self):
+        """
+        Threads are given back if hashing or verifying fails.
+        """
+        tl = ThreadLimiter(4)
+
+        with pytest.raises(HashingError):
+            hash_secret_raw(
+                TEST_PASSWORD,
+                TEST_SALT,
+                TEST_TIME,
+                1,
+                TEST_PARALLELISM,
+                TEST_HASH_LEN,
+                Type.ID,
+                thread_limiter=tl,
+            )
+
+        with pytest.raises(VerifyMismatchError):
+            verify_secret(TEST_HASH_ID, b"wrong", Type.ID, thread_limiter=tl)
+
+        assert 0 == tl.in_use
+
+    def test_in_use_while_hashing(self, monkeypatch):
+        """
+        While Argon2 runs, the granted threads are in use and passed to it.
+        """
+        tl = ThreadLimiter(3)
+        seen = []
+
+        def fake_ctx(ctx, type):
+            seen.append((ctx.threads, ctx.lanes, tl.in_use))
+            return lib.ARGON2_OK
+
+        monkeypatch.setattr(low_level, "lib", FakeLib(fake_ctx))
+
+        hash_secret_raw(
+            TEST_PASSWORD, TEST_SALT, 1, 32, 4, 8, Type.ID, thread_limiter=tl
+        )
+
+        assert [(3, 4, 3)] == seen
+        assert 0 == tl.in_use
+
+
+class TestThreads:
+    @pytest.mark.parametrize("threads", [1, 2, 3, 4, 8])
+    @with_and_without_arena
+    def test_same_hashes(self, threads, allocator):
+        """
+        The number of threads doesn't affect the hashes.
+        """
+        args = (
+            TEST_PASSWORD,
+            TEST_SALT,
+            TEST_TIME,
+            TEST_MEMORY,
+            TEST_PARALLELISM,
+            TEST_HASH_LEN,
+            Type.ID,
+        )
+        kw = {"allocator": allocator, "threads": threads}
+
+        assert TEST_HASH_ID == hash_secret(*args, **kw)
+        assert TEST_RAW_ID == hash_secret_raw(*args, **kw)
+        assert True is verify_secret(
+            TEST_HASH_ID, TEST_PASSWORD, Type.ID, **kw
+        )
+
+        with pytest.raises(VerifyMismatchError):
+            verify_secret(TEST_HASH_ID, b"wrong", Type.ID, **kw)
+
+    @pytest.mark.parametrize(
+        ("threads", "max_threads", "expected"),
+        [(1, None, 1), (2, None, 2), (8, None, 4), (3, 2, 2), (4, 1, 1)],
+    )
+    def test_passed_to_argon2(
+        self, monkeypatch, threads, max_threads, expected
+    ):
+        """
+        Argon2 gets the requested number of threads -- but never more than
+        there are lanes or than the limiter allows.
+        """
+        tl = None if max_threads is None else ThreadLimiter(max_threads)
+        seen = []
+
+        def fake_ctx(ctx, type):
+            seen.append(ctx.threads)
+            return lib.ARGON2_OK
+
+        monkeypatch.setattr(low_level, "lib", FakeLib(fake_ctx))
+
+        hash_secret_raw(
+            TEST_PASSWORD,
+            TEST_SALT,
+            1,
+            32,
+            4,
+            8,
+            Type.ID,
+            threads=threads,
+            thread_limiter=tl,
+        )
+
+        assert [expected] == seen
+
+    def test_same_as_lanes_uses_argon2_hash(self, monkeypatch):
+        """
+        If threads equals parallelism, the faster argon2_hash is used.
+        """
+        monkeypatch.setattr(low_level, "lib", FakeLib(None))
+
+        assert TEST_HASH_ID == hash_secret(
+            TEST_PASSWORD,
+            TEST_SALT,
+            TEST_TIME,
+            TEST_MEMORY,
+            TEST_PARALLELISM,
+            TEST_HASH_LEN,
+            Type.ID,
+            threads=TEST_PARALLELISM,
+        )
+
+    @pytest.mark.parametrize("threads", [0, -1])
+    @pytest.mark.parametrize("thread_limiter", [None, ThreadLimiter(4)])
+    def test_too_few(self, threads, thread_limiter):
+        """
+        Less than one thread is rejected before calling Argon2 -- even if the
+        hash is invalid.
+        """
+        kw = {"threads": threads, "thread_limiter": thread_limiter}
+        args = (TEST_PASSWORD, TEST_SALT, 1, 32, 4, 8, Type.ID)
+        match = rf"'threads' must be at least 1 \(got {threads}\)\."
+
+        with pytest.raises(ValueError, match=match):
+            hash_secret_raw(*args, **kw)
+        with pytest.raises(ValueError, match=match):
+            hash_secret(*args, **kw)
+        with pytest.raises(ValueError, match=match):
+            verify_secret(b"tiger", TEST_PASSWORD, Type.ID, **kw)
+        with pytest.raises(ValueError, match=match):
+            verify_secret_many(
+                [(TEST_HASH_ID, TEST_PASSWORD, Type.ID)] * 2, 2, **kw
+            )
+
+
+class FakeLib:
+    """
+    Delegates everything to lib, except for argon2_ctx.
+    """
+
+    def __init__(self, argon2_ctx):
+        self.argon2_ctx = argon2_ctx
+
+    def __getattr__(self, name):
+        return getattr(lib, name)
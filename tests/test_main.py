@@ -0,0 +1,128 @@
+# SPDX-License-Identifier: MIT
+
+import json
+
+import pytest
+
+from argon2 import __main__
+from argon2._bench import OverheadResult, ThroughputResult
+
+
+@pytest.mark.parametrize(
+    ("peak_rss", "expected"), [(3 * 1024 * 1024, "3.0MiB"), (None, "n/a")]
+)
+def test_bench_text(monkeypatch, capsys, peak_rss, expected):
+    """
+    bench prints one line per operation with all measurements.
+    """
+
+    def measure_throughput(params, op, *, threads, processes, n):
+        return ThroughputResult(
+            operation=op,
+            ops=n,
+            wall=1.0,
+            ops_per_sec=n,
+            p50=1.0,
+            p95=2.0,
+            p99=3.0,
+            peak_rss=peak_rss,
+            cpu_utilization=0.5,
+        )
+
+    monkeypatch.setattr(__main__, "measure_throughput", measure_throughput)
+
+    __main__.bench(
+        ["-n", "4", "--threads", "2", "--processes", "3", "--profile=CHEAPEST"]
+    )
+
+    out = capsys.readouterr().out
+
+    assert "4 times in 3 process(es) with 2 thread(s) each" in out
+    for op in ("hash", "verify"):
+        assert (
+            f"{op}: 4.0 ops/s, p50 1.0ms, p95 2.0ms, p99 3.0ms, "
+            f"peak RSS {expected}, CPU 50%"
+        ) in out
+
+
+@pytest.fixture(name="baseline")
+def _baseline(monkeypatch, tmp_path):
+    """
+    Fake overhead measurements and return the path of a baseline that
+    *hash* has grown by 100% against.
+    """
+
+    def measure_overhead(params, *, repeat):
+        return [
+            OverheadResult(name="hash", total=10.0, c=8.0, overhead=2.0),
+            OverheadResult(name="verify", total=10.0, c=8.0, overhead=2.0),
+            OverheadResult(name="new", total=1.0, c=None, overhead=1.0),
+        ]
+
+    monkeypatch.setattr(__main__, "measure_overhead", measure_overhead)
+
+    path = tmp_path / "overhead.json"
+    path.write_text(
+        json.dumps(
+            {
+                "results": [
+                    {"name": "hash", "overhead": 1.0},
+                    {"name": "verify", "overhead": 2.0},
+                ]
+            }
+        )
+    )
+
+    return path
+
+
+def test_overhead_regression_text(baseline, capsys):
+    """
+    Regressions beyond the threshold are listed and the exit code is 1.
+    """
+    with pytest.raises(SystemExit) as e:
+        __main__.overhead(["--compare", str(baseline)])
+
+    out = capsys.readouterr().out
+
+    assert 1 == e.value.code
+    assert "+100.0%" in out
+    assert "Regressions beyond 10%:\n  hash: 1.00 -> 2.00 (+100.0%)\n" in out
+    assert "verify:" not in out.split("Regressions")[1]
+
+
+def test_overhead_regression_json(baseline, capsys):
+    """
+    With --json, regressions are part of the report and the exit code is 1.
+    """
+    with pytest.raises(SystemExit) as e:
+        __main__.overhead(["--json", "--compare", str(baseline)])
+
+    report = json.loads(capsys.readouterr().out)
+
+    assert 1 == e.value.code
+    assert [
+        {"name": "hash", "baseline": 1.0, "current": 2.0, "change": 1.0}
+    ] == report["regressions"]
+
+
+def test_overhead_no_regression(baseline, capsys):
+    """
+    If nothing grew beyond the threshold, that's reported and the exit code
+    is 0.
+    """
+    __main__.overhead(["--compare", str(baseline), "--threshold", "1000"])
+
+    assert "No regressions beyond 1000%." in capsys.readouterr().out
+
+
+def test_overhead_json_without_baseline(baseline, capsys):
+    """
+    Without a baseline, the JSON report has no regressions.
+    """
+    __main__.overhead(["--json"])
+
+    report = json.loads(capsys.readouterr().out)
+
+    assert "regressions" not in report
+    assert ["hash", "verify", "new"] == [r["name"] for r in report["results"]]
@@ -0,0 +1,163 @@
+# SPDX-License-Identifier: MIT
+
+from unittest import mock
+
+import pytest
+
+from argon2 import (
+    CallStats,
+    PasswordHasher,
+    UsageMeter,
+    UsageStats,
+    profiles,
+)
+from argon2._meter import _memory_bytes
+from argon2.exceptions import VerificationError, VerifyMismatchError
+from argon2.low_level import MemoryArena
+
+
+CHEAPEST_BYTES = profiles.CHEAPEST.memory_cost * 1024
+
+
+@pytest.mark.parametrize(
+    ("memory_cost", "parallelism"), [(8, 1), (32, 4), (100, 4), (1000, 3)]
+)
+def test_memory_bytes(memory_cost, parallelism):
+    """
+    The computed memory is exactly what Argon2 asks its allocator for.
+    """
+    arena = MemoryArena()
+    PasswordHasher(
+        time_cost=1,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+        allocator=arena,
+    ).hash("password")
+
+    assert arena.idle_bytes == _memory_bytes(memory_cost, parallelism)
+
+
+class TestUsageMeter:
+    def test_calls(self):
+        """
+        Every hash and verification is reported to on_call and added to the
+        totals -- including mismatches.
+        """
+        calls = []
+        meter = UsageMeter(on_call=calls.append)
+        ph = PasswordHasher.from_parameters(profiles.CHEAPEST, meter=meter)
+
+        hash = ph.hash("password")
+        ph.verify(hash.encode(), "password")
+        with pytest.raises(VerifyMismatchError):
+            ph.verify(hash, "wrong")
+        ph.verify_ex(hash, "wrong")
+
+        assert ["hash", "verify", "verify", "verify"] == [
+            c.operation for c in calls
+        ]
+        assert all(CHEAPEST_BYTES == c.memory for c in calls)
+        assert all(0 < c.wall_time for c in calls)
+
+        stats = meter.stats()
+
+        assert 1 == stats.hashes
+        assert 3 == stats.verifications
+        assert 4 * CHEAPEST_BYTES == stats.memory
+        assert sum(c.wall_time for c in calls) == pytest.approx(
+            stats.wall_time
+        )
+        assert all(0 <= c.cpu_time for c in calls)
+        assert sum(c.cpu_time for c in calls) == pytest.approx(stats.cpu_time)
+
+    def test_cpu_time_calling_thread(self):
+        """
+        CPU time is measured for the calling thread only, so concurrent calls
+        in other threads don't count.
+        """
+        calls = []
+        ph = PasswordHasher.from_parameters(
+            profiles.CHEAPEST, meter=UsageMeter(on_call=calls.append)
+        )
+
+        with mock.patch(
+            "argon2._meter.time.thread_time", side_effect=[1.0, 1.5]
+        ):
+            ph.hash("password")
+
+        assert 0.5 == calls[0].cpu_time
+        assert 0.5 == ph.meter.stats().cpu_time
+
+    @pytest.mark.parametrize(
+        ("parallelism", "threads", "known"),
+        [(1, None, True), (2, 1, True), (2, None, False), (2, 2, False)],
+    )
+    def test_cpu_time_lane_threads(self, parallelism, threads, known):
+        """
+        If Argon2 may compute lanes in threads of its own, CPU time is
+        unknown and not added to the totals.
+        """
+        calls = []
+        meter = UsageMeter(on_call=calls.append)
+        ph = PasswordHasher(1, 16, parallelism, threads=threads, meter=meter)
+
+        ph.verify(ph.hash("password"), "password")
+
+        assert [known, known] == [c.cpu_time is not None for c in calls]
+        if not known:
+            assert 0 == meter.stats().cpu_time
+
+    @pytest.mark.parametrize(
+        "hash",
+        [
+            "$argon2id$v=19$m=8,t=1,p=1$c29tZXNhbHQ$!!!",
+            "$argon2id$nonsense",
+        ],
+    )
+    def test_errors(self, hash):
+        """
+        Verifications that fail for other reasons than mismatches are counted
+        but didn't allocate memory.
+        """
+        calls = []
+        ph = PasswordHasher(meter=UsageMeter(on_call=calls.append))
+
+        with pytest.raises(VerificationError):
+            ph.verify(hash, "password")
+
+        assert 1 == len(calls)
+        assert 0 == calls[0].memory
+        assert "verify" == calls[0].operation
+
+    def test_reset(self):
+        """
+        reset sets all totals to zero.
+        """
+        meter = UsageMeter()
+        meter._record(
+            CallStats(operation="hash", memory=1, wall_time=1.0, cpu_time=1.0)
+        )
+        meter.reset()
+
+        assert (
+            UsageStats(
+                hashes=0,
+                verifications=0,
+                memory=0,
+                wall_time=0.0,
+                cpu_time=0.0,
+            )
+            == meter.stats()
+        )
+
+    def test_check(self):
+        """
+        meter must be a UsageMeter or None.
+        """
+        with pytest.raises(TypeError) as e:
+            PasswordHasher(meter=object())
+
+        assert (
+            "'meter' must be a UsageMeter, or NoneType (got object)."
+            == e.value.args[0]
+        )
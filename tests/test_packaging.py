@@ -1,5 +1,7 @@
 # SPDX-License-Identifier: MIT
 
+import subprocess
+import sys
 
 from importlib import metadata
 
@@ -48,3 +50,67 @@ class TestLegacyMetadataHack:
             AttributeError, match="module argon2 has no attribute __yolo__"
         ):
             argon2.__yolo__  # noqa: B018
+
+
+def _modules_loaded_by(code):
+    """
+    Run *code* in a fresh interpreter and return the modules it loaded on
+    top of the interpreter's own.
+    """
+    script = (
+        "import sys; before = set(sys.modules); "
+        f"{code}; print(*sorted(set(sys.modules) - before))"
+    )
+    out = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+
+    return set(out.split())
+
+
+class TestLazyImports:
+    def test_import_is_cheap(self):
+        """
+        Importing argon2 neither loads the CFFI bindings, nor computes the
+        default parameters, nor imports anything heavy.
+        """
+        assert {"__future__", "argon2"} == _modules_loaded_by("import argon2")
+
+    def test_password_hasher(self):
+        """
+        Importing PasswordHasher doesn't pull in the modules that are only
+        needed by calibration, concurrency helpers, or the legacy API.
+        """
+        loaded = _modules_loaded_by("from argon2 import PasswordHasher")
+
+        assert "_argon2_cffi_bindings" in loaded
+        assert not loaded & {
+            "argon2._async",
+            "argon2._legacy",
+            "argon2._process_pool",
+            "asyncio",
+            "concurrent.futures",
+            "hmac",
+            "json",
+            "statistics",
+            "tempfile",
+        }
+
+    @pytest.mark.parametrize("name", argon2.__all__)
+    def test_all_attributes_load(self, name):
+        """
+        Every name in __all__ can be accessed and is cached in the module
+        afterwards.
+        """
+        value = getattr(argon2, name)
+
+        assert value is vars(argon2)[name]
+
+    def test_dir(self):
+        """
+        dir() lists lazily-loaded attributes.
+        """
+        assert set(argon2.__all__) <= set(dir(argon2))
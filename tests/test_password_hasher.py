@@ -5,18 +5,37 @@ import sys
 import threading
 
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from unittest import mock
 
 import pytest
 
-from argon2 import PasswordHasher, Type, extract_parameters, profiles
-from argon2._password_hasher import _ensure_bytes
+from _argon2_cffi_bindings import lib
+
+from argon2 import (
+    PasswordHasher,
+    Type,
+    UsageMeter,
+    VerificationLimits,
+    VerificationResult,
+    extract_parameters,
+    profiles,
+)
+from argon2._password_hasher import (
+    _SHARED_CACHE_SIZE,
+    _ensure_bytes,
+    _shared_password_hasher,
+)
 from argon2._utils import Parameters
 from argon2.exceptions import (
+    HashLimitExceededError,
     InvalidHash,
     InvalidHashError,
     UnsupportedParametersError,
+    VerificationError,
+    VerifyMismatchError,
 )
+from argon2.low_level import MemoryArena, ThreadLimiter
 
 
 class TestEnsureBytes:
@@ -109,6 +128,108 @@ class TestPasswordHasher:
 
         assert "'time_cost' must be a int (got str)." == e.value.args[0]
 
+    def test_allocator(self):
+        """
+        If an allocator is passed, it's used for hashing and verifying.
+        """
+        arena = MemoryArena()
+        ph = PasswordHasher.from_parameters(profiles.CHEAPEST, allocator=arena)
+
+        assert arena is ph.allocator
+
+        hash = ph.hash("password", salt=b"1234567890123456")
+
+        assert 8 * 1024 == arena.idle_bytes
+        assert hash == (
+            "$argon2id$v=19$m=8,t=1,p=1$MTIzNDU2Nzg5MDEyMzQ1Ng$maTa5w"
+        )
+        assert ph.verify(hash, "password")
+
+        arena.clear()
+        with pytest.raises(VerifyMismatchError):
+            ph.verify(hash, "wrong")
+
+        assert 8 * 1024 == arena.idle_bytes
+
+    def test_allocator_check(self):
+        """
+        Raises a helpful TypeError on wrong allocators.
+        """
+        with pytest.raises(TypeError) as e:
+            PasswordHasher(allocator=object())
+
+        assert (
+            "'allocator' must be a MemoryArena, or NoneType (got object)."
+            == e.value.args[0]
+        )
+
+    def test_thread_limiter(self):
+        """
+        If a thread limiter is passed, it's used for hashing and verifying.
+        """
+        tl = ThreadLimiter(2)
+        ph = PasswordHasher.from_parameters(
+            profiles.CHEAPEST, thread_limiter=tl
+        )
+
+        assert tl is ph.thread_limiter
+
+        hash = ph.hash("password", salt=b"1234567890123456")
+
+        assert hash == (
+            "$argon2id$v=19$m=8,t=1,p=1$MTIzNDU2Nzg5MDEyMzQ1Ng$maTa5w"
+        )
+        assert ph.verify(hash, "password")
+        assert ph.verify_ex(hash, "password").ok
+
+        with pytest.raises(TypeError) as e:
+            PasswordHasher(thread_limiter=2)
+
+        assert (
+            "'thread_limiter' must be a ThreadLimiter, or NoneType (got int)."
+            == e.value.args[0]
+        )
+
+    def test_threads(self):
+        """
+        The number of threads is used for hashing and verifying and doesn't
+        change the hashes.
+        """
+        ph = PasswordHasher(1, 32, 4, threads=1)
+        ph_lanes = PasswordHasher(1, 32, 4)
+
+        assert 1 == ph.threads
+
+        hash = ph.hash("password", salt=b"1234567890123456")
+
+        assert hash == ph_lanes.hash("password", salt=b"1234567890123456")
+        assert ph.verify(hash, "password")
+        assert ph.verify_ex(hash, "password").ok
+        assert not ph.verify_ex(hash, "wrong").ok
+
+        with pytest.raises(VerifyMismatchError):
+            ph.verify(hash, "wrong")
+
+        with pytest.raises(TypeError) as e:
+            PasswordHasher(threads="1")
+
+        assert (
+            "'threads' must be a int, or NoneType (got str)."
+            == e.value.args[0]
+        )
+
+    @pytest.mark.parametrize("threads", [0, -1])
+    def test_too_few_threads(self, threads):
+        """
+        Less than one thread is rejected on construction.
+        """
+        with pytest.raises(ValueError) as e:
+            PasswordHasher(threads=threads)
+
+        assert (
+            f"'threads' must be at least 1 (got {threads})." == e.value.args[0]
+        )
+
     def test_verify_invalid_hash_error(self):
         """
         If the hash can't be parsed, InvalidHashError is raised.
@@ -123,6 +244,341 @@ class TestPasswordHasher:
         with pytest.raises(InvalidHash):
             PasswordHasher().verify("tiger", "does not matter")
 
+    @pytest.mark.parametrize("max_workers", [None, 1, 3])
+    def test_verify_many(self, max_workers):
+        """
+        Results are reported in order and never raise.
+        """
+        ph = PasswordHasher.from_parameters(profiles.CHEAPEST)
+        ph.encoding = "latin1"
+        hash = ph.hash("pässword")
+        hash_i = (
+            "$argon2i$m=8,t=1,p=1$"
+            "bL/lLsegFKTuR+5vVyA8tA$VKz5CHavCtFOL1N5TIXWSA"
+        )
+
+        rv = ph.verify_many(
+            [
+                (hash, "pässword"),
+                (hash.encode(), "wrong"),
+                ("tiger", "pässword"),
+                (hash_i.encode(), "pässword".encode("latin1")),
+                (hash.replace("m=8", "m=x"), "pässword"),
+                (hash + "ä", "pässword"),
+            ],
+            max_workers=max_workers,
+        )
+
+        assert [True, False, False, True, False, False] == rv
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    @pytest.mark.parametrize(
+        ("method", "expected"),
+        [
+            (
+                lambda ph, hashes, mw: ph.verify_many(
+                    [(hash, "password") for hash in hashes], max_workers=mw
+                ),
+                [True] * 8,
+            ),
+            (
+                lambda ph, hashes, mw: ph.verify_any(
+                    hashes, "password", max_workers=mw
+                ),
+                0,
+            ),
+            (
+                lambda ph, hashes, mw: ph.verify_all(
+                    hashes, "password", max_workers=mw
+                ),
+                list(range(8)),
+            ),
+        ],
+        ids=["verify_many", "verify_any", "verify_all"],
+    )
+    def test_batch_thread_limiter(self, max_workers, method, expected):
+        """
+        Batch verifications use the instance's thread limiter and allocator,
+        so the limiter's cap holds for all concurrent verifications.
+        """
+        limiter = ThreadLimiter(max_threads=1)
+        arena = MemoryArena()
+        ph = PasswordHasher(1, 16, 2, thread_limiter=limiter, allocator=arena)
+        hashes = [ph.hash("password") for _ in range(8)]
+        in_use = []
+        acquire = ThreadLimiter._acquire
+
+        def spy(self, wanted):
+            granted = acquire(self, wanted)
+            in_use.append(self.in_use)
+            return granted
+
+        arena.clear()
+        with mock.patch.object(ThreadLimiter, "_acquire", spy):
+            assert expected == method(ph, hashes, max_workers)
+
+        assert 8 == len(in_use)
+        assert 1 >= max(in_use)
+        assert 0 < arena.idle_bytes
+
+    def test_verify_many_empty(self):
+        """
+        No pairs, no results.
+        """
+        assert [] == PasswordHasher().verify_many([])
+
+    @pytest.mark.parametrize("max_workers", [None, 1, 2])
+    def test_verify_any_all(self, max_workers):
+        """
+        verify_any returns the index of the first matching hash, verify_all
+        those of all of them.  Invalid hashes never match.
+        """
+        ph = PasswordHasher.from_parameters(profiles.CHEAPEST)
+        hash = ph.hash("password")
+        hashes = [
+            ph.hash("other"),
+            "tiger",
+            hash,
+            hash.replace("m=8", "m=x"),
+            hash.encode(),
+        ]
+
+        assert 2 == ph.verify_any(hashes, "password", max_workers=max_workers)
+        assert [2, 4] == ph.verify_all(
+            hashes, b"password", max_workers=max_workers
+        )
+
+    def test_verify_any_all_no_match(self):
+        """
+        If the password matches no hash, verify_any returns None and
+        verify_all an empty list.
+        """
+        ph = PasswordHasher.from_parameters(profiles.CHEAPEST)
+        hashes = [ph.hash("password"), ph.hash("other")]
+
+        assert None is ph.verify_any(hashes, "wrong")
+        assert [] == ph.verify_all(hashes, "wrong")
+        assert None is ph.verify_any([], "wrong")
+        assert [] == ph.verify_all(iter([]), "wrong")
+
+    def test_verify_any_encodes_once(self):
+        """
+        The password is encoded once and shared by all verifications.
+        """
+        ph = PasswordHasher.from_parameters(profiles.CHEAPEST)
+        hashes = [ph.hash("password"), ph.hash("password")]
+
+        with mock.patch(
+            "argon2._password_hasher.verify_secret_many",
+            return_value=[lib.ARGON2_OK, lib.ARGON2_OK],
+        ) as vsm:
+            assert 0 == ph.verify_any(hashes, "password")
+
+        ((items, _), _) = vsm.call_args
+        passwords = [pw for _, pw, _ in items]
+
+        assert [b"password", b"password"] == passwords
+        assert passwords[0] is passwords[1]
+
+    @pytest.mark.parametrize("use_bytes", [True, False])
+    def test_verify_ex(self, use_bytes):
+        """
+        Matching passwords and current parameters are reported.
+        """
+        ph = PasswordHasher.from_parameters(profiles.CHEAPEST)
+        hash = ph.hash("password")
+        if use_bytes:
+            hash = hash.encode()
+
+        assert VerificationResult(
+            ok=True,
+            needs_rehash=False,
+            parameters=profiles.CHEAPEST,
+            new_hash=None,
+        ) == ph.verify_ex(hash, b"password", rehash=True)
+
+    def test_verify_ex_mismatch(self):
+        """
+        Wrong passwords don't raise and are never rehashed.
+        """
+        ph = PasswordHasher.from_parameters(profiles.CHEAPEST)
+        hash = PasswordHasher(1, 16, 1).hash("password")
+
+        rv = ph.verify_ex(hash, "wrong", rehash=True)
+
+        assert not rv.ok
+        assert rv.needs_rehash
+        assert 16 == rv.parameters.memory_cost
+        assert None is rv.new_hash
+
+    @pytest.mark.parametrize("rehash", [True, False])
+    def test_verify_ex_rehash(self, rehash):
+        """
+        If the password matches but the hash is outdated, a new hash is
+        created on request.
+        """
+        ph = PasswordHasher.from_parameters(profiles.CHEAPEST)
+        ph.encoding = "latin1"
+        hash = PasswordHasher(1, 16, 1, encoding="latin1").hash("pässword")
+
+        rv = ph.verify_ex(hash, "pässword", rehash=rehash)
+
+        assert rv.ok
+        assert rv.needs_rehash
+        if rehash:
+            assert not ph.check_needs_rehash(rv.new_hash)
+            assert ph.verify(rv.new_hash, "pässword")
+        else:
+            assert None is rv.new_hash
+
+    def test_verify_ex_errors(self):
+        """
+        Invalid hashes and errors other than mismatches raise.
+        """
+        ph = PasswordHasher.from_parameters(profiles.CHEAPEST)
+
+        with pytest.raises(InvalidHashError):
+            ph.verify_ex("tiger", "password")
+
+        with pytest.raises(VerificationError, match="Decoding failed"):
+            ph.verify_ex(
+                "$argon2id$v=19$p=1,t=1,m=8$MTIzNDU2Nzg5MDEyMzQ1Ng$maTa5w",
+                "password",
+            )
+
+    def test_verify_ex_non_ascii(self):
+        """
+        Non-ASCII hashes raise the same exceptions as other broken hashes --
+        just like verify().
+        """
+        ph = PasswordHasher.from_parameters(profiles.CHEAPEST)
+        hash = ph.hash("password").encode()
+
+        with pytest.raises(VerificationError) as e:
+            ph.verify_ex(hash[:-1] + b"\xff", "password")
+        with pytest.raises(VerificationError) as e_verify:
+            ph.verify(hash[:-1] + b"\xff", "password")
+
+        assert e_verify.value.args == e.value.args
+
+        with pytest.raises(InvalidHashError):
+            ph.verify_ex(b"$argon2id$v=19$m=\xff" + hash[17:], "password")
+        with pytest.raises(InvalidHashError):
+            ph.verify_ex(hash.decode() + "ä", "password")
+
+    @pytest.mark.parametrize("use_bytes", [True, False])
+    def test_limits(self, use_bytes):
+        """
+        Hashes that exceed the limits are rejected by all verification
+        methods; hashes within them are verified.
+        """
+        limits = VerificationLimits.from_parameters(profiles.CHEAPEST)
+        ph = PasswordHasher.from_parameters(profiles.CHEAPEST, limits=limits)
+        hash = ph.hash("password")
+        expensive = PasswordHasher(1, 16, 1).hash("password")
+        if use_bytes:
+            hash = hash.encode()
+            expensive = expensive.encode()
+
+        assert ph.verify(hash, "password")
+        assert ph.verify_ex(hash, "password").ok
+        assert [True, False] == ph.verify_many(
+            [(hash, "password"), (expensive, "password")]
+        )
+
+        with pytest.raises(HashLimitExceededError, match="memory_cost of 16"):
+            ph.verify(expensive, "password")
+
+        with pytest.raises(HashLimitExceededError, match="memory_cost of 16"):
+            ph.verify_ex(expensive, "password")
+
+    def test_limits_before_argon2(self):
+        """
+        Limits are enforced before Argon2 is called.
+        """
+        ph = PasswordHasher(limits=VerificationLimits(max_time_cost=1))
+        hash = PasswordHasher(2, 8, 1).hash("password")
+
+        with (
+            mock.patch(
+                "argon2._password_hasher.verify_secret"
+            ) as verify_secret,
+            pytest.raises(HashLimitExceededError),
+        ):
+            ph.verify(hash, "password")
+
+        verify_secret.assert_not_called()
+
+    def test_limits_check(self):
+        """
+        limits must be VerificationLimits or None.
+        """
+        with pytest.raises(TypeError) as e:
+            PasswordHasher(limits={"max_time_cost": 1})
+
+        assert (
+            "'limits' must be a VerificationLimits, or NoneType (got dict)."
+            == e.value.args[0]
+        )
+
+    def test_for_parameters(self):
+        """
+        Equal parameters share one instance; different ones don't.  The
+        version is ignored, just like by from_parameters.
+        """
+        ph = PasswordHasher.for_parameters(profiles.CHEAPEST)
+
+        assert ph is PasswordHasher.for_parameters(
+            replace(profiles.CHEAPEST, version=18)
+        )
+        assert ph is not PasswordHasher.for_parameters(
+            replace(profiles.CHEAPEST, time_cost=2)
+        )
+        assert profiles.CHEAPEST == ph._parameters
+        assert ph.verify(ph.hash("password"), "password")
+
+    def test_for_parameters_subclass(self):
+        """
+        Subclasses get instances of themselves.
+        """
+
+        class Sub(PasswordHasher):
+            __slots__ = ()
+
+        ph = Sub.for_parameters(profiles.CHEAPEST)
+
+        assert isinstance(ph, Sub)
+        assert ph is not PasswordHasher.for_parameters(profiles.CHEAPEST)
+
+    def test_for_parameters_bounded(self):
+        """
+        The registry holds a limited number of instances.
+        """
+        _shared_password_hasher.cache_clear()
+
+        for t in range(1, _SHARED_CACHE_SIZE + 2):
+            PasswordHasher.for_parameters(
+                replace(profiles.CHEAPEST, time_cost=t)
+            )
+
+        assert (
+            _SHARED_CACHE_SIZE == _shared_password_hasher.cache_info().currsize
+        )
+
+    def test_for_parameters_invalid(self):
+        """
+        Invalid parameters raise just like from_parameters and are not
+        registered.
+        """
+        _shared_password_hasher.cache_clear()
+
+        with pytest.raises(TypeError):
+            PasswordHasher.for_parameters(
+                replace(profiles.CHEAPEST, time_cost="1")
+            )
+
+        assert 0 == _shared_password_hasher.cache_info().currsize
+
     @pytest.mark.parametrize("use_bytes", [True, False])
     def test_check_needs_rehash_no(self, use_bytes):
         """
@@ -236,3 +692,63 @@ def test_multithreaded_hashing():
                 barrier.abort()
         for f in futures:
             f.result()
+
+
+def test_shared_state_stress():
+    """
+    Threads that share a PasswordHasher and everything it uses -- the header
+    cache, the shared instances from for_parameters, an arena, a thread
+    limiter, limits, and a meter -- neither corrupt it nor each other's
+    results.  On free-threaded builds, they actually run in parallel.
+    """
+    meter = UsageMeter()
+    arena = MemoryArena(max_buffers=2)
+    limiter = ThreadLimiter(2)
+    ph = PasswordHasher.from_parameters(
+        profiles.CHEAPEST,
+        allocator=arena,
+        thread_limiter=limiter,
+        limits=VerificationLimits.from_parameters(profiles.CHEAPEST),
+        meter=meter,
+    )
+    num_threads = 8
+    rounds = 25
+
+    def closure(b, i):
+        b.wait()
+        for j in range(rounds):
+            password = f"password-{i}-{j}"
+            hash = ph.hash(password)
+
+            assert ph.verify(hash, password)
+            assert not ph.verify_ex(hash, "wrong").ok
+            assert not ph.check_needs_rehash(hash)
+            assert PasswordHasher.for_parameters(profiles.CHEAPEST).verify(
+                hash, password
+            )
+
+            # Callers get their own copy of the cached parameters.
+            params = extract_parameters(hash)
+            params.time_cost = 2
+
+            assert profiles.CHEAPEST == extract_parameters(hash)
+
+    orig_interval = sys.getswitchinterval()
+    barrier = threading.Barrier(num_threads)
+    try:
+        sys.setswitchinterval(0.00001)
+        with ThreadPoolExecutor(max_workers=num_threads) as tpe:
+            futures = [
+                tpe.submit(closure, barrier, i) for i in range(num_threads)
+            ]
+            for f in futures:
+                f.result()
+    finally:
+        sys.setswitchinterval(orig_interval)
+
+    stats = meter.stats()
+
+    assert num_threads * rounds == stats.hashes
+    assert 2 * num_threads * rounds == stats.verifications
+    assert 0 == limiter.in_use
+    assert 0 < arena.idle_bytes
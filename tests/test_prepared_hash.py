@@ -0,0 +1,162 @@
+# SPDX-License-Identifier: MIT
+
+import sys
+
+from unittest import mock
+
+import pytest
+
+from argon2 import (
+    PasswordHasher,
+    PreparedHash,
+    Type,
+    UsageMeter,
+    VerificationLimits,
+    extract_parameters,
+    profiles,
+)
+from argon2.exceptions import (
+    HashLimitExceededError,
+    InvalidHashError,
+    VerificationError,
+    VerifyMismatchError,
+)
+from argon2.low_level import hash_secret
+
+
+PH = PasswordHasher.from_parameters(profiles.CHEAPEST)
+HASH = "$argon2id$v=19$m=8,t=1,p=1$MTIzNDU2Nzg$kPBENgpXJKzHoJWlSIT3JQ"
+
+
+class TestPreparedHash:
+    def test_decode(self):
+        """
+        Salt and digest are decoded and the parameters extracted.
+        """
+        prepared = PreparedHash(HASH)
+
+        assert b"12345678" == prepared.salt
+        assert 16 == len(prepared.digest)
+        assert extract_parameters(HASH) == prepared.parameters
+        assert prepared.parameters == PreparedHash(HASH.encode()).parameters
+
+    def test_shared_parameters(self):
+        """
+        Hashes with the same header share their parameters, but callers get
+        their own copies.
+        """
+        a = PreparedHash(PH.hash("password"))
+        b = PreparedHash(PH.hash("password"))
+
+        a.parameters.time_cost = 42
+
+        assert a._parameters is b._parameters
+        assert 1 == a.parameters.time_cost
+
+    def test_small(self):
+        """
+        Instances have no __dict__ and are small.
+        """
+        prepared = PreparedHash(HASH)
+
+        assert not hasattr(prepared, "__dict__")
+        assert 64 >= sys.getsizeof(prepared)
+
+    @pytest.mark.parametrize(
+        "hash",
+        [
+            "tiger",
+            "$argon2id$v=19$m=8,t=1,p=1$MTIzNDU2Nzg$kPBENg=pXJKzHoJWlSIT3JQ",
+            "$argon2id$v=19$m=8,t=1,p=1$MTIzNDU2Nzg$kPBENgpXJKzHoJWlSIT3JR",
+            "$argon2id$v=19$t=1,m=8,p=1$MTIzNDU2Nzg$kPBENgpXJKzHoJWlSIT3JQ",
+            "$argon2id$v=19$m=8,t=1,p=1$MTIzNDU2Nzg$kPBENgpXJKzHoJWlSIT3JQü",
+            b"$argon2id$v=19$m=8,t=1,p=1$MTIzNDU2Nzg$kPBENgpXJKzHoJWlSIT3J\xff",
+        ],
+    )
+    def test_invalid(self, hash):
+        """
+        Hashes that Argon2 wouldn't accept raise InvalidHashError.
+        """
+        with pytest.raises(InvalidHashError):
+            PreparedHash(hash)
+
+
+class TestVerifyPrepared:
+    @pytest.mark.parametrize("type", list(Type))
+    def test_verify(self, type):
+        """
+        Correct passwords verify and wrong ones raise VerifyMismatchError --
+        for all types.
+        """
+        ph = PasswordHasher(1, 8, 1, type=type)
+        prepared = PreparedHash(ph.hash("password"))
+
+        assert True is ph.verify_prepared(prepared, "password")
+        assert True is PH.verify_prepared(prepared, b"password")
+
+        with pytest.raises(VerifyMismatchError):
+            ph.verify_prepared(prepared, "wrong")
+
+    def test_no_version(self):
+        """
+        Hashes without a version are verified using version 0x10 like Argon2
+        does.
+        """
+        hash = hash_secret(
+            b"password", b"12345678", 1, 8, 1, 16, Type.I, version=0x10
+        ).decode()
+        hash = hash.replace("$v=16", "")
+        prepared = PreparedHash(hash)
+
+        assert 0x10 == prepared.parameters.version
+        assert PH.verify(hash, "password")
+        assert PH.verify_prepared(prepared, "password")
+
+    def test_no_parsing(self):
+        """
+        The encoded hash isn't parsed again.
+        """
+        prepared = PreparedHash(HASH)
+
+        with mock.patch("argon2.low_level._decode_hash") as decode:
+            PH.verify_prepared(prepared, "password")
+
+        decode.assert_not_called()
+
+    def test_limits(self):
+        """
+        The instance's cost limits are enforced.
+        """
+        ph = PasswordHasher.from_parameters(
+            profiles.CHEAPEST, limits=VerificationLimits(max_memory_cost=8)
+        )
+        prepared = PreparedHash(PasswordHasher(1, 16, 1).hash("password"))
+
+        with pytest.raises(
+            HashLimitExceededError,
+            match=r"Hash has a memory_cost of 16, but the limit is 8\.",
+        ):
+            ph.verify_prepared(prepared, "password")
+
+    def test_meter(self):
+        """
+        Verifications are metered.
+        """
+        meter = UsageMeter()
+        ph = PasswordHasher.from_parameters(profiles.CHEAPEST, meter=meter)
+
+        ph.verify_prepared(PreparedHash(HASH), "password")
+
+        assert 1 == meter.stats().verifications
+        assert 8192 == meter.stats().memory
+
+    def test_error(self):
+        """
+        Argon2 errors other than mismatches raise VerificationError.
+        """
+        prepared = PreparedHash(
+            "$argon2id$v=19$m=8,t=1,p=1$MTIz$kPBENgpXJKzHoJWlSIT3JQ"
+        )
+
+        with pytest.raises(VerificationError, match="Salt is too short"):
+            PH.verify_prepared(prepared, "password")
@@ -0,0 +1,218 @@
+# SPDX-License-Identifier: MIT
+
+import os
+
+from concurrent.futures import Future
+
+import pytest
+
+from argon2 import (
+    PasswordHasher,
+    ProcessPoolPasswordHasher,
+    SaltPool,
+    VerificationLimits,
+    _process_pool,
+    profiles,
+)
+from argon2._process_pool import (
+    _get_worker_password_hasher,
+    _hash,
+    _init_worker,
+    _verify,
+)
+from argon2.exceptions import (
+    HashLimitExceededError,
+    InvalidHashError,
+    VerifyMismatchError,
+)
+
+
+@pytest.fixture(name="ppph", scope="module")
+def _ppph():
+    with ProcessPoolPasswordHasher.from_parameters(
+        profiles.CHEAPEST, max_workers=2
+    ) as ppph:
+        yield ppph
+
+
+class TestProcessPoolPasswordHasher:
+    def test_default(self):
+        """
+        If no PasswordHasher is passed, one with default parameters is used.
+        """
+        ppph = ProcessPoolPasswordHasher()
+
+        assert (
+            profiles.get_default_parameters()
+            == ppph.password_hasher._parameters
+        )
+
+        ppph.close()
+
+    def test_hash_verify(self, ppph):
+        """
+        Hashes are created using the parent's parameters and can be verified.
+        """
+        hash = ppph.hash("password")
+
+        assert True is ppph.verify(hash, "password")
+        assert not ppph.check_needs_rehash(hash)
+        assert PasswordHasher.from_parameters(profiles.CHEAPEST).verify(
+            hash, "password"
+        )
+
+    def test_custom_salt(self, ppph):
+        """
+        The salt is passed to the workers.
+        """
+        assert ppph.hash(b"password", salt=b"1234567890123456") == (
+            "$argon2id$v=19$m=8,t=1,p=1$MTIzNDU2Nzg5MDEyMzQ1Ng$maTa5w"
+        )
+
+    def test_encoding(self):
+        """
+        The workers use the encoding of the parent's PasswordHasher.
+        """
+        ph = PasswordHasher.from_parameters(profiles.CHEAPEST)
+        ph.encoding = "latin1"
+
+        with ProcessPoolPasswordHasher(ph, max_workers=1) as ppph:
+            hash = ppph.hash("pässword")
+
+        assert ph.verify(hash, "pässword".encode("latin1"))
+
+    def test_threads(self):
+        """
+        The workers use the threads of the parent's PasswordHasher.
+        """
+        ph = PasswordHasher.from_parameters(profiles.CHEAPEST, threads=1)
+
+        with ProcessPoolPasswordHasher(ph, max_workers=1) as ppph:
+            threads = ppph._executor.submit(_get_worker_threads).result()
+
+        assert 1 == threads
+
+    def test_salt_pool(self):
+        """
+        Each worker gets a salt pool of its own with the block size of the
+        parent's.
+        """
+        ph = PasswordHasher.from_parameters(
+            profiles.CHEAPEST, salt_pool=SaltPool(block_size=128)
+        )
+
+        with ProcessPoolPasswordHasher(ph, max_workers=1) as ppph:
+            block_size = ppph._executor.submit(
+                _get_worker_salt_pool_block_size
+            ).result()
+
+        assert 128 == block_size
+
+    def test_limits(self):
+        """
+        The workers enforce the limits of the parent's PasswordHasher.
+        """
+        ph = PasswordHasher.from_parameters(
+            profiles.CHEAPEST, limits=VerificationLimits(max_memory_cost=8)
+        )
+
+        with (
+            ProcessPoolPasswordHasher(ph, max_workers=1) as ppph,
+            pytest.raises(HashLimitExceededError),
+        ):
+            ppph.verify(PasswordHasher(1, 16, 1).hash("password"), "password")
+
+    def test_submit(self, ppph):
+        """
+        submit_hash and submit_verify return futures.
+        """
+        fut = ppph.submit_hash("password")
+
+        assert isinstance(fut, Future)
+
+        fut = ppph.submit_verify(fut.result(), "password")
+
+        assert isinstance(fut, Future)
+        assert True is fut.result()
+
+    def test_workers_are_reused(self, ppph):
+        """
+        Jobs are run by the same long-lived worker processes.
+        """
+        pids = {ppph._executor.submit(os.getpid).result() for _ in range(10)}
+
+        assert os.getpid() not in pids
+        assert len(pids) <= 2
+
+    @pytest.mark.parametrize(
+        ("hash", "exc"),
+        [
+            (
+                "$argon2id$v=19$m=8,t=1,p=1$MTIzNDU2Nzg5MDEyMzQ1Ng$maTa5w",
+                VerifyMismatchError,
+            ),
+            ("tiger", InvalidHashError),
+        ],
+    )
+    def test_verify_errors(self, ppph, hash, exc):
+        """
+        Exceptions from the workers are propagated faithfully.
+        """
+        with pytest.raises(exc):
+            ppph.verify(hash, "wrong")
+
+        with pytest.raises(exc):
+            ppph.submit_verify(hash, "wrong").result()
+
+    def test_close(self):
+        """
+        After closing, no new jobs are accepted.
+        """
+        ppph = ProcessPoolPasswordHasher.from_parameters(
+            profiles.CHEAPEST, max_workers=1
+        )
+        ppph.close(wait=False)
+
+        with pytest.raises(RuntimeError):
+            ppph.submit_hash("password")
+
+
+def test_worker_not_initialized():
+    """
+    Jobs can't run outside of initialized workers.
+    """
+    with pytest.raises(
+        RuntimeError, match="Not running in an initialized worker process"
+    ):
+        _hash("password", None)
+
+
+@pytest.mark.parametrize("salt_pool_block_size", [None, 64])
+def test_worker_in_process(monkeypatch, salt_pool_block_size):
+    """
+    The worker functions work when called in-process, too -- which is the
+    only place coverage sees them.
+    """
+    monkeypatch.setattr(_process_pool, "_worker_password_hasher", None)
+    limits = VerificationLimits(max_memory_cost=8)
+
+    _init_worker(profiles.CHEAPEST, "latin1", 1, limits, salt_pool_block_size)
+    ph = _get_worker_password_hasher()
+    hash = _hash("pässword", None)
+
+    assert "latin1" == ph.encoding
+    assert 1 == ph.threads
+    assert limits is ph.limits
+    assert (salt_pool_block_size is None) is (ph.salt_pool is None)
+    assert True is _verify(hash, "pässword".encode("latin1"))
+    assert _hash("password", b"12345678").startswith(
+        "$argon2id$v=19$m=8,t=1,p=1$MTIzNDU2Nzg$"
+    )
+
+
+def _get_worker_threads():
+    return _get_worker_password_hasher().threads
+
+
+def _get_worker_salt_pool_block_size():
+    return _get_worker_password_hasher().salt_pool.block_size
@@ -0,0 +1,260 @@
+# SPDX-License-Identifier: MIT
+
+import json
+
+import pytest
+
+from argon2 import Type, profiles
+from argon2.profiles import calibrate
+
+
+@pytest.fixture(name="fake_clock")
+def _fake_clock(monkeypatch):
+    """
+    Replace measuring with a model where each pass over each KiB costs 1 µs.
+    """
+    calls = []
+
+    def measure_ms(params, concurrency):
+        calls.append(params)
+
+        return params.time_cost * params.memory_cost / 1000
+
+    monkeypatch.setattr(profiles, "_measure_ms", measure_ms)
+    monkeypatch.setattr(profiles.os, "cpu_count", lambda: 4)
+
+    return calls
+
+
+class TestCalibrate:
+    def test_adds_passes(self, fake_clock):
+        """
+        If one pass is faster than the target, passes are added until the
+        target is reached.  Parallelism is the number of CPUs per hash.
+        """
+        params = calibrate(100, 20_000)
+
+        assert (
+            profiles.Parameters(
+                type=Type.ID,
+                version=19,
+                salt_len=16,
+                hash_len=32,
+                time_cost=5,
+                memory_cost=20_000,
+                parallelism=4,
+            )
+            == params
+        )
+
+    def test_lowers_memory(self, fake_clock):
+        """
+        If one pass is slower than the target, memory is halved until it
+        fits.
+        """
+        params = calibrate(10, 64 * 1024)
+
+        assert 1 == params.time_cost
+        assert 8 * 1024 == params.memory_cost
+
+    def test_concurrency(self, fake_clock):
+        """
+        Memory and CPUs are split between the concurrent hashes.
+        """
+        params = calibrate(100, 20_000, concurrency=2)
+
+        assert 10_000 == params.memory_cost
+        assert 2 == params.parallelism
+        assert 10 == params.time_cost
+
+    def test_minimum_memory(self, fake_clock):
+        """
+        Memory is never lowered below 8 KiB per lane and parallelism is
+        reduced if there's not enough memory for all lanes.
+        """
+        params = calibrate(0.001, 16)
+
+        assert 2 == params.parallelism
+        assert 16 == params.memory_cost
+        assert 1 == params.time_cost
+
+    @pytest.mark.parametrize(
+        ("measurements", "time_costs"),
+        [
+            # 10 passes are estimated, but each pass costs more than the last.
+            ([10, 200, 171, 144, 119, 96], [1, 10, 9, 8, 7, 6]),
+            # Noise: 2 passes are estimated, but even 1 is too slow now.
+            ([40, 150, 120], [1, 2, 1]),
+        ],
+    )
+    def test_removes_passes(self, monkeypatch, measurements, time_costs):
+        """
+        If the estimated number of passes is slower than the target, passes
+        are removed again until it fits, but never below one.
+        """
+        measurements = iter(measurements)
+        calls = []
+
+        def measure_ms(params, concurrency):
+            calls.append(params.time_cost)
+
+            return next(measurements)
+
+        monkeypatch.setattr(profiles, "_measure_ms", measure_ms)
+
+        assert time_costs[-1] == calibrate(100, 64).time_cost
+        assert time_costs == calls
+
+    @pytest.mark.parametrize("concurrency", [0, -1])
+    def test_too_little_concurrency(self, concurrency):
+        """
+        If concurrency is less than 1, ValueError is raised.
+        """
+        with pytest.raises(
+            ValueError, match=r"'concurrency' must be at least 1"
+        ):
+            calibrate(10, 16, concurrency=concurrency)
+
+    def test_too_little_memory(self):
+        """
+        If there's less than 8 KiB per hash, ValueError is raised.
+        """
+        with pytest.raises(ValueError, match="16 KiB is too small for 3"):
+            calibrate(10, 16, concurrency=3)
+
+    def test_cache(self, fake_clock, tmp_path):
+        """
+        Results are stored in the cache file and reused without measuring.
+        """
+        path = tmp_path / "sub" / "calibration.json"
+
+        params = calibrate(100, 20_000, type=Type.I, cache_path=path)
+        fake_clock.clear()
+
+        assert params == calibrate(
+            100, 20_000, type=Type.I, cache_path=str(path)
+        )
+        assert [] == fake_clock
+
+        other = calibrate(100, 10_000, type=Type.I, cache_path=path)
+
+        assert other != params
+        assert [] != fake_clock
+        assert 2 == len(json.loads(path.read_text()))
+
+    def test_corrupt_cache(self, fake_clock, tmp_path):
+        """
+        Unreadable cache files are overwritten.
+        """
+        path = tmp_path / "calibration.json"
+        path.write_text("{nope")
+
+        params = calibrate(100, 20_000, cache_path=path)
+
+        assert params == calibrate(100, 20_000, cache_path=path)
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "null",
+            '{"a": 1}',
+            '[1, "a", null]',
+            '[{"key": {}, "parameters": null}]',
+        ],
+    )
+    def test_malformed_cache(self, fake_clock, tmp_path, content):
+        """
+        Cache files with the wrong shape are treated as misses and
+        overwritten.
+        """
+        path = tmp_path / "calibration.json"
+        path.write_text(content)
+
+        params = calibrate(100, 20_000, cache_path=path)
+        fake_clock.clear()
+
+        assert params == calibrate(100, 20_000, cache_path=path)
+        assert [] == fake_clock
+
+    @pytest.mark.parametrize(
+        "parameters",
+        [
+            {"type": "ID"},
+            {"type": "XX"},
+            {"type": "ID", "nope": 1},
+        ],
+    )
+    def test_malformed_entry(self, fake_clock, tmp_path, parameters):
+        """
+        Entries with missing, unknown, or extra parameters are misses and
+        get replaced.
+        """
+        path = tmp_path / "calibration.json"
+        params = calibrate(100, 20_000, cache_path=path)
+        [entry] = json.loads(path.read_text())
+        entry["parameters"].update(parameters)
+        if "nope" not in parameters:
+            del entry["parameters"]["time_cost"]
+        path.write_text(json.dumps([entry]))
+        fake_clock.clear()
+
+        assert params == calibrate(100, 20_000, cache_path=path)
+        assert [] != fake_clock
+        assert [entry["key"]] == [
+            e["key"] for e in json.loads(path.read_text())
+        ]
+
+    @pytest.mark.parametrize(
+        "parameters",
+        [
+            [],
+            {"time_cost": "5"},
+            {"memory_cost": 1.5},
+            {"parallelism": True},
+            {"type": 2},
+            {"type": ["ID"]},
+        ],
+    )
+    def test_wrong_types(self, fake_clock, tmp_path, parameters):
+        """
+        Entries whose parameters have the wrong types are misses and get
+        replaced.
+        """
+        path = tmp_path / "calibration.json"
+        params = calibrate(100, 20_000, cache_path=path)
+        [entry] = json.loads(path.read_text())
+        if isinstance(parameters, dict):
+            entry["parameters"].update(parameters)
+        else:
+            entry["parameters"] = parameters
+        path.write_text(json.dumps([entry]))
+        fake_clock.clear()
+
+        assert params == calibrate(100, 20_000, cache_path=path)
+        assert [] != fake_clock
+        assert params == calibrate(100, 20_000, cache_path=path)
+
+    def test_failed_write(self, fake_clock, tmp_path, monkeypatch):
+        """
+        If writing the cache fails, no temporary file is left behind.
+        """
+        path = tmp_path / "calibration.json"
+
+        def dump(*args, **kw):
+            raise OSError
+
+        monkeypatch.setattr(json, "dump", dump)
+
+        with pytest.raises(OSError):
+            calibrate(100, 20_000, cache_path=path)
+
+        assert [] == list(tmp_path.iterdir())
+
+    def test_real(self):
+        """
+        Calibrating without fakes returns usable parameters.
+        """
+        params = calibrate(1, 64)
+
+        assert 1 <= params.time_cost
+        assert 8 <= params.memory_cost <= 64
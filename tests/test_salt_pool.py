@@ -0,0 +1,162 @@
+# SPDX-License-Identifier: MIT
+
+import os
+import threading
+
+from unittest import mock
+
+import pytest
+
+from argon2 import PasswordHasher, SaltPool, extract_parameters, profiles
+
+
+@pytest.fixture(name="urandom")
+def _urandom():
+    with mock.patch(
+        "argon2._salt_pool.os.urandom", wraps=os.urandom
+    ) as urandom:
+        yield urandom
+
+
+class TestSaltPool:
+    def test_take(self, urandom):
+        """
+        Salts are handed out from one block without overlapping.
+        """
+        pool = SaltPool(block_size=64)
+
+        salts = [pool.take(16) for _ in range(4)]
+
+        assert [16] * 4 == [len(s) for s in salts]
+        assert 4 == len(set(salts))
+        urandom.assert_called_once_with(64)
+
+    def test_no_reference(self):
+        """
+        The pool doesn't keep handed out salts.
+        """
+        pool = SaltPool(block_size=64)
+
+        salt = pool.take(16)
+
+        assert 3 == len(pool._salts[16])
+        assert salt not in pool._salts[16]
+
+    def test_refill(self, urandom):
+        """
+        Once all salts are handed out, a new block is drawn.  Only as many
+        bytes as fit whole salts are drawn.
+        """
+        pool = SaltPool(block_size=40)
+
+        salts = {pool.take(16) for _ in range(3)}
+
+        assert 3 == len(salts)
+        assert [mock.call(32), mock.call(32)] == urandom.call_args_list
+
+    def test_lengths(self):
+        """
+        Salts of different lengths are kept apart.
+        """
+        pool = SaltPool()
+
+        assert [8, 16, 8, 0] == [len(pool.take(n)) for n in (8, 16, 8, 0)]
+
+    def test_bigger_than_block(self, urandom):
+        """
+        Salts that are bigger than a block get a block of their own.
+        """
+        pool = SaltPool(block_size=8)
+
+        assert 32 == len(pool.take(32))
+        urandom.assert_called_once_with(32)
+
+    def test_threads(self):
+        """
+        Concurrent threads never get the same bytes.
+        """
+        pool = SaltPool(block_size=1024)
+        salts = []
+        lock = threading.Lock()
+
+        def take():
+            own = [pool.take(16) for _ in range(500)]
+            with lock:
+                salts.extend(own)
+
+        threads = [threading.Thread(target=take) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert 4000 == len(set(salts))
+
+    def test_after_fork(self, urandom):
+        """
+        After a fork, the inherited salts are discarded.
+        """
+        pool = SaltPool(block_size=64)
+        pool.take(16)
+
+        pool._after_fork()
+        pool.take(16)
+
+        assert 2 == urandom.call_count
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Needs os.fork.")
+    def test_fork(self):
+        """
+        Parent and child hand out different salts.
+        """
+        pool = SaltPool()
+        pool.take(16)
+        r, w = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover -- child
+            try:
+                os.write(w, pool.take(16))
+            finally:
+                os._exit(0)
+
+        os.close(w)
+        child = os.read(r, 16)
+        os.close(r)
+        os.waitpid(pid, 0)
+
+        assert 16 == len(child)
+        assert child != pool.take(16)
+
+
+class TestPasswordHasher:
+    def test_salt_pool(self):
+        """
+        Random salts are taken from the pool, but explicit salts are used
+        as is.
+        """
+        pool = SaltPool()
+        ph = PasswordHasher.from_parameters(profiles.CHEAPEST, salt_pool=pool)
+
+        with mock.patch.object(
+            SaltPool, "take", return_value=b"12345678"
+        ) as take:
+            hash = ph.hash("password")
+
+        take.assert_called_once_with(8)
+        assert "$MTIzNDU2Nzg$" in hash
+        assert ph.verify(hash, "password")
+        assert "$YWJjZGVmZ2g$" in ph.hash("password", salt=b"abcdefgh")
+        assert 8 == extract_parameters(ph.hash("password")).salt_len
+
+    def test_check(self):
+        """
+        salt_pool must be a SaltPool or None.
+        """
+        with pytest.raises(TypeError) as e:
+            PasswordHasher(salt_pool=object())
+
+        assert (
+            "'salt_pool' must be a SaltPool, or NoneType (got object)."
+            == e.value.args[0]
+        )
@@ -8,9 +8,23 @@ import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
-from argon2 import Parameters, Type, extract_parameters
-from argon2._utils import NoneType, _check_types, _decoded_str_len
-from argon2.exceptions import InvalidHashError
+from argon2 import (
+    Parameters,
+    PasswordHasher,
+    Type,
+    VerificationLimits,
+    extract_parameters,
+    extract_parameters_cache_clear,
+    extract_parameters_cache_info,
+)
+from argon2._utils import (
+    NoneType,
+    _check_types,
+    _decoded_str_len,
+    _extract_parameters,
+    _hash_to_str,
+)
+from argon2.exceptions import HashLimitExceededError, InvalidHashError
 
 
 class TestCheckTypes:
@@ -46,6 +60,17 @@ def test_decoded_str_len(bs):
     assert len(bs) == _decoded_str_len(len(b64encode(bs).rstrip(b"=")))
 
 
+@given(st.binary())
+def test_hash_to_str(bs):
+    """
+    Any bytes decode to a str of the same length and strs are left alone.
+    """
+    s = _hash_to_str(bs)
+
+    assert len(bs) == len(s)
+    assert s is _hash_to_str(s)
+
+
 VALID_HASH = (
     "$argon2id$v=19$m=65536,t=2,p=4$"
     "c29tZXNhbHQ$GpZ3sK/oH9p7VIiV56G/64Zo/8GaUw434IimaPqxwCo"
@@ -97,9 +122,14 @@ class TestExtractParameters:
         "hash",
         [
             "",
+            "abc$def",
             "abc" + VALID_HASH,
             VALID_HASH.replace("p=4", "p=four"),
             VALID_HASH.replace(",p=4", ""),
+            "$argon2id$v=19$m=8,t=1,p=1",
+            "$argon2id$v=19$m=8,t=1,p=1$c29tZXNhbHQ",
+            "$argon2id$v=19$m=8,t=1,p=1$$c29tZXNhbHQ$c29tZXNhbHQ",
+            "$argon2x$v=19$m=8,t=1,p=1$c29tZXNhbHQ$c29tZXNhbHQ",
         ],
     )
     def test_invalid_hash(self, hash):
@@ -109,6 +139,141 @@ class TestExtractParameters:
         with pytest.raises(InvalidHashError):
             extract_parameters(hash)
 
+    def test_non_canonical_header(self):
+        """
+        Headers that aren't formatted like Argon2 formats them are still
+        parsed, as long as all parameters are present.
+        """
+        parsed = extract_parameters(
+            VALID_HASH.replace("m=65536,t=2,p=4", "p=4,t=2,m=65536")
+        )
+
+        assert VALID_PARAMETERS == parsed
+
+    def test_cache(self):
+        """
+        Hashes that only differ in their salt and hash share one cached
+        instance.  Hits and misses are counted.
+        """
+        extract_parameters_cache_clear()
+        other_hash = PasswordHasher(2, 65536, 4, 32, 8).hash("password")
+
+        params = _extract_parameters(VALID_HASH)
+
+        assert params is _extract_parameters(other_hash)
+
+        info = extract_parameters_cache_info()
+
+        assert (1, 1, 1) == (info.hits, info.misses, info.currsize)
+
+        extract_parameters_cache_clear()
+
+        assert 0 == extract_parameters_cache_info().currsize
+
+    def test_cache_keyed_on_lengths(self):
+        """
+        The salt and hash lengths are part of the cache key.
+        """
+        extract_parameters_cache_clear()
+        extract_parameters(VALID_HASH)
+
+        parsed = extract_parameters(VALID_HASH.replace("$c29tZXNhbHQ$", "$$"))
+
+        assert 0 == parsed.salt_len
+        assert 2 == extract_parameters_cache_info().misses
+
+    def test_returns_copies(self):
+        """
+        Mutating the returned Parameters doesn't affect the cache.
+        """
+        parsed = extract_parameters(VALID_HASH)
+        parsed.time_cost = 42
+
+        assert VALID_PARAMETERS == extract_parameters(VALID_HASH)
+
+
+class TestVerificationLimits:
+    @pytest.mark.parametrize("use_bytes", [True, False])
+    def test_within(self, use_bytes):
+        """
+        Hashes that are exactly at the limits pass and their parameters are
+        returned.
+        """
+        limits = VerificationLimits(
+            max_time_cost=2,
+            max_memory_cost=65536,
+            max_parallelism=4,
+            max_length=len(VALID_HASH),
+        )
+
+        assert VALID_PARAMETERS == limits._check(
+            VALID_HASH.encode() if use_bytes else VALID_HASH
+        )
+
+    def test_no_limits(self):
+        """
+        By default, nothing is limited.
+        """
+        assert VALID_PARAMETERS == VerificationLimits()._check(VALID_HASH)
+
+    @pytest.mark.parametrize(
+        ("limits", "msg"),
+        [
+            (
+                VerificationLimits(max_time_cost=1),
+                "Hash has a time_cost of 2, but the limit is 1.",
+            ),
+            (
+                VerificationLimits(max_memory_cost=65535),
+                "Hash has a memory_cost of 65536, but the limit is 65535.",
+            ),
+            (
+                VerificationLimits(max_parallelism=3),
+                "Hash has a parallelism of 4, but the limit is 3.",
+            ),
+            (
+                VerificationLimits(max_length=10),
+                f"Hash is {len(VALID_HASH)} characters long, but the limit is 10.",
+            ),
+        ],
+    )
+    def test_exceeded(self, limits, msg):
+        """
+        Exceeding any limit raises HashLimitExceededError, which is an
+        InvalidHashError.
+        """
+        with pytest.raises(HashLimitExceededError) as e:
+            limits._check(VALID_HASH)
+
+        assert msg == e.value.args[0]
+        assert isinstance(e.value, InvalidHashError)
+
+    def test_length_before_parsing(self):
+        """
+        Overlong hashes are rejected without parsing them.
+        """
+        extract_parameters_cache_clear()
+
+        with pytest.raises(HashLimitExceededError):
+            VerificationLimits(max_length=10)._check(VALID_HASH)
+
+        assert 0 == extract_parameters_cache_info().misses
+
+    def test_invalid_hash(self):
+        """
+        Unparsable hashes raise InvalidHashError.
+        """
+        with pytest.raises(InvalidHashError):
+            VerificationLimits(max_time_cost=1)._check("tiger")
+
+    def test_from_parameters(self):
+        """
+        Limits can be derived from parameters with some headroom.
+        """
+        assert VerificationLimits(
+            max_time_cost=4, max_memory_cost=131072, max_parallelism=8
+        ) == VerificationLimits.from_parameters(VALID_PARAMETERS, headroom=2)
+
 
 class TestParameters:
     def test_eq(self):
@@ -143,3 +308,29 @@ class TestParameters:
             "Parameters(type=<Type.ID: 2>, version=19, salt_len=8, "
             "hash_len=32, time_cost=2, memory_cost=65536, parallelism=4)"
         )
+
+
+def test_sub_interpreter_state():
+    """
+    argon2 can be used in a sub-interpreter, which gets its own copy of all
+    module state -- like the header cache -- instead of sharing it with the
+    main interpreter.
+    """
+    interpreters = pytest.importorskip("_xxsubinterpreters")
+
+    size = extract_parameters_cache_info().currsize
+    interp = interpreters.create()
+    try:
+        interpreters.run_string(
+            interp,
+            "import argon2\n"
+            "assert 0 == argon2.extract_parameters_cache_info().currsize\n"
+            "ph = argon2.PasswordHasher.from_parameters("
+            "argon2.profiles.CHEAPEST)\n"
+            "assert not ph.check_needs_rehash(ph.hash('password'))\n"
+            "assert 1 == argon2.extract_parameters_cache_info().currsize\n",
+        )
+    finally:
+        interpreters.destroy(interp)
+
+    assert size == extract_parameters_cache_info().currsize
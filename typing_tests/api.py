@@ -1,3 +1,6 @@
+from concurrent.futures import Future
+from typing import Literal
+
 import argon2
 
 
@@ -17,3 +20,140 @@ if ph.check_needs_rehash("hash") is True:
     ...
 
 params: argon2.Parameters = argon2.profiles.get_default_parameters()
+
+
+async def use_async() -> None:
+    async with argon2.AsyncPasswordHasher(max_workers=2) as aph:
+        h: str = await aph.hash("pw")
+        await aph.verify(h, "pw")
+
+    aph = argon2.AsyncPasswordHasher.from_parameters(argon2.profiles.CHEAPEST)
+    if aph.check_needs_rehash(b"hash"):
+        ...
+    aph.close()
+
+
+with argon2.ProcessPoolPasswordHasher(ph, max_workers=2) as ppph:
+    fh: Future[str] = ppph.submit_hash("pw")
+    fv: Future[Literal[True]] = ppph.submit_verify(fh.result(), b"pw")
+    ppph.verify(ppph.hash(b"pw"), "pw")
+
+
+argon2.warmup()
+pool = argon2.SaltPool(block_size=8192)
+salt: bytes = pool.take(16)
+argon2.PasswordHasher(salt_pool=pool).hash("pw")
+prepared = argon2.PreparedHash(argon2.PasswordHasher().hash("pw"))
+prepared_params: argon2.Parameters = prepared.parameters
+digest: bytes = prepared.digest
+prepared_ok: Literal[True] = argon2.PasswordHasher().verify_prepared(
+    prepared, b"pw"
+)
+argon2.warmup(
+    argon2.profiles.CHEAPEST, allocator=argon2.low_level.MemoryArena()
+)
+
+oks: list[bool] = ph.verify_many([("hash", "pw"), (b"hash", b"pw")])
+idx: int | None = ph.verify_any(["hash", b"hash"], "pw", max_workers=2)
+idxs: list[int] = ph.verify_all(["hash", b"hash"], b"pw")
+codes: list[int] = argon2.low_level.verify_secret_many(
+    [(b"hash", b"pw", argon2.Type.ID)], max_workers=4
+)
+
+bph = argon2.BudgetedPasswordHasher(ph, max_memory=2**30, timeout=1.5)
+bph.verify(bph.hash("pw"), b"pw")
+stats: argon2.BudgetStats = bph.stats()
+queue_depth: int = stats.queue_depth
+
+arena = argon2.low_level.MemoryArena(max_buffers=4)
+ph = argon2.PasswordHasher(allocator=arena)
+ph = argon2.PasswordHasher.from_parameters(
+    argon2.profiles.CHEAPEST, allocator=arena
+)
+argon2.low_level.hash_secret(
+    b"pw", b"salt", 1, 8, 1, 8, argon2.Type.ID, allocator=arena
+)
+argon2.low_level.verify_secret(b"hash", b"pw", argon2.Type.ID, allocator=None)
+idle: int = arena.idle_bytes
+arena.clear()
+
+out = bytearray(128)
+n: int = argon2.low_level.hash_secret_into(
+    out, bytearray(b"pw"), memoryview(b"salt"), 1, 8, 1, 8, argon2.Type.ID
+)
+argon2.low_level.hash_secret_raw_into(
+    memoryview(out)[:8], b"pw", b"saltsalt", 1, 8, 1, argon2.Type.ID
+)
+argon2.low_level.verify_secret(
+    memoryview(out)[:n], bytearray(), argon2.Type.ID
+)
+
+calibrated: argon2.Parameters = argon2.profiles.calibrate(
+    50, 64 * 1024, 4, type=argon2.Type.ID, cache_path="calibration.json"
+)
+
+cache_info = argon2.extract_parameters_cache_info()
+hits: int = cache_info.hits
+misses: int = cache_info.misses
+argon2.extract_parameters_cache_clear()
+
+vr: argon2.VerificationResult = ph.verify_ex("hash", b"pw", rehash=True)
+ok: bool = vr.ok
+needs_rehash: bool = vr.needs_rehash
+vr_params: argon2.Parameters = vr.parameters
+new_hash: str | None = vr.new_hash
+
+tl = argon2.low_level.ThreadLimiter(max_threads=8)
+ph = argon2.PasswordHasher(thread_limiter=tl)
+ph = argon2.PasswordHasher.from_parameters(
+    argon2.profiles.CHEAPEST, allocator=arena, thread_limiter=tl
+)
+argon2.low_level.hash_secret_raw(
+    b"pw", b"salt", 1, 8, 1, 8, argon2.Type.ID, thread_limiter=tl
+)
+argon2.low_level.verify_secret(
+    b"hash", b"pw", argon2.Type.ID, thread_limiter=None
+)
+threads_in_use: int = tl.in_use
+
+ph = argon2.PasswordHasher(threads=1)
+ph = argon2.PasswordHasher.from_parameters(argon2.profiles.CHEAPEST, threads=2)
+maybe_threads: int | None = ph.threads
+argon2.low_level.hash_secret(
+    b"pw", b"salt", 1, 8, 4, 8, argon2.Type.ID, threads=1
+)
+argon2.low_level.verify_secret(b"hash", b"pw", argon2.Type.ID, threads=None)
+
+huge = argon2.low_level.MemoryArena(2, huge_pages=True, prefault=False)
+uses_huge_pages: bool = huge.huge_pages
+ph = argon2.PasswordHasher.from_parameters(
+    argon2.profiles.RFC_9106_HIGH_MEMORY, allocator=huge
+)
+
+limits = argon2.VerificationLimits(max_memory_cost=2**20, max_length=256)
+ph = argon2.PasswordHasher(
+    limits=argon2.VerificationLimits.from_parameters(params, headroom=2)
+)
+ph = argon2.PasswordHasher.from_parameters(params, limits=limits)
+exc: type[argon2.exceptions.InvalidHashError] = (
+    argon2.exceptions.HashLimitExceededError
+)
+
+
+call_log: list[tuple[int, float | None]] = []
+
+
+def on_call(stats: argon2.CallStats) -> None:
+    call_log.append((stats.memory, stats.cpu_time))
+
+
+meter = argon2.UsageMeter(on_call=on_call)
+ph = argon2.PasswordHasher(meter=meter)
+ph = argon2.PasswordHasher.from_parameters(params, meter=argon2.UsageMeter())
+usage: argon2.UsageStats = meter.stats()
+total_memory: int = usage.memory
+meter.reset()
+
+shared: argon2.PasswordHasher = argon2.PasswordHasher.for_parameters(
+    argon2.profiles.CHEAPEST
+)